@@ -215,12 +215,10 @@ def _estimate_phrases_from_duration(duration: float, bpm: float) -> List[Dict]:
 
 def _find_nearest_beat_index(beats: List[float], time: float) -> int:
     """Find the index of the beat nearest to the given time."""
-    if not beats:
+    if not len(beats):
         return 0
 
-    beats_array = np.array(beats)
-    idx = np.argmin(np.abs(beats_array - time))
-    return int(idx)
+    return int(np.abs(np.asarray(beats, dtype=np.float64) - time).argmin())
 
 
 def get_phrase_at_time(phrases: List[Dict], time: float) -> Optional[Dict]:
@@ -37,6 +37,21 @@ class Settings(BaseSettings):
     # Audio Processing
     max_track_duration_minutes: int = 15
     demucs_model: str = "htdemucs"  # Base model - good quality, lower memory usage
+    demucs_device: str = ""  # cuda, mps or cpu (empty = auto-detect)
+    demucs_autocast: bool = True  # Mixed-precision Demucs inference on CUDA (fp16) / MPS (bf16)
+    demucs_cuda_dtype: str = "float16"  # Autocast dtype on CUDA: float16 or bfloat16 (bf16 needs Ampere+)
+    demucs_compile: bool = True  # torch.compile Demucs on CUDA (compiled and warmed up at model load)
+    demucs_segment: float = 0.0  # Seconds per Demucs split (0 = model default; capped at the model's own)
+    demucs_overlap: float = 0.25  # Overlap between Demucs splits (lower = faster, more seam artifacts)
+    stem_bypass_energy: float = 0.5  # Avg energy below which transitions crossfade without stems (0 = never)
+    stem_cache_size: int = 8  # Separated segments kept in memory per worker process
+    stem_disk_cache_entries: int = 64  # Separated segments kept on disk, shared by processes (0 = off)
+    stem_full_track: bool = False  # Separate whole tracks once and slice track A's stems from them (~200 MB disk per 5-min track)
+    transition_workers: int = 1  # Transition processes (1 = serial, reuses one loaded Demucs; 0 = auto: one per GPU id, else per core within memory)
+    transition_worker_memory_mb: int = 3072  # RAM budget per parallel transition process (caps transition_workers=0)
+    transition_gpu_devices: str = ""  # Comma-separated CUDA ids to shard workers across
+    time_stretch_backend: str = "rubberband"  # rubberband (falls back if missing) or librosa
+    stretch_cache_mb: int = 256  # Time-stretched track B windows kept in memory per worker process (0 = off)
 
     # Output paths
     output_path: str = get_default_storage_path()
@@ -3,6 +3,7 @@ Main entry point for AutoDJ Python workers
 """
 
 import signal
+import subprocess
 import sys
 from multiprocessing import Process
 from typing import List
@@ -43,6 +44,12 @@ def main():
         ],
     )
 
+    # Compile (or load cached) mixing kernels in a separate interpreter: the
+    # parallel numba kernels must not run in this process before it forks
+    result = subprocess.run([sys.executable, "-m", "src.mixing.precompile"])
+    if result.returncode != 0:
+        logger.warning("Kernel precompilation failed", returncode=result.returncode)
+
     # Start worker processes
     processes: List[Process] = []
 
@@ -1,38 +1,103 @@
 """
 Beatmatching module for tempo synchronization
 
-Uses pyrubberband for high-quality time-stretching without pitch change.
+Uses Rubber Band (in-process through pedalboard, or pyrubberband) for
+high-quality time-stretching without pitch change.
 Limits stretching to ±8% to avoid audible artifacts.
 """
 
-from typing import Tuple, List, Optional
+from collections import OrderedDict
+from typing import Hashable, Tuple, List, Optional
+import os
+import shutil
+
+import librosa
 import numpy as np
 import structlog
 
+from src.config import settings
+
 logger = structlog.get_logger()
 
 # Maximum allowed tempo change (±8%)
 MAX_STRETCH_RATIO = 1.08
 MIN_STRETCH_RATIO = 0.92
 
-# Check for pyrubberband availability
+# Check for pedalboard / pyrubberband availability
+_pedalboard_available = None
 _rubberband_available = None
 
 
+def _check_pedalboard() -> bool:
+    """Check if pedalboard's in-process Rubber Band binding is available."""
+    global _pedalboard_available
+    if _pedalboard_available is None:
+        try:
+            import pedalboard
+            _pedalboard_available = hasattr(pedalboard, 'time_stretch')
+        except ImportError:
+            _pedalboard_available = False
+
+        if _pedalboard_available:
+            logger.info("pedalboard available for in-process time-stretching")
+    return _pedalboard_available
+
+
 def _check_rubberband() -> bool:
-    """Check if pyrubberband is available."""
+    """Check if pyrubberband and the rubberband CLI it drives are available."""
     global _rubberband_available
     if _rubberband_available is None:
         try:
             import pyrubberband as pyrb
-            _rubberband_available = True
-            logger.info("pyrubberband available for time-stretching")
+            _rubberband_available = shutil.which('rubberband') is not None
         except ImportError:
             _rubberband_available = False
-            logger.warning("pyrubberband not available - time-stretching disabled")
+
+        if _rubberband_available:
+            logger.info("pyrubberband available for time-stretching")
+        else:
+            logger.warning("pyrubberband not available - using phase-vocoder time-stretch")
     return _rubberband_available
 
 
+def _use_rubberband() -> bool:
+    """Whether time-stretching should go through Rubber Band."""
+    return settings.time_stretch_backend == 'rubberband' and (_check_pedalboard() or _check_rubberband())
+
+
+def stretch_backend() -> str:
+    """Name of the time-stretch implementation in use: pedalboard, rubberband-cli or librosa."""
+    if not _use_rubberband():
+        return 'librosa'
+    return 'pedalboard' if _check_pedalboard() else 'rubberband-cli'
+
+
+def _rubberband_stretch(signals: np.ndarray, sample_rate: int, stretch_ratio: float) -> np.ndarray:
+    """
+    Stretch a (signals, samples) stack with Rubber Band.
+
+    pedalboard runs Rubber Band in-process on the float32 buffer; pyrubberband,
+    which round-trips through temp WAV files and the rubberband CLI, is the
+    fallback.
+    """
+    if _check_pedalboard():
+        import pedalboard
+
+        # stretch_factor > 1 speeds up, like stretch_ratio; the standard
+        # (non-"finer") engine matches the rubberband CLI default
+        return pedalboard.time_stretch(
+            np.ascontiguousarray(signals, dtype=np.float32),
+            float(sample_rate),
+            stretch_factor=stretch_ratio,
+            high_quality=False,
+        )
+
+    import pyrubberband as pyrb
+
+    # pyrubberband expects (samples, channels); rate is the stretch factor
+    return pyrb.time_stretch(signals.T, sample_rate, stretch_ratio).T
+
+
 def time_stretch(
     audio: np.ndarray,
     sample_rate: int,
@@ -66,19 +131,53 @@ def time_stretch(
     if abs(stretch_ratio - 1.0) < 0.001:
         return audio
 
-    if not _check_rubberband():
-        logger.warning("Time-stretching skipped - pyrubberband not available")
-        return audio
-
-    import pyrubberband as pyrb
+    if not _use_rubberband():
+        # Phase-vocoder fallback works on (samples,) or (samples, channels)
+        if audio.ndim == 2:
+            return time_stretch_batch(audio.T, sample_rate, stretch_ratio).T
+        return time_stretch_batch(audio, sample_rate, stretch_ratio)
 
     logger.debug("Time-stretching audio", ratio=stretch_ratio)
 
-    # pyrubberband expects (samples,) or (samples, channels)
-    # rate parameter is the stretch factor
-    stretched = pyrb.time_stretch(audio, sample_rate, stretch_ratio)
+    if audio.ndim == 2:
+        return _rubberband_stretch(audio.T, sample_rate, stretch_ratio).T
+    return _rubberband_stretch(audio[np.newaxis], sample_rate, stretch_ratio)[0]
+
+
+def time_stretch_batch(
+    audio_stack: np.ndarray,
+    sample_rate: int,
+    stretch_ratio: float
+) -> np.ndarray:
+    """
+    Time-stretch several signals (e.g. stems or channels) in one call.
+
+    With Rubber Band the stack is passed as one multichannel signal, so a
+    single stretcher handles every signal. Otherwise librosa's phase
+    vocoder stretches the whole stack with one batched STFT/ISTFT.
+
+    Args:
+        audio_stack: Array of shape (..., samples)
+        sample_rate: Sample rate
+        stretch_ratio: Ratio to stretch (>1 = faster/shorter, <1 = slower/longer)
+
+    Returns:
+        Stretched stack of shape (..., new_samples)
+    """
+    stretch_ratio = max(MIN_STRETCH_RATIO, min(MAX_STRETCH_RATIO, stretch_ratio))
+
+    if abs(stretch_ratio - 1.0) < 0.001:
+        return audio_stack
+
+    logger.debug("Time-stretching audio batch", ratio=stretch_ratio, shape=audio_stack.shape)
+
+    if _use_rubberband():
+        lead_shape = audio_stack.shape[:-1]
+        flat = audio_stack.reshape(-1, audio_stack.shape[-1])
+        stretched = _rubberband_stretch(flat, sample_rate, stretch_ratio)
+        return stretched.reshape(*lead_shape, stretched.shape[-1])
 
-    return stretched
+    return librosa.effects.time_stretch(audio_stack, rate=stretch_ratio)
 
 
 def pitch_shift(
@@ -200,6 +299,72 @@ def stretch_to_bpm(
     return stretched, actual_bpm
 
 
+# Recently stretched windows, keyed by source window and tempo change (LRU order)
+_stretch_cache: "OrderedDict[Hashable, Tuple[np.ndarray, float]]" = OrderedDict()
+_stretch_cache_bytes = 0
+
+
+def source_window_key(path: str, start: float, length: Optional[float], *extra: Hashable) -> Hashable:
+    """
+    Cache key of a window of an audio file, invalidated when the file changes.
+
+    Extra components (sample rate, stretch BPMs, ...) distinguish different
+    processing of the same window. Used for the stretch and stem caches,
+    including the on-disk stem cache that outlives the run.
+    """
+    stat = os.stat(path)
+    return ('window', os.path.abspath(path), stat.st_size, stat.st_mtime_ns, start, length, *extra)
+
+
+def stretch_to_bpm_cached(
+    audio: np.ndarray,
+    sample_rate: int,
+    source_bpm: float,
+    target_bpm: float,
+    cache_key: Hashable
+) -> Tuple[np.ndarray, float]:
+    """
+    stretch_to_bpm, remembering the result under the source window's key.
+
+    Regenerating a transition (preview, another effect type) stretches the
+    same window of track B again; a cache hit skips Rubber Band entirely.
+    The cache holds at most settings.stretch_cache_mb per process. Returns
+    a copy the caller may modify.
+
+    Args:
+        audio: Input audio (the window identified by cache_key)
+        sample_rate: Sample rate
+        source_bpm: Original BPM of the audio
+        target_bpm: Target BPM to achieve
+        cache_key: Identity of the audio's source, e.g. from source_window_key
+
+    Returns:
+        Tuple of (stretched_audio, actual_bpm)
+    """
+    global _stretch_cache_bytes
+
+    budget = settings.stretch_cache_mb * 1024 * 1024
+    if budget <= 0:
+        return stretch_to_bpm(audio, sample_rate, source_bpm, target_bpm)
+
+    key = (cache_key, sample_rate, source_bpm, target_bpm)
+    if key in _stretch_cache:
+        _stretch_cache.move_to_end(key)
+        stretched, actual_bpm = _stretch_cache[key]
+        return stretched.copy(), actual_bpm
+
+    stretched, actual_bpm = stretch_to_bpm(audio, sample_rate, source_bpm, target_bpm)
+    if stretched.nbytes <= budget:
+        cached = stretched.copy()
+        cached.setflags(write=False)
+        _stretch_cache[key] = (cached, actual_bpm)
+        _stretch_cache_bytes += cached.nbytes
+        while _stretch_cache_bytes > budget:
+            evicted, _ = _stretch_cache.popitem(last=False)[1]
+            _stretch_cache_bytes -= evicted.nbytes
+    return stretched, actual_bpm
+
+
 def find_nearest_beat(
     time_position: float,
     beats: List[float],
@@ -210,38 +375,32 @@ def find_nearest_beat(
 
     Args:
         time_position: Time in seconds
-        beats: List of beat timestamps in seconds
+        beats: Sorted beat timestamps in seconds (list or array)
         direction: 'nearest', 'before', or 'after'
 
     Returns:
         Tuple of (beat_time, beat_index)
     """
-    if not beats:
+    beats_array = np.asarray(beats, dtype=np.float64)
+    if beats_array.size == 0:
         return time_position, -1
 
-    beats_array = np.array(beats)
-
+    # Beat grids are sorted, so before/after are a binary search
     if direction == 'before':
         # Find last beat before position
-        valid_beats = beats_array[beats_array <= time_position]
-        if len(valid_beats) == 0:
-            return beats[0], 0
-        beat_time = valid_beats[-1]
-        beat_idx = np.where(beats_array == beat_time)[0][0]
+        beat_idx = int(np.searchsorted(beats_array, time_position, side='right')) - 1
+        if beat_idx < 0:
+            return float(beats_array[0]), 0
     elif direction == 'after':
         # Find first beat after position
-        valid_beats = beats_array[beats_array >= time_position]
-        if len(valid_beats) == 0:
-            return beats[-1], len(beats) - 1
-        beat_time = valid_beats[0]
-        beat_idx = np.where(beats_array == beat_time)[0][0]
+        beat_idx = int(np.searchsorted(beats_array, time_position, side='left'))
+        if beat_idx == len(beats_array):
+            return float(beats_array[-1]), len(beats_array) - 1
     else:
         # Find nearest beat
-        distances = np.abs(beats_array - time_position)
-        beat_idx = int(np.argmin(distances))
-        beat_time = float(beats[beat_idx])
+        beat_idx = int(np.abs(beats_array - time_position).argmin())
 
-    return beat_time, beat_idx
+    return float(beats_array[beat_idx]), beat_idx
 
 
 def find_downbeat(
@@ -254,7 +413,7 @@ def find_downbeat(
 
     Args:
         start_beat_idx: Starting beat index
-        beats: List of beat timestamps
+        beats: Beat timestamps (list or array)
         beats_per_bar: Number of beats per bar (usually 4)
 
     Returns:
@@ -262,13 +421,10 @@ def find_downbeat(
     """
     # Find next beat that's on a bar boundary
     # Assumes first beat in the list is a downbeat
-    next_downbeat_idx = start_beat_idx
-    while next_downbeat_idx % beats_per_bar != 0:
-        next_downbeat_idx += 1
-        if next_downbeat_idx >= len(beats):
-            # Wrap around or use last available
-            next_downbeat_idx = len(beats) - 1
-            break
+    next_downbeat_idx = start_beat_idx + (-start_beat_idx % beats_per_bar)
+    if next_downbeat_idx != start_beat_idx and next_downbeat_idx >= len(beats):
+        # Wrap around or use last available
+        next_downbeat_idx = len(beats) - 1
 
     return beats[next_downbeat_idx], next_downbeat_idx
 
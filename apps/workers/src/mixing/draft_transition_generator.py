@@ -11,24 +11,28 @@ Implements the spec exactly:
 - Export as MP3 320kbps
 """
 
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from typing import Dict, List, Tuple, Optional, Callable
 from pathlib import Path
 from enum import Enum
+from functools import lru_cache
 import os
 
 import numpy as np
-import soundfile as sf
 import structlog
 from scipy.signal import butter, sosfilt
 
-from src.utils.audio import load_audio, ensure_wav_format
-from src.mixing.stems import separate_stems
+from src.utils.audio import ensure_wav_format, get_audio_num_samples, load_audio_window, moving_average
+from src.mixing.stems import separate_stems_batch
 from src.mixing.beatmatch import (
-    stretch_to_bpm,
+    source_window_key,
+    stretch_to_bpm_cached,
     find_nearest_beat,
     find_downbeat,
     calculate_stretch_ratio,
+    MAX_STRETCH_RATIO,
+    MIN_STRETCH_RATIO,
 )
 from src.config import settings
 from src.llm import plan_transition
@@ -74,6 +78,12 @@ logger = structlog.get_logger()
 SAMPLE_RATE = 44100
 BEATS_PER_BAR = 4
 
+# Extra source audio decoded past a window so the stretcher has context at the edge
+STRETCH_PAD_SECONDS = 0.5
+
+# Shared by jobs for I/O-bound prep (LLM call, FFmpeg decode) that overlaps
+_prep_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="draft-prep")
+
 
 class TransitionMode(Enum):
     """Mode of transition generation."""
@@ -116,6 +126,10 @@ class DraftTransitionResult:
 
     error: Optional[str] = None
 
+    # Rendered stereo audio as [2, samples], for in-process callers that would
+    # otherwise decode the exported file again
+    audio: Optional[np.ndarray] = field(default=None, repr=False)
+
 
 def calculate_transition_bars(avg_energy: float) -> int:
     """
@@ -545,17 +559,29 @@ def generate_draft_transition(
         transition_bars=transition_bars,
     )
 
-    # Check BPM difference for fallback
+    # Check BPM difference for fallback. Decided before any loading so an
+    # unstretchable pair never pays for Demucs separation it would not use.
     bpm_diff_percent = abs(params.track_a_bpm - params.track_b_bpm) / params.track_a_bpm * 100
-    use_stems = bpm_diff_percent <= 8.0
+    _, is_within_limits = calculate_stretch_ratio(params.track_b_bpm, params.track_a_bpm)
+    use_stems = bpm_diff_percent <= 8.0 and is_within_limits
 
     if not use_stems:
         logger.warning(
-            "BPM difference > 8%, falling back to crossfade",
+            "BPM difference too large for time-stretch, falling back to crossfade",
             bpm_diff=bpm_diff_percent
         )
         return _generate_crossfade_fallback(params, transition_bars, progress_callback)
 
+    # Long, low-energy blends gain little from the 4-phase stem mix: crossfade
+    # them directly and skip Demucs separation entirely
+    if avg_energy < settings.stem_bypass_energy:
+        logger.info(
+            "Low-energy transition, crossfading without stems",
+            avg_energy=avg_energy,
+            threshold=settings.stem_bypass_energy,
+        )
+        return _generate_crossfade_fallback(params, transition_bars, progress_callback)
+
     try:
         report_progress("extraction", 0)
 
@@ -563,12 +589,11 @@ def generate_draft_transition(
         track_a_path = ensure_wav_format(params.track_a_path)
         track_b_path = ensure_wav_format(params.track_b_path)
 
-        # Step 1: Load audio files at 44100 Hz for quality
+        # Step 1: Read track lengths; only the transition windows are decoded later
         # Note: We load at full sample rate but convert to mono for stem separation
         # The Demucs stem separator returns mono stems anyway
-        import librosa
-        audio_a, sr_a = librosa.load(track_a_path, sr=SAMPLE_RATE, mono=True)
-        audio_b, sr_b = librosa.load(track_b_path, sr=SAMPLE_RATE, mono=True)
+        audio_a_len = get_audio_num_samples(track_a_path, SAMPLE_RATE)
+        audio_b_len = get_audio_num_samples(track_b_path, SAMPLE_RATE)
 
         report_progress("extraction", 20)
 
@@ -590,7 +615,7 @@ def generate_draft_transition(
         
         # Track A: Find downbeat near outro start (or end of track if not set)
         # Use outro_start if provided and valid (not 0 and not too close to end)
-        track_a_duration_s = len(audio_a) / SAMPLE_RATE
+        track_a_duration_s = audio_a_len / SAMPLE_RATE
         reference_time_a = track_a_duration_s - (transition_duration_ms / 1000.0)
         
         if params.track_a_outro_start_ms > 0:
@@ -612,7 +637,7 @@ def generate_draft_transition(
         while True:
             track_a_start_candidate = int(a_cue_time * SAMPLE_RATE)
             end_sample = track_a_start_candidate + transition_samples
-            max_samples = len(audio_a)
+            max_samples = audio_a_len
             
             logger.info(
                 "Checking cue point safety",
@@ -669,16 +694,27 @@ def generate_draft_transition(
         track_b_start = int(b_cue_time_original * SAMPLE_RATE)
         
         # Extract Track A: from cue point to (cue point + transition duration)
-        a_segment_end = min(track_a_start + transition_samples, len(audio_a))
-        segment_a = audio_a[track_a_start:a_segment_end]
+        a_segment_end = min(track_a_start + transition_samples, audio_a_len)
+        segment_a, _ = load_audio_window(
+            track_a_path,
+            track_a_start / SAMPLE_RATE * 1000,
+            (a_segment_end - track_a_start) / SAMPLE_RATE * 1000,
+            target_sr=SAMPLE_RATE,
+        )
         
         # Extract Track B: from cue point to (cue point + transition duration)
-        # Note: B will be stretched later, so we grab enough samples to cover the stretch
-        # We'll trim it down after stretching
-        # Estimate stretched length needed: duration * max_stretch_ratio
-        samples_needed_b = int(transition_samples * 1.1)  # +10% safety margin
-        b_segment_end = min(track_b_start + samples_needed_b, len(audio_b))
-        segment_b = audio_b[track_b_start:b_segment_end]
+        # Note: B will be stretched later, so we grab just enough source
+        # samples to cover the transition once stretched; trimmed afterwards
+        samples_needed_b = _stretch_source_samples(
+            transition_samples, params.track_b_bpm, target_bpm
+        )
+        b_segment_end = min(track_b_start + samples_needed_b, audio_b_len)
+        segment_b, _ = load_audio_window(
+            track_b_path,
+            track_b_start / SAMPLE_RATE * 1000,
+            (b_segment_end - track_b_start) / SAMPLE_RATE * 1000,
+            target_sr=SAMPLE_RATE,
+        )
 
         logger.info(
             "Segment extraction with beat alignment",
@@ -697,8 +733,9 @@ def generate_draft_transition(
         report_progress("time-stretch", 0)
 
         stretch_ratio, _ = calculate_stretch_ratio(params.track_b_bpm, target_bpm)
-        segment_b_stretched, actual_bpm = stretch_to_bpm(
-            segment_b, SAMPLE_RATE, params.track_b_bpm, target_bpm
+        segment_b_stretched, actual_bpm = stretch_to_bpm_cached(
+            segment_b, SAMPLE_RATE, params.track_b_bpm, target_bpm,
+            source_window_key(track_b_path, track_b_start, b_segment_end - track_b_start)
         )
 
         report_progress("time-stretch", 100)
@@ -718,12 +755,15 @@ def generate_draft_transition(
         # Step 5: Separate stems with Demucs
         report_progress("stems", 0)
 
-        logger.info("Separating stems for track A")
-        stems_a = separate_stems(segment_a, SAMPLE_RATE)
-        report_progress("stems", 50)
-
-        logger.info("Separating stems for track B")
-        stems_b = separate_stems(segment_b_stretched, SAMPLE_RATE)
+        logger.info("Separating stems for tracks A and B")
+        stems_a, stems_b = separate_stems_batch(
+            [segment_a, segment_b_stretched],
+            SAMPLE_RATE,
+            cache_keys=[
+                source_window_key(track_a_path, track_a_start, min_len),
+                source_window_key(track_b_path, track_b_start, min_len, params.track_b_bpm, target_bpm),
+            ],
+        )
         report_progress("stems", 100)
 
         # Step 6: Beatmatch - align B's first downbeat to A's downbeat
@@ -755,7 +795,8 @@ def generate_draft_transition(
         report_progress("export", 0)
         # Convert mono to stereo for better quality output
         if transition_audio.ndim == 1:
-            transition_audio_stereo = np.stack([transition_audio, transition_audio])
+            # Mono feeds both channels as a read-only view instead of a stacked copy
+            transition_audio_stereo = np.broadcast_to(transition_audio, (2, len(transition_audio)))
         else:
             transition_audio_stereo = transition_audio
         _export_mp3(transition_audio_stereo, SAMPLE_RATE, params.output_path)
@@ -774,12 +815,13 @@ def generate_draft_transition(
         result = DraftTransitionResult(
             draft_id=params.draft_id,
             transition_file_path=params.output_path,
-            transition_duration_ms=int(len(transition_audio) / SAMPLE_RATE * 1000),
+            transition_duration_ms=int(transition_audio_stereo.shape[1] / SAMPLE_RATE * 1000),
             track_a_outro_ms=actual_outro_ms,
             track_b_intro_ms=actual_intro_ms,
             transition_mode=TransitionMode.STEMS.value,
             track_a_play_until_ms=track_a_play_until_ms,
             track_b_start_from_ms=track_b_start_from_ms,
+            audio=transition_audio_stereo,
         )
 
         logger.info(
@@ -811,6 +853,7 @@ def _generate_crossfade_fallback(
 
     Used when:
     - BPM difference > 8%
+    - Average energy is below settings.stem_bypass_energy
     - Stem separation fails
 
     The crossfade extracts:
@@ -837,16 +880,9 @@ def _generate_crossfade_fallback(
     track_a_path = ensure_wav_format(params.track_a_path)
     track_b_path = ensure_wav_format(params.track_b_path)
 
-    # Load audio in STEREO at full quality (44100 Hz)
-    import librosa
-    audio_a, sr_a = librosa.load(track_a_path, sr=SAMPLE_RATE, mono=False)
-    audio_b, sr_b = librosa.load(track_b_path, sr=SAMPLE_RATE, mono=False)
-
-    # Ensure stereo (2D array with shape [2, samples])
-    if audio_a.ndim == 1:
-        audio_a = np.stack([audio_a, audio_a])
-    if audio_b.ndim == 1:
-        audio_b = np.stack([audio_b, audio_b])
+    # Track lengths at 44100 Hz; only the crossfaded windows are decoded
+    num_samples_a = get_audio_num_samples(track_a_path, SAMPLE_RATE)
+    num_samples_b = get_audio_num_samples(track_b_path, SAMPLE_RATE)
 
     report_progress("extraction", 50)
 
@@ -866,15 +902,12 @@ def _generate_crossfade_fallback(
 
     # Extract Track A outro: the LAST transition_duration of the track
     # This ensures we have enough audio regardless of outro_start position
-    # For stereo arrays (shape [2, samples]), use .shape[1] for sample count
-    num_samples_a = audio_a.shape[1]
-    num_samples_b = audio_b.shape[1]
-
+    # Stereo windows have shape [2, samples]
     track_a_start = max(0, num_samples_a - transition_samples)
-    segment_a = audio_a[:, track_a_start:]  # Stereo slicing: [channels, samples]
+    segment_a = _load_track_window(track_a_path, track_a_start, num_samples_a)
 
     # Extract Track B intro: the FIRST transition_duration of the track
-    segment_b = audio_b[:, :transition_samples]  # Stereo slicing
+    segment_b = _load_track_window(track_b_path, 0, min(transition_samples, num_samples_b))
 
     logger.info(
         "Segment extraction",
@@ -894,9 +927,9 @@ def _generate_crossfade_fallback(
 
     # Crossfade with equal-power curves for smoother transition
     # Equal power: fade_out = cos(t * pi/2), fade_in = sin(t * pi/2)
-    t = np.linspace(0, 1, target_len)
-    fade_out = np.cos(t * np.pi / 2).astype(np.float32)
-    fade_in = np.sin(t * np.pi / 2).astype(np.float32)
+    t = np.linspace(0, np.pi / 2, target_len, dtype=np.float32)
+    fade_out = np.cos(t)
+    fade_in = np.sin(t)
 
     # Reshape for stereo broadcasting: [1, samples] to broadcast with [2, samples]
     fade_out = fade_out.reshape(1, -1)
@@ -942,6 +975,7 @@ def _generate_crossfade_fallback(
         track_a_play_until_ms=track_a_play_until_ms,
         track_b_start_from_ms=track_b_start_from_ms,
         error=degraded_reason,
+        audio=transition_audio,
     )
 
 
@@ -984,21 +1018,21 @@ def _apply_four_phase_mixing_spec(
     curves_a = _generate_curves_track_a_spec(phase_samples, total_samples)
     curves_b = _generate_curves_track_b_spec(phase_samples, total_samples)
 
-    # Mix stems
+    # Mix stems: multiply-accumulate in place through one scratch buffer
     output = np.zeros(total_samples, dtype=np.float32)
+    tmp = np.empty(total_samples, dtype=np.float32)
 
     for stem_name in ['drums', 'bass', 'other', 'vocals']:
-        stem_a = stems_a.get(stem_name, np.zeros(total_samples))
-        stem_b = stems_b.get(stem_name, np.zeros(total_samples))
+        stem_a = stems_a.get(stem_name, _silence(total_samples))
+        stem_b = stems_b.get(stem_name, _silence(total_samples))
 
         stem_a = _ensure_length(stem_a, total_samples)
         stem_b = _ensure_length(stem_b, total_samples)
 
-        curve_a = curves_a[stem_name]
-        curve_b = curves_b[stem_name]
-
-        mixed_stem = stem_a * curve_a + stem_b * curve_b
-        output += mixed_stem
+        np.multiply(stem_a, curves_a[stem_name], out=tmp)
+        output += tmp
+        np.multiply(stem_b, curves_b[stem_name], out=tmp)
+        output += tmp
 
     return output
 
@@ -1023,12 +1057,12 @@ def _generate_curves_track_a_spec(
     p3_end = p2_end + p3
 
     # Drums: 100% → 100% → 100% → fade to 0%
-    drums = np.ones(total_samples)
+    drums = np.ones(total_samples, dtype=np.float32)
     if p4 > 0:
         drums[p3_end:] = np.linspace(1.0, 0.0, total_samples - p3_end)
 
     # Bass: 100% → 100→20% → 20% → fade to 0%
-    bass = np.ones(total_samples)
+    bass = np.ones(total_samples, dtype=np.float32)
     if p2 > 0:
         bass[p1_end:p2_end] = np.linspace(1.0, 0.2, p2)
     bass[p2_end:p3_end] = 0.2
@@ -1036,13 +1070,13 @@ def _generate_curves_track_a_spec(
         bass[p3_end:] = np.linspace(0.2, 0.0, total_samples - p3_end)
 
     # Vocals: 100% → 100% → 100→0% → 0%
-    vocals = np.ones(total_samples)
+    vocals = np.ones(total_samples, dtype=np.float32)
     if p3 > 0:
         vocals[p2_end:p3_end] = np.linspace(1.0, 0.0, p3)
     vocals[p3_end:] = 0.0
 
     # Other: 100% → 100% → 100% → fade to 0%
-    other = np.ones(total_samples)
+    other = np.ones(total_samples, dtype=np.float32)
     if p4 > 0:
         other[p3_end:] = np.linspace(1.0, 0.0, total_samples - p3_end)
 
@@ -1069,7 +1103,7 @@ def _generate_curves_track_b_spec(
     p3_end = p2_end + p3
 
     # Drums: 0→70% → 70→100% → 100% → 100%
-    drums = np.zeros(total_samples)
+    drums = np.zeros(total_samples, dtype=np.float32)
     if p1 > 0:
         drums[:p1_end] = np.linspace(0.0, 0.7, p1)
     if p2 > 0:
@@ -1077,19 +1111,19 @@ def _generate_curves_track_b_spec(
     drums[p2_end:] = 1.0
 
     # Bass: 0% → 0→100% → 100% → 100%
-    bass = np.zeros(total_samples)
+    bass = np.zeros(total_samples, dtype=np.float32)
     if p2 > 0:
         bass[p1_end:p2_end] = np.linspace(0.0, 1.0, p2)
     bass[p2_end:] = 1.0
 
     # Vocals: 0% → 0% → 0→100% → 100%
-    vocals = np.zeros(total_samples)
+    vocals = np.zeros(total_samples, dtype=np.float32)
     if p3 > 0:
         vocals[p2_end:p3_end] = np.linspace(0.0, 1.0, p3)
     vocals[p3_end:] = 1.0
 
     # Other: 0→30% → 30→50% → 50→100% → 100%
-    other = np.zeros(total_samples)
+    other = np.zeros(total_samples, dtype=np.float32)
     if p1 > 0:
         other[:p1_end] = np.linspace(0.0, 0.3, p1)
     if p2 > 0:
@@ -1158,13 +1192,23 @@ def _lowpass_filter(audio: np.ndarray, cutoff: float, sample_rate: int) -> np.nd
     return sosfilt(sos, audio).astype(np.float32)
 
 
+def _peak(audio: np.ndarray) -> float:
+    """Peak absolute sample value, without allocating np.abs(audio)."""
+    if audio.size == 0:
+        return 0.0
+    return float(max(audio.max(), -audio.min()))
+
+
 def _apply_limiter(audio: np.ndarray, threshold_db: float = -1.0) -> np.ndarray:
-    """Apply brick-wall limiter at threshold dB."""
+    """Apply brick-wall limiter at threshold dB (float audio is scaled in place)."""
     threshold = 10 ** (threshold_db / 20)
-    peak = np.max(np.abs(audio))
+    peak = _peak(audio)
 
     if peak > threshold:
-        audio = audio * (threshold / peak)
+        if np.issubdtype(audio.dtype, np.floating):
+            audio *= threshold / peak
+        else:
+            audio = audio * (threshold / peak)
 
     return audio
 
@@ -1174,7 +1218,7 @@ def _normalize_audio(audio: np.ndarray, target_db: float = -1.0) -> np.ndarray:
     Normalize audio to target Peak dB level.
     Avoids RMS normalization which can destroy dynamics of already mastered tracks.
     """
-    peak = np.max(np.abs(audio))
+    peak = _peak(audio)
 
     if peak == 0:
         return audio
@@ -1187,9 +1231,12 @@ def _normalize_audio(audio: np.ndarray, target_db: float = -1.0) -> np.ndarray:
     # Mastered tracks are already loud.
     
     if peak > target_peak:
-        # Scale down
+        # Scale down (in place for float buffers: one pass, no new allocation)
         scale = target_peak / peak
-        normalized = audio * scale
+        if audio.dtype.kind == 'f' and audio.flags.writeable:
+            normalized = np.multiply(audio, audio.dtype.type(scale), out=audio)
+        else:
+            normalized = audio * scale
     else:
         # If quiet, leave it alone or gentle boost?
         # Better to leave it alone to preserve original quality unless it's very quiet.
@@ -1200,13 +1247,55 @@ def _normalize_audio(audio: np.ndarray, target_db: float = -1.0) -> np.ndarray:
     return normalized
 
 
+@lru_cache(maxsize=8)
+def _silence(n_samples: int) -> np.ndarray:
+    """Read-only mono zeros standing in for a missing stem, shared across mixes."""
+    silence = np.zeros(n_samples, dtype=np.float32)
+    silence.setflags(write=False)
+    return silence
+
+
+def _load_track_window(
+    path: str,
+    start_sample: int,
+    end_sample: int,
+    mono: bool = False
+) -> np.ndarray:
+    """
+    Decode samples [start_sample, end_sample) of a track at SAMPLE_RATE.
+
+    Only the window is read and resampled. Stereo windows are always
+    (2, samples), mono files included.
+    """
+    start_sample = max(0, start_sample)
+    audio, _ = load_audio_window(
+        path,
+        start_sample / SAMPLE_RATE * 1000,
+        max(0, end_sample - start_sample) / SAMPLE_RATE * 1000,
+        target_sr=SAMPLE_RATE,
+        mono=mono,
+    )
+    if not mono and audio.shape[0] == 1:
+        audio = np.repeat(audio, 2, axis=0)
+    return audio
+
+
+def _stretch_source_samples(num_samples: int, source_bpm: float, target_bpm: float) -> int:
+    """Source samples to decode so that, once stretched, they still cover num_samples."""
+    ratio, _ = calculate_stretch_ratio(source_bpm, target_bpm)
+    ratio = max(MIN_STRETCH_RATIO, min(MAX_STRETCH_RATIO, ratio))
+    return int(np.ceil(num_samples * ratio)) + int(STRETCH_PAD_SECONDS * SAMPLE_RATE)
+
+
 def _ensure_length(audio: np.ndarray, target_length: int) -> np.ndarray:
     """Ensure audio is exactly target length (mono)."""
     if len(audio) >= target_length:
         return audio[:target_length]
     else:
-        padding = np.zeros(target_length - len(audio), dtype=audio.dtype)
-        return np.concatenate([audio, padding])
+        # Zero-filled buffer with the audio copied in: one allocation, one copy
+        padded = np.zeros(target_length, dtype=audio.dtype)
+        padded[:len(audio)] = audio
+        return padded
 
 
 def _ensure_length_stereo(audio: np.ndarray, target_length: int) -> np.ndarray:
@@ -1215,41 +1304,36 @@ def _ensure_length_stereo(audio: np.ndarray, target_length: int) -> np.ndarray:
     if num_samples >= target_length:
         return audio[:, :target_length]
     else:
-        padding = np.zeros((2, target_length - num_samples), dtype=audio.dtype)
-        return np.concatenate([audio, padding], axis=1)
+        padded = np.zeros((audio.shape[0], target_length), dtype=audio.dtype)
+        padded[:, :num_samples] = audio
+        return padded
 
 
 def _export_mp3(audio: np.ndarray, sample_rate: int, output_path: str) -> None:
     """Export audio as high-quality MP3 using FFmpeg directly.
     
     Uses FFmpeg's libmp3lame encoder with VBR quality 0 (highest quality)
-    for better audio quality than pydub's default export.
+    for better audio quality than pydub's default export. The samples are
+    piped to FFmpeg as raw float32 PCM, so no temporary WAV is written.
     """
     import subprocess
     import tempfile
-    import soundfile as sf
 
     # Ensure directory exists
     Path(output_path).parent.mkdir(parents=True, exist_ok=True)
 
-    # Prepare audio for export
+    # Prepare audio for export: interleaved [samples, channels], C-contiguous.
+    # Clipping (to prevent distortion) writes straight into that layout, so the
+    # transpose costs no extra copy.
     if audio.ndim == 2:
-        # Convert from [channels, samples] to [samples, channels] for soundfile
-        audio_export = audio.T
+        audio_export = np.empty((audio.shape[1], audio.shape[0]), dtype=np.float32)
+        np.clip(audio.T, -1.0, 1.0, out=audio_export)
         num_channels = 2
     else:
-        audio_export = audio
+        audio_export = np.clip(audio, -1.0, 1.0).astype(np.float32, copy=False)
         num_channels = 1
 
-    # Clip to prevent distortion
-    audio_export = np.clip(audio_export, -1.0, 1.0)
-
-    # Write to temp WAV file (32-bit float for max quality)
-    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp_wav:
-        tmp_wav_path = tmp_wav.name
-        sf.write(tmp_wav_path, audio_export, sample_rate, subtype='FLOAT')
-
-    # Convert to MP3 with FFmpeg - use VBR quality 0 (highest quality) or CBR 320k
+    # Encode to a temp file, then move it into place
     with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as tmp_mp3:
         tmp_mp3_path = tmp_mp3.name
 
@@ -1258,19 +1342,23 @@ def _export_mp3(audio: np.ndarray, sample_rate: int, output_path: str) -> None:
         result = subprocess.run(
             [
                 'ffmpeg', '-y',
-                '-f', 'wav', '-i', tmp_wav_path,
+                '-f', 'f32le',
+                '-ar', str(sample_rate),
+                '-ac', str(num_channels),
+                '-i', 'pipe:0',
                 '-c:a', 'libmp3lame',
                 '-b:a', '320k',
                 '-q:a', '0',  # Highest quality encoding
                 '-f', 'mp3',
                 tmp_mp3_path
             ],
+            input=memoryview(audio_export.astype('<f4', copy=False)).cast('B'),
             capture_output=True,
-            text=True
         )
 
         if result.returncode != 0:
-            logger.warning("FFmpeg encoding issues", stderr=result.stderr[-500:] if result.stderr else "")
+            stderr = result.stderr.decode(errors='replace') if result.stderr else ""
+            logger.warning("FFmpeg encoding issues", stderr=stderr[-500:])
 
         # Move to final destination
         Path(tmp_mp3_path).replace(output_path)
@@ -1301,9 +1389,8 @@ def _export_mp3(audio: np.ndarray, sample_rate: int, output_path: str) -> None:
         logger.info("Transition exported as MP3 (pydub fallback)", path=output_path)
 
     finally:
-        # Cleanup temp files
+        # Cleanup temp file
         try:
-            Path(tmp_wav_path).unlink(missing_ok=True)
             Path(tmp_mp3_path).unlink(missing_ok=True)
         except Exception:
             pass
@@ -1327,10 +1414,27 @@ def generate_draft_transition_from_job(job_data: dict, progress_callback=None) -
     output_dir = Path(settings.output_path) / 'drafts' / draft_id
     output_path = str(output_dir / 'transition.mp3')
 
+    track_a_path = settings.get_absolute_path(job_data['trackAPath'])
+    track_b_path = settings.get_absolute_path(job_data['trackBPath'])
+
+    # The LLM round-trip and the WAV decode of both tracks are independent:
+    # run them together so the plan latency hides behind FFmpeg
+    plan_future = None
+    if _has_llm_planning_data(job_data):
+        plan_future = _prep_pool.submit(_get_llm_transition_plan, job_data)
+    wav_futures = [_prep_pool.submit(ensure_wav_format, path) for path in (track_a_path, track_b_path)]
+
+    for future in wav_futures:
+        try:
+            future.result()
+        except Exception as e:
+            # The generator converts again and reports the failure itself
+            logger.warning("WAV prefetch failed", draft_id=draft_id, error=str(e))
+
     # Check if we have LLM planning data (keys for harmonic analysis)
     llm_plan = None
-    if _has_llm_planning_data(job_data):
-        llm_plan = _get_llm_transition_plan(job_data)
+    if plan_future is not None:
+        llm_plan = plan_future.result()
         if llm_plan:
             logger.info(
                 "Using LLM transition plan for draft",
@@ -1341,8 +1445,8 @@ def generate_draft_transition_from_job(job_data: dict, progress_callback=None) -
 
     params = DraftTransitionParams(
         draft_id=draft_id,
-        track_a_path=settings.get_absolute_path(job_data['trackAPath']),
-        track_b_path=settings.get_absolute_path(job_data['trackBPath']),
+        track_a_path=track_a_path,
+        track_b_path=track_b_path,
         track_a_bpm=job_data['trackABpm'],
         track_b_bpm=job_data['trackBBpm'],
         track_a_beats=job_data.get('trackABeats', []),
@@ -1591,6 +1695,18 @@ def generate_draft_transition_with_plan(
         transition_bars = transition_config.get("duration_bars", 8)
         return _generate_crossfade_fallback(params, transition_bars, progress_callback)
 
+    # STEM_BLEND needs B stretched onto A's grid; skip separation if that is out of range
+    _, is_within_limits = calculate_stretch_ratio(params.track_b_bpm, params.track_a_bpm)
+    if not is_within_limits:
+        logger.warning(
+            "BPM difference too large for time-stretch, falling back to crossfade",
+            track_a_bpm=params.track_a_bpm,
+            track_b_bpm=params.track_b_bpm,
+        )
+        return _generate_crossfade_fallback(
+            params, transition_config.get("duration_bars", 16), progress_callback
+        )
+
     # Handle STEM_BLEND with LLM phases - ENHANCED with bass swap
     try:
         report_progress("extraction", 0)
@@ -1599,9 +1715,8 @@ def generate_draft_transition_with_plan(
         track_a_path = ensure_wav_format(params.track_a_path)
         track_b_path = ensure_wav_format(params.track_b_path)
 
-        import librosa
-        audio_a, sr_a = librosa.load(track_a_path, sr=SAMPLE_RATE, mono=True)
-        audio_b, sr_b = librosa.load(track_b_path, sr=SAMPLE_RATE, mono=True)
+        audio_a_len = get_audio_num_samples(track_a_path, SAMPLE_RATE)
+        audio_b_len = get_audio_num_samples(track_b_path, SAMPLE_RATE)
 
         report_progress("extraction", 20)
 
@@ -1622,7 +1737,7 @@ def generate_draft_transition_with_plan(
         # Extract segments (with beat alignment and safety check)
         
         # Track A: Find downbeat near outro start (or end of track if not set)
-        track_a_duration_s = len(audio_a) / SAMPLE_RATE
+        track_a_duration_s = audio_a_len / SAMPLE_RATE
         reference_time_a = track_a_duration_s - (transition_duration_ms / 1000.0)
         
         if params.track_a_outro_start_ms > 0:
@@ -1641,7 +1756,7 @@ def generate_draft_transition_with_plan(
         while True:
             track_a_start_candidate = int(a_cue_time * SAMPLE_RATE)
             end_sample = track_a_start_candidate + transition_samples
-            max_samples = len(audio_a)
+            max_samples = audio_a_len
             
             logger.info(
                 "Checking cue point safety (LLM)",
@@ -1681,20 +1796,33 @@ def generate_draft_transition_with_plan(
         track_b_start = int(b_cue_time_original * SAMPLE_RATE)
 
         # Extract Track A
-        a_segment_end = min(track_a_start + transition_samples, len(audio_a))
-        segment_a = audio_a[track_a_start:a_segment_end]
+        a_segment_end = min(track_a_start + transition_samples, audio_a_len)
+        segment_a, _ = load_audio_window(
+            track_a_path,
+            track_a_start / SAMPLE_RATE * 1000,
+            (a_segment_end - track_a_start) / SAMPLE_RATE * 1000,
+            target_sr=SAMPLE_RATE,
+        )
         
-        # Extract Track B (with buffer for stretch)
-        samples_needed_b = int(transition_samples * 1.1)
-        b_segment_end = min(track_b_start + samples_needed_b, len(audio_b))
-        segment_b = audio_b[track_b_start:b_segment_end]
+        # Extract Track B (enough source to cover the transition once stretched)
+        samples_needed_b = _stretch_source_samples(
+            transition_samples, params.track_b_bpm, target_bpm
+        )
+        b_segment_end = min(track_b_start + samples_needed_b, audio_b_len)
+        segment_b, _ = load_audio_window(
+            track_b_path,
+            track_b_start / SAMPLE_RATE * 1000,
+            (b_segment_end - track_b_start) / SAMPLE_RATE * 1000,
+            target_sr=SAMPLE_RATE,
+        )
 
         report_progress("extraction", 40)
         report_progress("time-stretch", 0)
 
         # Time-stretch Track B
-        segment_b_stretched, actual_bpm = stretch_to_bpm(
-            segment_b, SAMPLE_RATE, params.track_b_bpm, target_bpm
+        segment_b_stretched, actual_bpm = stretch_to_bpm_cached(
+            segment_b, SAMPLE_RATE, params.track_b_bpm, target_bpm,
+            source_window_key(track_b_path, track_b_start, b_segment_end - track_b_start)
         )
 
         report_progress("time-stretch", 100)
@@ -1706,12 +1834,15 @@ def generate_draft_transition_with_plan(
 
         # Separate stems
         report_progress("stems", 0)
-        logger.info("Separating stems for track A (LLM plan)")
-        stems_a = separate_stems(segment_a, SAMPLE_RATE)
-        report_progress("stems", 50)
-
-        logger.info("Separating stems for track B (LLM plan)")
-        stems_b = separate_stems(segment_b_stretched, SAMPLE_RATE)
+        logger.info("Separating stems for tracks A and B (LLM plan)")
+        stems_a, stems_b = separate_stems_batch(
+            [segment_a, segment_b_stretched],
+            SAMPLE_RATE,
+            cache_keys=[
+                source_window_key(track_a_path, track_a_start, min_len),
+                source_window_key(track_b_path, track_b_start, min_len, params.track_b_bpm, target_bpm),
+            ],
+        )
         report_progress("stems", 100)
 
         # === NEW: ENRICHED ANALYSIS ===
@@ -1873,7 +2004,8 @@ def generate_draft_transition_with_plan(
         # Export
         report_progress("export", 0)
         if transition_audio.ndim == 1:
-            transition_audio_stereo = np.stack([transition_audio, transition_audio])
+            # Mono feeds both channels as a read-only view instead of a stacked copy
+            transition_audio_stereo = np.broadcast_to(transition_audio, (2, len(transition_audio)))
         else:
             transition_audio_stereo = transition_audio
         _export_mp3(transition_audio_stereo, SAMPLE_RATE, params.output_path)
@@ -1889,18 +2021,19 @@ def generate_draft_transition_with_plan(
         return DraftTransitionResult(
             draft_id=params.draft_id,
             transition_file_path=params.output_path,
-            transition_duration_ms=int(len(transition_audio) / SAMPLE_RATE * 1000),
+            transition_duration_ms=int(transition_audio_stereo.shape[1] / SAMPLE_RATE * 1000),
             track_a_outro_ms=actual_outro_ms,
             track_b_intro_ms=actual_intro_ms,
             transition_mode=TransitionMode.STEMS.value,
             track_a_play_until_ms=track_a_play_until_ms,
             track_b_start_from_ms=track_b_start_from_ms,
+            audio=transition_audio_stereo,
         )
 
         return DraftTransitionResult(
             draft_id=params.draft_id,
             transition_file_path=params.output_path,
-            transition_duration_ms=int(len(transition_audio) / SAMPLE_RATE * 1000),
+            transition_duration_ms=int(transition_audio_stereo.shape[1] / SAMPLE_RATE * 1000),
             track_a_outro_ms=actual_outro_ms,
             track_b_intro_ms=actual_intro_ms,
             transition_mode=TransitionMode.STEMS.value,
@@ -1944,15 +2077,9 @@ def _generate_hard_cut_with_plan(
     track_a_path = ensure_wav_format(params.track_a_path)
     track_b_path = ensure_wav_format(params.track_b_path)
 
-    import librosa
-    audio_a, sr_a = librosa.load(track_a_path, sr=SAMPLE_RATE, mono=False)
-    audio_b, sr_b = librosa.load(track_b_path, sr=SAMPLE_RATE, mono=False)
-
-    # Ensure stereo
-    if audio_a.ndim == 1:
-        audio_a = np.stack([audio_a, audio_a])
-    if audio_b.ndim == 1:
-        audio_b = np.stack([audio_b, audio_b])
+    # Track lengths only; the stereo context windows are decoded below
+    num_samples_a = get_audio_num_samples(track_a_path, SAMPLE_RATE)
+    num_samples_b = get_audio_num_samples(track_b_path, SAMPLE_RATE)
 
     report_progress("extraction", 50)
 
@@ -1965,16 +2092,16 @@ def _generate_hard_cut_with_plan(
 
     # Debug logging
     logger.info("Hard cut extraction params",
-                audio_a_shape=audio_a.shape,
-                audio_b_shape=audio_b.shape,
+                num_samples_a=num_samples_a,
+                num_samples_b=num_samples_b,
                 cut_time_s=cut_time_s,
                 entry_time_s=entry_time_s,
                 track_a_outro_start_ms=params.track_a_outro_start_ms,
                 sample_rate=SAMPLE_RATE)
 
     # Clamp cut_time to valid range
-    audio_a_duration_s = audio_a.shape[1] / SAMPLE_RATE
-    audio_b_duration_s = audio_b.shape[1] / SAMPLE_RATE
+    audio_a_duration_s = num_samples_a / SAMPLE_RATE
+    audio_b_duration_s = num_samples_b / SAMPLE_RATE
     cut_time_s = min(cut_time_s, audio_a_duration_s)
     entry_time_s = min(entry_time_s, audio_b_duration_s - 1)  # Leave at least 1s
 
@@ -1994,14 +2121,14 @@ def _generate_hard_cut_with_plan(
     # Extract segment from track A: context_duration before the cut point
     start_a = max(0, cut_sample - context_samples)
     # Ensure we don't go past the audio length
-    cut_sample = min(cut_sample, audio_a.shape[1])
-    segment_a = audio_a[:, start_a:cut_sample]
+    cut_sample = min(cut_sample, num_samples_a)
+    segment_a = _load_track_window(track_a_path, start_a, cut_sample)
 
     # Extract segment from track B: context_duration after the entry point
-    entry_sample = min(entry_sample, audio_b.shape[1] - context_samples)
+    entry_sample = min(entry_sample, num_samples_b - context_samples)
     entry_sample = max(0, entry_sample)
-    end_b = min(audio_b.shape[1], entry_sample + context_samples)
-    segment_b = audio_b[:, entry_sample:end_b]
+    end_b = min(num_samples_b, entry_sample + context_samples)
+    segment_b = _load_track_window(track_b_path, entry_sample, end_b)
 
     logger.info("Hard cut segments extracted",
                 segment_a_shape=segment_a.shape,
@@ -2129,9 +2256,12 @@ def _apply_llm_phase_mixing(
     # Get total bars from phases
     total_bars = max(phase.get("bars", [1, 1])[1] for phase in phases)
 
-    # Generate volume curves for each stem
-    curves_a = {stem: np.zeros(total_samples, dtype=np.float32) for stem in ['drums', 'bass', 'other', 'vocals']}
-    curves_b = {stem: np.zeros(total_samples, dtype=np.float32) for stem in ['drums', 'bass', 'other', 'vocals']}
+    # Generate volume curves for each stem, as rows of one matrix so all
+    # eight are smoothed together
+    stem_names = ['drums', 'bass', 'other', 'vocals']
+    curve_matrix = np.zeros((2 * len(stem_names), total_samples), dtype=np.float32)
+    curves_a = dict(zip(stem_names, curve_matrix[:len(stem_names)]))
+    curves_b = dict(zip(stem_names, curve_matrix[len(stem_names):]))
 
     for phase in phases:
         bars = phase.get("bars", [1, 1])
@@ -2156,17 +2286,16 @@ def _apply_llm_phase_mixing(
             curves_b[stem][start_sample:end_sample] = b_level
 
     # Smooth curves to avoid clicks
-    smooth_window = samples_per_bar // 4
-    for stem in ['drums', 'bass', 'other', 'vocals']:
-        curves_a[stem] = _smooth_curve(curves_a[stem], smooth_window)
-        curves_b[stem] = _smooth_curve(curves_b[stem], smooth_window)
+    curve_matrix = _smooth_curve(curve_matrix, samples_per_bar // 4)
+    curves_a = dict(zip(stem_names, curve_matrix[:len(stem_names)]))
+    curves_b = dict(zip(stem_names, curve_matrix[len(stem_names):]))
 
     # Mix stems
     output = np.zeros(total_samples, dtype=np.float32)
 
     for stem_name in ['drums', 'bass', 'other', 'vocals']:
-        stem_a = stems_a.get(stem_name, np.zeros(total_samples))
-        stem_b = stems_b.get(stem_name, np.zeros(total_samples))
+        stem_a = stems_a.get(stem_name, _silence(total_samples))
+        stem_b = stems_b.get(stem_name, _silence(total_samples))
 
         stem_a = _ensure_length(stem_a, total_samples)
         stem_b = _ensure_length(stem_b, total_samples)
@@ -2178,12 +2307,10 @@ def _apply_llm_phase_mixing(
 
 
 def _smooth_curve(curve: np.ndarray, window_size: int) -> np.ndarray:
-    """Apply smoothing to avoid clicks."""
+    """Apply smoothing (along the last axis) to avoid clicks."""
     if window_size <= 1:
         return curve
-    kernel = np.ones(window_size) / window_size
-    smoothed = np.convolve(curve, kernel, mode='same')
-    return smoothed.astype(np.float32)
+    return moving_average(curve, window_size)
 
 
 # =============================================================================
@@ -2225,9 +2352,12 @@ def _apply_llm_phase_mixing_with_bass_swap(
     # Get total bars from phases
     total_bars = max(phase.get("bars", [1, 1])[1] for phase in phases)
 
-    # Generate volume curves for each stem (but NOT bass - it's already swapped)
-    curves_a = {stem: np.zeros(total_samples, dtype=np.float32) for stem in ['drums', 'bass', 'other', 'vocals']}
-    curves_b = {stem: np.zeros(total_samples, dtype=np.float32) for stem in ['drums', 'bass', 'other', 'vocals']}
+    # Generate volume curves for each stem (but NOT bass - it's already
+    # swapped), as rows of one matrix so they are smoothed together
+    stem_names = ['drums', 'other', 'vocals']
+    curve_matrix = np.zeros((2 * len(stem_names), total_samples), dtype=np.float32)
+    curves_a = dict(zip(stem_names, curve_matrix[:len(stem_names)]))
+    curves_b = dict(zip(stem_names, curve_matrix[len(stem_names):]))
 
     for phase in phases:
         bars = phase.get("bars", [1, 1])
@@ -2252,22 +2382,22 @@ def _apply_llm_phase_mixing_with_bass_swap(
             curves_a[stem][start_sample:end_sample] = a_level
             curves_b[stem][start_sample:end_sample] = b_level
 
-    # For bass, use 1.0 curves since swap is already applied
-    curves_a['bass'] = np.ones(total_samples, dtype=np.float32)
-    curves_b['bass'] = np.ones(total_samples, dtype=np.float32)
-
     # Smooth curves to avoid clicks (except bass which is already clean)
-    smooth_window = samples_per_bar // 4
-    for stem in ['drums', 'other', 'vocals']:
-        curves_a[stem] = _smooth_curve(curves_a[stem], smooth_window)
-        curves_b[stem] = _smooth_curve(curves_b[stem], smooth_window)
+    curve_matrix = _smooth_curve(curve_matrix, samples_per_bar // 4)
+    curves_a = dict(zip(stem_names, curve_matrix[:len(stem_names)]))
+    curves_b = dict(zip(stem_names, curve_matrix[len(stem_names):]))
+
+    # For bass, use 1.0 curves since swap is already applied
+    unity = np.ones(total_samples, dtype=np.float32)
+    curves_a['bass'] = unity
+    curves_b['bass'] = unity
 
     # Mix stems
     output = np.zeros(total_samples, dtype=np.float32)
 
     for stem_name in ['drums', 'bass', 'other', 'vocals']:
-        stem_a = stems_a.get(stem_name, np.zeros(total_samples))
-        stem_b = stems_b.get(stem_name, np.zeros(total_samples))
+        stem_a = stems_a.get(stem_name, _silence(total_samples))
+        stem_b = stems_b.get(stem_name, _silence(total_samples))
 
         stem_a = _ensure_length(stem_a, total_samples)
         stem_b = _ensure_length(stem_b, total_samples)
@@ -2329,8 +2459,8 @@ def _apply_four_phase_mixing_with_bass_swap(
     output = np.zeros(total_samples, dtype=np.float32)
 
     for stem_name in ['drums', 'bass', 'other', 'vocals']:
-        stem_a = stems_a.get(stem_name, np.zeros(total_samples))
-        stem_b = stems_b.get(stem_name, np.zeros(total_samples))
+        stem_a = stems_a.get(stem_name, _silence(total_samples))
+        stem_b = stems_b.get(stem_name, _silence(total_samples))
 
         stem_a = _ensure_length(stem_a, total_samples)
         stem_b = _ensure_length(stem_b, total_samples)
@@ -2356,18 +2486,18 @@ def _generate_curves_track_a_no_bass(
     p3_end = p2_end + p3
 
     # Drums: 100% → 100% → 100% → fade to 0%
-    drums = np.ones(total_samples)
+    drums = np.ones(total_samples, dtype=np.float32)
     if p4 > 0:
         drums[p3_end:] = np.linspace(1.0, 0.0, total_samples - p3_end)
 
     # Vocals: 100% → 100% → 100→0% → 0%
-    vocals = np.ones(total_samples)
+    vocals = np.ones(total_samples, dtype=np.float32)
     if p3 > 0:
         vocals[p2_end:p3_end] = np.linspace(1.0, 0.0, p3)
     vocals[p3_end:] = 0.0
 
     # Other: 100% → 100% → 100% → fade to 0%
-    other = np.ones(total_samples)
+    other = np.ones(total_samples, dtype=np.float32)
     if p4 > 0:
         other[p3_end:] = np.linspace(1.0, 0.0, total_samples - p3_end)
 
@@ -2385,7 +2515,7 @@ def _generate_curves_track_b_no_bass(
     p3_end = p2_end + p3
 
     # Drums: 0→70% → 70→100% → 100% → 100%
-    drums = np.zeros(total_samples)
+    drums = np.zeros(total_samples, dtype=np.float32)
     if p1 > 0:
         drums[:p1_end] = np.linspace(0.0, 0.7, p1)
     if p2 > 0:
@@ -2393,13 +2523,13 @@ def _generate_curves_track_b_no_bass(
     drums[p2_end:] = 1.0
 
     # Vocals: 0% → 0% → 0→100% → 100%
-    vocals = np.zeros(total_samples)
+    vocals = np.zeros(total_samples, dtype=np.float32)
     if p3 > 0:
         vocals[p2_end:p3_end] = np.linspace(0.0, 1.0, p3)
     vocals[p3_end:] = 1.0
 
     # Other: 0→30% → 30→50% → 50→100% → 100%
-    other = np.zeros(total_samples)
+    other = np.zeros(total_samples, dtype=np.float32)
     if p1 > 0:
         other[:p1_end] = np.linspace(0.0, 0.3, p1)
     if p2 > 0:
@@ -2444,15 +2574,9 @@ def _generate_hard_cut_with_plan_enhanced(
     track_a_path = ensure_wav_format(params.track_a_path)
     track_b_path = ensure_wav_format(params.track_b_path)
 
-    import librosa
-    audio_a, sr_a = librosa.load(track_a_path, sr=SAMPLE_RATE, mono=False)
-    audio_b, sr_b = librosa.load(track_b_path, sr=SAMPLE_RATE, mono=False)
-
-    # Ensure stereo
-    if audio_a.ndim == 1:
-        audio_a = np.stack([audio_a, audio_a])
-    if audio_b.ndim == 1:
-        audio_b = np.stack([audio_b, audio_b])
+    # Track lengths only; the stereo windows are decoded below
+    num_samples_a = get_audio_num_samples(track_a_path, SAMPLE_RATE)
+    num_samples_b = get_audio_num_samples(track_b_path, SAMPLE_RATE)
 
     report_progress("extraction", 50)
 
@@ -2472,8 +2596,8 @@ def _generate_hard_cut_with_plan_enhanced(
     entry_time_s = track_b_config.get("start_from_seconds", 0)
 
     # Clamp to valid range
-    audio_a_duration_s = audio_a.shape[1] / SAMPLE_RATE
-    audio_b_duration_s = audio_b.shape[1] / SAMPLE_RATE
+    audio_a_duration_s = num_samples_a / SAMPLE_RATE
+    audio_b_duration_s = num_samples_b / SAMPLE_RATE
     cut_time_s = min(cut_time_s, audio_a_duration_s)
     entry_time_s = max(0, min(entry_time_s, audio_b_duration_s - 1))
     intro_end_s = max(intro_end_s, 1.0)  # At least 1 second
@@ -2504,17 +2628,17 @@ def _generate_hard_cut_with_plan_enhanced(
     
     # 1. Start point (start of context)
     # If outro_start is valid, go back context_samples
-    if outro_start_sample < (audio_a.shape[1] * 0.1):
+    if outro_start_sample < (num_samples_a * 0.1):
          # Fallback for missing cue: end of track - tail
-         effective_cut_sample = max(0, audio_a.shape[1] - tail_samples)
+         effective_cut_sample = max(0, num_samples_a - tail_samples)
     else:
-         effective_cut_sample = min(outro_start_sample, audio_a.shape[1])
+         effective_cut_sample = min(outro_start_sample, num_samples_a)
     
     start_a_context = max(0, effective_cut_sample - context_samples)
-    end_a_tail = min(effective_cut_sample + tail_samples, audio_a.shape[1])
+    end_a_tail = min(effective_cut_sample + tail_samples, num_samples_a)
     
     # Load the full chunk (Context + Potential Tail)
-    segment_a_full = audio_a[:, start_a_context:end_a_tail]
+    segment_a_full = _load_track_window(track_a_path, start_a_context, end_a_tail)
     
     # Calculate where the cut is relative to this chunk
     # If we hit start of file, cut_index might be less than context_samples
@@ -2522,9 +2646,9 @@ def _generate_hard_cut_with_plan_enhanced(
     
     # For segment_b, same logic
     entry_sample = max(0, entry_sample)
-    end_b = min(intro_end_sample, audio_b.shape[1])
+    end_b = min(intro_end_sample, num_samples_b)
     end_b = max(end_b, entry_sample + int(2.0 * SAMPLE_RATE))
-    segment_b = audio_b[:, entry_sample:end_b]
+    segment_b = _load_track_window(track_b_path, entry_sample, min(end_b, num_samples_b))
 
     logger.info(
         "HARD_CUT segments extracted",
@@ -2724,9 +2848,7 @@ def _generate_filter_sweep_transition(
     track_a_path = ensure_wav_format(params.track_a_path)
     track_b_path = ensure_wav_format(params.track_b_path)
 
-    import librosa
-    audio_a, sr_a = librosa.load(track_a_path, sr=SAMPLE_RATE, mono=True)
-    audio_b, sr_b = librosa.load(track_b_path, sr=SAMPLE_RATE, mono=True)
+    num_samples_a = get_audio_num_samples(track_a_path, SAMPLE_RATE)
 
     report_progress("extraction", 50)
 
@@ -2738,17 +2860,20 @@ def _generate_filter_sweep_transition(
     transition_duration_ms = bars_to_ms(transition_bars, target_bpm)
     transition_duration_s = transition_duration_ms / 1000
 
-    # Extract segments
-    track_a_start = max(0, len(audio_a) - transition_samples)
-    segment_a = audio_a[track_a_start:]
-    segment_b = audio_b[:transition_samples]
+    # Extract segments (only these windows are decoded)
+    track_a_start = max(0, num_samples_a - transition_samples)
+    segment_a = _load_track_window(track_a_path, track_a_start, num_samples_a, mono=True)
+    # B is stretched next: decode just enough source to still cover the transition
+    b_source_samples = _stretch_source_samples(transition_samples, params.track_b_bpm, target_bpm)
+    segment_b = _load_track_window(track_b_path, 0, b_source_samples, mono=True)
 
     report_progress("extraction", 100)
     report_progress("time-stretch", 0)
 
     # Time-stretch Track B
-    segment_b_stretched, actual_bpm = stretch_to_bpm(
-        segment_b, SAMPLE_RATE, params.track_b_bpm, target_bpm
+    segment_b_stretched, actual_bpm = stretch_to_bpm_cached(
+        segment_b, SAMPLE_RATE, params.track_b_bpm, target_bpm,
+        source_window_key(track_b_path, 0, b_source_samples)
     )
 
     report_progress("time-stretch", 100)
@@ -2862,9 +2987,7 @@ def _generate_echo_out_transition(
     track_a_path = ensure_wav_format(params.track_a_path)
     track_b_path = ensure_wav_format(params.track_b_path)
 
-    import librosa
-    audio_a, sr_a = librosa.load(track_a_path, sr=SAMPLE_RATE, mono=True)
-    audio_b, sr_b = librosa.load(track_b_path, sr=SAMPLE_RATE, mono=True)
+    num_samples_a = get_audio_num_samples(track_a_path, SAMPLE_RATE)
 
     report_progress("extraction", 50)
 
@@ -2882,14 +3005,14 @@ def _generate_echo_out_transition(
     context_samples = int(context_bars * bar_duration_s * SAMPLE_RATE)
     tail_samples = int(tail_duration_s * SAMPLE_RATE)
 
-    # Extract segment from end of A
-    track_a_start = max(0, len(audio_a) - context_samples - tail_samples)
-    segment_a = audio_a[track_a_start:]
+    # Extract segment from end of A (only these windows are decoded)
+    track_a_start = max(0, num_samples_a - context_samples - tail_samples)
+    segment_a = _load_track_window(track_a_path, track_a_start, num_samples_a, mono=True)
 
     # Extract intro from B
     intro_bars = 4
     intro_samples = int(intro_bars * bar_duration_s * SAMPLE_RATE)
-    segment_b = audio_b[:intro_samples]
+    segment_b = _load_track_window(track_b_path, 0, intro_samples, mono=True)
 
     report_progress("extraction", 100)
     report_progress("effects", 0)
@@ -2928,7 +3051,7 @@ def _generate_echo_out_transition(
 
     # Ensure B has fade in
     if len(segment_b) > overlap_samples:
-        fade_in = np.linspace(0.0, 1.0, overlap_samples)
+        fade_in = np.linspace(0.0, 1.0, overlap_samples, dtype=np.float32)
         segment_b_faded = segment_b.copy()
         segment_b_faded[:overlap_samples] *= fade_in
     else:
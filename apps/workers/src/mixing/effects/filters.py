@@ -15,6 +15,20 @@ Common uses:
 import numpy as np
 from scipy.signal import butter, sosfilt, sosfiltfilt
 from typing import Literal, Optional
+import structlog
+
+logger = structlog.get_logger()
+
+# Try to import numba for the fused sweep-and-crossfade kernel
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    logger.warning("numba not available - using chunked sosfilt for filter sweeps")
+
+# Cutoff automation step of filter sweeps (50 ms)
+SWEEP_STEP_SECONDS = 0.05
 
 
 def apply_filter(
@@ -182,36 +196,19 @@ def create_filter_sweep(
         Audio with filter sweep applied
     """
     num_samples = len(audio)
-    sweep_samples = num_samples if duration is None else int(duration * sr)
-    sweep_samples = min(sweep_samples, num_samples)
-
-    # Generate frequency curve
-    if curve == "exponential":
-        # Exponential feels more natural for frequency sweeps
-        freqs = np.geomspace(start_freq, end_freq, sweep_samples)
-    else:
-        freqs = np.linspace(start_freq, end_freq, sweep_samples)
-
-    # Extend to full audio length if needed
-    if sweep_samples < num_samples:
-        freqs = np.concatenate([
-            freqs,
-            np.full(num_samples - sweep_samples, end_freq)
-        ])
 
     # Process in chunks for smooth automation
-    chunk_size = int(sr * 0.05)  # 50ms chunks
-    num_chunks = int(np.ceil(num_samples / chunk_size))
+    chunk_size = int(sr * SWEEP_STEP_SECONDS)
+    chunk_freqs = sweep_chunk_freqs(
+        num_samples, start_freq, end_freq, duration, curve, chunk_size, sr
+    )
 
     output = np.zeros_like(audio)
 
-    for i in range(num_chunks):
+    for i, chunk_freq in enumerate(chunk_freqs):
         start_idx = i * chunk_size
         end_idx = min((i + 1) * chunk_size, num_samples)
 
-        # Get average frequency for this chunk
-        chunk_freq = np.mean(freqs[start_idx:end_idx])
-
         # Apply filter to chunk
         chunk = audio[start_idx:end_idx]
         filtered_chunk = apply_filter(
@@ -236,6 +233,201 @@ def create_filter_sweep(
     return output
 
 
+def sweep_chunk_freqs(
+    num_samples: int,
+    start_freq: float,
+    end_freq: float,
+    duration: Optional[float],
+    curve: Literal["linear", "exponential"],
+    chunk_size: int,
+    sr: int = 44100
+) -> np.ndarray:
+    """
+    Cutoff frequency of each automation chunk of a filter sweep.
+
+    The cutoff moves from start_freq to end_freq over the sweep duration
+    (None = full audio length) and holds end_freq afterwards; each chunk
+    uses the mean cutoff over its samples.
+
+    Returns:
+        Array of ceil(num_samples / chunk_size) frequencies
+    """
+    sweep_samples = num_samples if duration is None else int(duration * sr)
+    sweep_samples = min(sweep_samples, num_samples)
+
+    # Generate frequency curve
+    if curve == "exponential":
+        # Exponential feels more natural for frequency sweeps
+        freqs = np.geomspace(start_freq, end_freq, sweep_samples)
+    else:
+        freqs = np.linspace(start_freq, end_freq, sweep_samples)
+
+    # Extend to full audio length if needed
+    if sweep_samples < num_samples:
+        freqs = np.concatenate([
+            freqs,
+            np.full(num_samples - sweep_samples, end_freq)
+        ])
+
+    if num_samples == 0:
+        return freqs
+
+    starts = np.arange(0, num_samples, chunk_size)
+    counts = np.diff(np.append(starts, num_samples))
+    return np.add.reduceat(freqs, starts) / counts
+
+
+def butterworth_sos(
+    filter_type: Literal["hpf", "lpf"],
+    cutoff_freqs: np.ndarray,
+    order: int = 4,
+    sr: int = 44100
+) -> np.ndarray:
+    """
+    Butterworth HPF/LPF second-order sections for many cutoffs at once.
+
+    Same response as ``butter(order, cutoff, output='sos')`` per cutoff, but
+    even orders are designed in closed form for all cutoffs in one go.
+    Cutoffs are clamped like apply_filter does.
+
+    Returns:
+        Array of shape (len(cutoff_freqs), ceil(order / 2), 6)
+    """
+    nyquist = sr / 2
+    cutoffs = np.clip(np.asarray(cutoff_freqs, dtype=np.float64), 20, nyquist - 100)
+
+    if order % 2:
+        btype = 'high' if filter_type == "hpf" else 'low'
+        return np.stack([butter(order, f / nyquist, btype=btype, output='sos') for f in cutoffs])
+
+    # Bilinear transform of each conjugate pole pair, prewarped at the cutoff
+    k = np.tan(np.pi * cutoffs / sr)[:, None]
+    q = 1.0 / (2.0 * np.cos(np.pi * (2 * np.arange(order // 2) + 1) / (2 * order)))
+    norm = 1.0 / (1.0 + k / q + k * k)
+
+    sos = np.empty((len(cutoffs), order // 2, 6))
+    sos[..., 0] = k * k * norm if filter_type == "lpf" else norm
+    sos[..., 1] = 2 * sos[..., 0] if filter_type == "lpf" else -2 * sos[..., 0]
+    sos[..., 2] = sos[..., 0]
+    sos[..., 3] = 1.0
+    sos[..., 4] = 2.0 * (k * k - 1.0) * norm
+    sos[..., 5] = (1.0 - k / q + k * k) * norm
+    return sos
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _sweep_crossfade_kernel(a, b, sos_a, sos_b, chunk_size, out):
+        """
+        Filter a and b through their time-varying biquad cascades and mix
+        them with an equal-power crossfade, one sample at a time.
+
+        Transposed direct form II like sosfilt; the state carries over when
+        the coefficients change at each chunk.
+        """
+        n = out.shape[0]
+        sections = sos_a.shape[1]
+        za = np.zeros((sections, 2))
+        zb = np.zeros((sections, 2))
+        # Fade angle advances by a fixed step: rotate (cos, sin) instead of
+        # evaluating both per sample (the loop is sequential anyway)
+        step = (np.pi / 2) / max(n - 1, 1)
+        cos_step = np.cos(step)
+        sin_step = np.sin(step)
+        fade_out = 1.0
+        fade_in = 0.0
+        for i in range(n):
+            c = i // chunk_size
+            ya = np.float64(a[i])
+            yb = np.float64(b[i])
+            for s in range(sections):
+                x = ya
+                ya = sos_a[c, s, 0] * x + za[s, 0]
+                za[s, 0] = sos_a[c, s, 1] * x - sos_a[c, s, 4] * ya + za[s, 1]
+                za[s, 1] = sos_a[c, s, 2] * x - sos_a[c, s, 5] * ya
+                x = yb
+                yb = sos_b[c, s, 0] * x + zb[s, 0]
+                zb[s, 0] = sos_b[c, s, 1] * x - sos_b[c, s, 4] * yb + zb[s, 1]
+                zb[s, 1] = sos_b[c, s, 2] * x - sos_b[c, s, 5] * yb
+            out[i] = ya * fade_out + yb * fade_in
+            fade_out, fade_in = (
+                fade_out * cos_step - fade_in * sin_step,
+                fade_in * cos_step + fade_out * sin_step,
+            )
+
+
+def _apply_sos_schedule(audio: np.ndarray, sos: np.ndarray, chunk_size: int) -> np.ndarray:
+    """Filter audio chunk by chunk with per-chunk sections, carrying the state."""
+    output = np.empty(len(audio), dtype=np.float32)
+    zi = np.zeros((sos.shape[1], 2))
+    for c, chunk_sos in enumerate(sos):
+        chunk = slice(c * chunk_size, (c + 1) * chunk_size)
+        output[chunk], zi = sosfilt(chunk_sos, audio[chunk], zi=zi)
+    return output
+
+
+def filter_sweep_crossfade(
+    audio_a: np.ndarray,
+    audio_b: np.ndarray,
+    hpf_start: float = 20,
+    hpf_end: float = 2000,
+    lpf_start: float = 200,
+    lpf_end: float = 20000,
+    duration: Optional[float] = None,
+    curve: Literal["linear", "exponential"] = "exponential",
+    order: int = 4,
+    sr: int = 44100
+) -> np.ndarray:
+    """
+    HPF sweep on track A and LPF sweep on track B, equal-power crossfaded.
+
+    Unlike two create_filter_sweep calls followed by a crossfade, both sweeps
+    and the mix run in a single pass over the audio. The filters are causal
+    and keep their state across the 50 ms automation steps, so the steps need
+    no boundary fades. Each Butterworth cascade runs twice, so the magnitude
+    response (-6 dB at the cutoff, twice the order's slope) matches the
+    forward-backward apply_filter; only the phase differs.
+
+    Args:
+        audio_a: Outgoing track audio (mono)
+        audio_b: Incoming track audio (mono, same length as audio_a)
+        hpf_start: Starting HPF cutoff for track A
+        hpf_end: Ending HPF cutoff for track A
+        lpf_start: Starting LPF cutoff for track B
+        lpf_end: Ending LPF cutoff for track B
+        duration: Sweep duration in seconds (None = full audio length)
+        curve: "linear" or "exponential"
+        order: Filter order
+        sr: Sample rate
+
+    Returns:
+        Mixed transition audio (float32)
+    """
+    num_samples = len(audio_a)
+    chunk_size = int(sr * SWEEP_STEP_SECONDS)
+    sos_a = butterworth_sos(
+        "hpf", sweep_chunk_freqs(num_samples, hpf_start, hpf_end, duration, curve, chunk_size, sr),
+        order=order, sr=sr
+    )
+    sos_b = butterworth_sos(
+        "lpf", sweep_chunk_freqs(num_samples, lpf_start, lpf_end, duration, curve, chunk_size, sr),
+        order=order, sr=sr
+    )
+    # Filter twice, as sosfiltfilt's forward and backward passes do: |H|^2
+    sos_a = np.concatenate([sos_a, sos_a], axis=1)
+    sos_b = np.concatenate([sos_b, sos_b], axis=1)
+
+    output = np.empty(num_samples, dtype=np.float32)
+    if NUMBA_AVAILABLE:
+        _sweep_crossfade_kernel(audio_a, audio_b, sos_a, sos_b, chunk_size, output)
+        return output
+
+    angle = np.linspace(0, np.pi / 2, num_samples)
+    np.multiply(_apply_sos_schedule(audio_a, sos_a, chunk_size), np.cos(angle), out=output)
+    output += _apply_sos_schedule(audio_b, sos_b, chunk_size) * np.sin(angle)
+    return output
+
+
 def create_combined_filter_sweep(
     audio_a: np.ndarray,
     audio_b: np.ndarray,
@@ -9,6 +9,7 @@ Essential for:
 """
 
 import numpy as np
+from scipy.signal import oaconvolve
 from typing import Optional, Tuple
 
 
@@ -151,29 +152,15 @@ def apply_reverb(
 
 def _fft_convolve(signal: np.ndarray, kernel: np.ndarray) -> np.ndarray:
     """
-    Perform FFT-based convolution.
+    Perform FFT-based (overlap-add) convolution.
 
-    More efficient than direct convolution for longer kernels.
+    scipy picks fast FFT sizes and stays in float32 for float32 inputs,
+    which runs about twice as fast as a float64 power-of-two rfft on a
+    multi-second tail and IR.
     """
-    # Calculate output length
-    output_length = len(signal) + len(kernel) - 1
-
-    # Find efficient FFT size (power of 2)
-    fft_size = 1
-    while fft_size < output_length:
-        fft_size *= 2
-
-    # FFT of both signals
-    signal_fft = np.fft.rfft(signal, fft_size)
-    kernel_fft = np.fft.rfft(kernel, fft_size)
-
-    # Multiply in frequency domain
-    result_fft = signal_fft * kernel_fft
-
-    # Inverse FFT
-    result = np.fft.irfft(result_fft, fft_size)
-
-    return result[:output_length].astype(np.float32)
+    signal = np.asarray(signal, dtype=np.float32)
+    kernel = np.asarray(kernel, dtype=np.float32)
+    return oaconvolve(signal, kernel, mode='full').astype(np.float32, copy=False)
 
 
 def apply_convolution_reverb(
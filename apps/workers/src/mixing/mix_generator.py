@@ -9,9 +9,14 @@ The mix is structured as:
 Track A solo → Transition A→B → Track B solo → Transition B→C → ...
 """
 
-from dataclasses import dataclass
-from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Iterator, List, Dict, Any, Optional, Tuple
 from pathlib import Path
+import multiprocessing
+import os
 import numpy as np
 import soundfile as sf
 import structlog
@@ -23,9 +28,27 @@ from src.mixing.beatmatch import time_stretch, calculate_stretch_ratio, MAX_STRE
 
 logger = structlog.get_logger()
 
+# Try to import numba for the compiled mixing kernels
+try:
+    from numba import config as numba_config, njit, prange, set_num_threads
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    logger.warning("numba not available - using NumPy mixing kernels")
+
+# Try to import CuPy to mix long transitions on the GPU
+try:
+    import cupy as cp
+    CUPY_AVAILABLE = True
+except Exception:
+    CUPY_AVAILABLE = False
+    logger.info("CuPy not available - mixing on CPU")
+
 # Constants
 SAMPLE_RATE = 44100
 BEATS_PER_BAR = 4
+STEM_ORDER = ('drums', 'bass', 'vocals', 'other')
+GPU_MIX_MIN_SAMPLES = SAMPLE_RATE * 30  # Shorter mixes don't amortize the host/device copies
 
 
 @dataclass
@@ -39,6 +62,11 @@ class TrackData:
     beats: List[float]  # Beat positions in seconds
     intro_end_ms: float
     outro_start_ms: float
+    beats_np: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self):
+        # Array view of the beat grid for vectorized lookups
+        self.beats_np = np.asarray(self.beats, dtype=np.float64)
 
 
 @dataclass
@@ -51,6 +79,8 @@ class SegmentInfo:
     start_ms: int
     end_ms: int
     duration_ms: int
+    track_a_idx: Optional[int] = None  # TRANSITION only: index of the outgoing track
+    track_b_idx: Optional[int] = None  # TRANSITION only: index of the incoming track
 
 
 @dataclass
@@ -80,8 +110,9 @@ def calculate_transition_duration_bars(energy_a: float, energy_b: float) -> int:
         return 32  # Low energy: gradual 32-bar transition
 
 
+@lru_cache(maxsize=256)
 def bars_to_ms(bars: int, bpm: float) -> int:
-    """Convert bars to milliseconds."""
+    """Convert bars to milliseconds (memoized: mixes repeat the same bar/BPM pairs)."""
     # bars * beats_per_bar * (60000 ms/min) / bpm
     return int(bars * BEATS_PER_BAR * 60000 / bpm)
 
@@ -91,6 +122,12 @@ def ms_to_samples(ms: int, sample_rate: int = SAMPLE_RATE) -> int:
     return int(ms * sample_rate / 1000)
 
 
+@lru_cache(maxsize=256)
+def bars_to_samples(bars: int, bpm: float, sample_rate: int = SAMPLE_RATE) -> int:
+    """Convert bars to samples directly, without rounding through milliseconds."""
+    return int(round(bars * BEATS_PER_BAR * 60 * sample_rate / bpm))
+
+
 def get_default_intro_end_ms(bpm: float, duration_ms: float) -> float:
     """Calculate default intro end (16 bars from start)."""
     intro_bars = 16
@@ -105,6 +142,29 @@ def get_default_outro_start_ms(bpm: float, duration_ms: float) -> float:
     return max(duration_ms - outro_ms, duration_ms * 0.75)  # Min 75% into track
 
 
+def _resolve_cue_points(tracks: List[TrackData]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Intro end and outro start (ms) of every track, with analysis gaps filled in.
+
+    Missing or out-of-range values get the same 16-bar defaults as
+    get_default_intro_end_ms / get_default_outro_start_ms, computed for all
+    tracks in one pass.
+    """
+    bpms = np.array([t.bpm for t in tracks], dtype=np.float64)
+    durations = np.array([t.duration_ms for t in tracks], dtype=np.float64)
+    intro = np.array([t.intro_end_ms or 0 for t in tracks], dtype=np.float64)
+    outro = np.array([t.outro_start_ms or 0 for t in tracks], dtype=np.float64)
+
+    # bars_to_ms truncates to whole milliseconds
+    sixteen_bars_ms = np.floor(16 * BEATS_PER_BAR * 60000 / bpms)
+    default_intro = np.minimum(sixteen_bars_ms, durations * 0.25)
+    default_outro = np.maximum(durations - sixteen_bars_ms, durations * 0.75)
+
+    intro = np.where(intro <= 0, default_intro, intro)
+    outro = np.where((outro <= 0) | (outro >= durations), default_outro, outro)
+    return intro, outro
+
+
 def calculate_segments(tracks: List[TrackData]) -> List[SegmentInfo]:
     """
     Calculate all segments for the mix.
@@ -134,30 +194,20 @@ def calculate_segments(tracks: List[TrackData]) -> List[SegmentInfo]:
     segments: List[SegmentInfo] = []
     position = 0
 
-    for i, track in enumerate(tracks):
-        is_first = i == 0
-        is_last = i == len(tracks) - 1
-
-        # Calculate intro_end and outro_start with fallbacks
-        intro_end_ms = track.intro_end_ms
-        if intro_end_ms is None or intro_end_ms <= 0:
-            intro_end_ms = get_default_intro_end_ms(track.bpm, track.duration_ms)
-
-        outro_start_ms = track.outro_start_ms
-        if outro_start_ms is None or outro_start_ms <= 0 or outro_start_ms >= track.duration_ms:
-            outro_start_ms = get_default_outro_start_ms(track.bpm, track.duration_ms)
+    # Intro end / outro start with fallbacks, resolved for all tracks at once
+    intro_end_ms, outro_start_ms = _resolve_cue_points(tracks)
 
-        # Solo segment start
-        if is_first:
-            solo_start_ms = 0  # First track: start from beginning
-        else:
-            solo_start_ms = int(intro_end_ms)  # Other tracks: after intro
+    # Solo segments: the first track starts from the beginning, the others after
+    # their intro; the last track plays to the end, the others until their outro
+    solo_starts = intro_end_ms.astype(np.int64)
+    solo_starts[0] = 0
+    solo_ends = outro_start_ms.astype(np.int64)
+    solo_ends[-1] = int(tracks[-1].duration_ms)
 
-        # Solo segment end
-        if is_last:
-            solo_end_ms = int(track.duration_ms)  # Last track: play to end
-        else:
-            solo_end_ms = int(outro_start_ms)  # Other tracks: until outro
+    for i, track in enumerate(tracks):
+        is_last = i == len(tracks) - 1
+        solo_start_ms = int(solo_starts[i])
+        solo_end_ms = int(solo_ends[i])
 
         # Add solo segment
         if solo_end_ms > solo_start_ms:
@@ -191,27 +241,28 @@ def calculate_segments(tracks: List[TrackData]) -> List[SegmentInfo]:
                 transition_id=f"{track.id}_{next_track.id}",  # Composite ID
                 start_ms=0,  # Transition audio starts at 0
                 end_ms=transition_duration_ms,
-                duration_ms=transition_duration_ms
+                duration_ms=transition_duration_ms,
+                track_a_idx=i,
+                track_b_idx=i + 1
             ))
             position += 1
 
     return segments
 
 
-def find_nearest_downbeat(beats: List[float], target_time: float) -> float:
-    """Find the nearest downbeat (beat_index % 4 == 0) to target time."""
-    if not beats:
-        return target_time
-
-    # Find downbeats (every 4th beat)
-    downbeats = [beats[i] for i in range(0, len(beats), 4)]
+def find_nearest_downbeat(beats, target_time: float) -> float:
+    """
+    Find the nearest downbeat (beat_index % 4 == 0) to target time.
 
-    if not downbeats:
+    Accepts a list of beat times or an array such as TrackData.beats_np.
+    """
+    beats = np.asarray(beats, dtype=np.float64)
+    if beats.size == 0:
         return target_time
 
-    # Find nearest
-    nearest = min(downbeats, key=lambda b: abs(b - target_time))
-    return nearest
+    # Downbeats are every 4th beat
+    downbeats = beats[::4]
+    return float(downbeats[np.abs(downbeats - target_time).argmin()])
 
 
 def generate_transition_audio(
@@ -228,7 +279,8 @@ def generate_transition_audio(
     from src.mixing.draft_transition_generator import (
         generate_draft_transition,
         DraftTransitionParams,
-        DraftTransitionResult
+        DraftTransitionResult,
+        SAMPLE_RATE as DRAFT_SAMPLE_RATE,
     )
 
     logger.info(
@@ -262,18 +314,18 @@ def generate_transition_audio(
         progress_callback=progress_callback
     )
     
-    # Step 3: Load the generated audio to return it as numpy array
+    # Step 3: Return the rendered audio as (samples, channels)
     try:
-        # Load at 44100Hz
-        audio, sr = sf.read(output_path)
-        
-        # Ensure 2D array (samples, channels)
-        if len(audio.shape) == 1:
-            audio = np.stack([audio, audio], axis=1)
-        elif audio.shape[0] == 2 and audio.shape[1] > 2:
-            # Transpose if channels are first dimension
-            audio = audio.T
-            
+        if result.audio is not None:
+            # Rendered in memory as stereo [2, samples]: no need to decode the file again
+            audio = result.audio.T
+            sr = DRAFT_SAMPLE_RATE
+        else:
+            audio, sr = sf.read(output_path, dtype='float32', always_2d=True)
+            if audio.shape[1] == 1:
+                # Mono is shared by both channels as a read-only view, not a copy
+                audio = np.broadcast_to(audio, (audio.shape[0], 2))
+
         return TransitionResult(
             audio=audio,
             sample_rate=sr,
@@ -281,16 +333,165 @@ def generate_transition_audio(
             track_a_cut_ms=result.track_a_play_until_ms,
             track_b_start_ms=result.track_b_start_from_ms
         )
-        
+
     except Exception as e:
         logger.error("Failed to load generated transition", error=str(e))
         raise
 
 
+@lru_cache(maxsize=8)
+def _silent_stem(n: int) -> np.ndarray:
+    """Shared read-only (n, 1) zeros the kernel reads in place of a missing stem."""
+    silence = np.zeros((n, 1), dtype=np.float32)
+    silence.setflags(write=False)
+    return silence
+
+
+@lru_cache(maxsize=32)
+def _fade_curves(n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Linear fade-in and fade-out curves of n samples, shaped (n, 1)."""
+    fade_in = np.linspace(0, 1, n, dtype=np.float32)[:, None]
+    fade_out = np.linspace(1, 0, n, dtype=np.float32)[:, None]
+    fade_in.setflags(write=False)
+    fade_out.setflags(write=False)
+    return fade_in, fade_out
+
+
+# (start, end) gain of each stem across each phase; every curve in the 4-phase
+# schedule is a linear ramp (or constant) over its phase.
+# Rows: A drums/bass/vocals/other, then B; columns: phases 1-4.
+GAIN_RAMPS = np.array([
+    # Track A: full, bass 100→20%, vocals out + drums/other 50% bass 20%, fade out
+    [[1.0, 1.0], [1.0, 1.0], [0.5, 0.5], [0.5, 0.0]],  # drums
+    [[1.0, 1.0], [1.0, 0.2], [0.2, 0.2], [0.2, 0.0]],  # bass
+    [[1.0, 1.0], [1.0, 1.0], [1.0, 0.0], [0.0, 0.0]],  # vocals
+    [[1.0, 1.0], [1.0, 1.0], [0.5, 0.5], [0.5, 0.0]],  # other
+    # Track B: drums 0→70→100%, bass in at phase 2, vocals in at phase 3, other 0→30→100%
+    [[0.0, 0.7], [0.7, 1.0], [1.0, 1.0], [1.0, 1.0]],  # drums
+    [[0.0, 0.0], [0.0, 1.0], [1.0, 1.0], [1.0, 1.0]],  # bass
+    [[0.0, 0.0], [0.0, 0.0], [0.0, 1.0], [1.0, 1.0]],  # vocals
+    [[0.0, 0.3], [0.3, 0.3], [0.3, 1.0], [1.0, 1.0]],  # other
+], dtype=np.float32)
+GAIN_RAMPS.setflags(write=False)
+
+
+def _mix_phases_numpy(
+    stems: List[Optional[np.ndarray]],
+    ramps: np.ndarray,
+    phase_samples: int,
+    out: np.ndarray,
+    xp=np
+) -> None:
+    """
+    NumPy fallback: gain each (stem, phase) block by its ramp and sum into out.
+
+    Stems are read in place one phase slice at a time through two scratch
+    buffers, so there is no stacked copy of the stems and no temporary larger
+    than one phase. Constant gains skip the ramp; silent blocks are skipped.
+    Pass xp=cupy with device arrays to run the same schedule on the GPU.
+    """
+    fade_in = xp.asarray(_fade_curves(phase_samples)[0])
+    ramp = xp.empty((phase_samples, 1), dtype=np.float32)
+    tmp = xp.empty((phase_samples, 2), dtype=np.float32)
+
+    out.fill(0.0)
+    for k, stem in enumerate(stems):
+        if stem is None:
+            continue
+        for phase in range(ramps.shape[1]):
+            block = slice(phase * phase_samples, (phase + 1) * phase_samples)
+            start, end = ramps[k, phase]
+            if start == end:
+                if start == 0.0:
+                    continue
+                # Mono (n, 1) stems broadcast across both channels of tmp
+                xp.multiply(stem[block], start, out=tmp)
+            else:
+                xp.multiply(fade_in, end - start, out=ramp)
+                ramp += start
+                xp.multiply(stem[block], ramp, out=tmp)
+            xp.add(out[block], tmp, out=out[block])
+
+
+def _mix_phases_cupy(
+    stems: List[Optional[np.ndarray]],
+    ramps: np.ndarray,
+    phase_samples: int
+) -> np.ndarray:
+    """Upload the stems once, run the 4-phase schedule on the GPU, download the mix."""
+    stems_gpu = [None if stem is None else cp.asarray(stem) for stem in stems]
+    out = cp.empty((4 * phase_samples, 2), dtype=np.float32)
+    _mix_phases_numpy(stems_gpu, ramps, phase_samples, out, xp=cp)
+    return cp.asnumpy(out)
+
+
+@lru_cache(maxsize=1)
+def _cupy_ready() -> bool:
+    """
+    Whether a CUDA device is visible to CuPy.
+
+    Checked on first use rather than at import: querying the runtime sets up
+    CUDA, after which the CUDA_VISIBLE_DEVICES pinning done by
+    _init_transition_worker would be ignored.
+    """
+    try:
+        return cp.cuda.runtime.getDeviceCount() > 0
+    except Exception as e:
+        logger.info("No CUDA device available - mixing on CPU", error=str(e))
+        return False
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True, fastmath=True, boundscheck=False)
+    def _mix_stems_4_phase_kernel(da, ba, va, oa, db, bb, vb, ob, ramps, phase_samples, out):
+        """
+        Whole 4-phase mix in one pass over the stems.
+
+        Each output sample derives its phase and ramp position from its index
+        and sums the eight gained stems in registers. Stems are (samples, 1) or
+        (samples, 2); mono stems feed both output channels.
+        """
+        denom = max(phase_samples - 1, 1)
+        for i in prange(4 * phase_samples):
+            phase = i // phase_samples
+            t = (i % phase_samples) / denom
+            g0 = ramps[0, phase, 0] + (ramps[0, phase, 1] - ramps[0, phase, 0]) * t
+            g1 = ramps[1, phase, 0] + (ramps[1, phase, 1] - ramps[1, phase, 0]) * t
+            g2 = ramps[2, phase, 0] + (ramps[2, phase, 1] - ramps[2, phase, 0]) * t
+            g3 = ramps[3, phase, 0] + (ramps[3, phase, 1] - ramps[3, phase, 0]) * t
+            g4 = ramps[4, phase, 0] + (ramps[4, phase, 1] - ramps[4, phase, 0]) * t
+            g5 = ramps[5, phase, 0] + (ramps[5, phase, 1] - ramps[5, phase, 0]) * t
+            g6 = ramps[6, phase, 0] + (ramps[6, phase, 1] - ramps[6, phase, 0]) * t
+            g7 = ramps[7, phase, 0] + (ramps[7, phase, 1] - ramps[7, phase, 0]) * t
+            for ch in range(2):
+                out[i, ch] = (
+                    da[i, min(ch, da.shape[1] - 1)] * g0
+                    + ba[i, min(ch, ba.shape[1] - 1)] * g1
+                    + va[i, min(ch, va.shape[1] - 1)] * g2
+                    + oa[i, min(ch, oa.shape[1] - 1)] * g3
+                    + db[i, min(ch, db.shape[1] - 1)] * g4
+                    + bb[i, min(ch, bb.shape[1] - 1)] * g5
+                    + vb[i, min(ch, vb.shape[1] - 1)] * g6
+                    + ob[i, min(ch, ob.shape[1] - 1)] * g7
+                )
+
+
+def _abs_max(audio: np.ndarray) -> float:
+    """Peak absolute sample value of audio (any shape)."""
+    if audio.size == 0:
+        return 0.0
+    # NumPy's SIMD max/min reductions beat a scalar abs-max loop and avoid
+    # allocating np.abs(audio)
+    return float(max(audio.max(), -audio.min()))
+
+
 def _align_stems_length(stems: Dict[str, np.ndarray], target_samples: int) -> Dict[str, np.ndarray]:
     """Align all stems to target length (pad or trim)."""
     aligned = {}
     for stem_name, stem_audio in stems.items():
+        # Demucs stems are float32 already; keep the mix in float32 throughout
+        stem_audio = np.asarray(stem_audio).astype(np.float32, copy=False)
+
         if len(stem_audio.shape) == 1:
             # Mono: reshape to (samples, 1)
             stem_audio = stem_audio.reshape(-1, 1)
@@ -298,12 +499,13 @@ def _align_stems_length(stems: Dict[str, np.ndarray], target_samples: int) -> Di
         current_samples = stem_audio.shape[0]
 
         if current_samples < target_samples:
-            # Pad with zeros
-            padding = np.zeros((target_samples - current_samples, stem_audio.shape[1]))
-            aligned[stem_name] = np.vstack([stem_audio, padding])
+            # Pad with zeros: one allocation, one copy
+            padded = np.zeros((target_samples, stem_audio.shape[1]), dtype=np.float32)
+            padded[:current_samples] = stem_audio
+            aligned[stem_name] = padded
         else:
             # Trim
-            aligned[stem_name] = stem_audio[:target_samples]
+            aligned[stem_name] = np.ascontiguousarray(stem_audio[:target_samples])
 
     return aligned
 
@@ -322,94 +524,67 @@ def mix_stems_4_phase(
     Phase 2 (bars 5-8): A bass fade 100→20%, B drums 70→100%, B bass fade 0→100%
     Phase 3 (bars 9-12): A vocals fade 100→0%, B vocals fade 0→100%, B other 50→100%
     Phase 4 (bars 13-16): A all fade out, B all 100%
+
+    The schedule is a table of linear gain ramps per (stem, phase) (GAIN_RAMPS).
+    Long transitions are mixed on the GPU when CuPy is available. Otherwise,
+    with numba the whole mix is one fused pass over the stems; failing that each
+    stem is mixed phase block by phase block through scratch buffers.
+
+    Returns:
+        Mixed audio as (samples, channels)
     """
-    phase_bars = transition_bars // 4
-    phase_samples = ms_to_samples(bars_to_ms(phase_bars, bpm), sample_rate)
+    # Four equal-length phases carved out of the exact transition length
+    phase_samples = bars_to_samples(transition_bars, bpm, sample_rate) // 4
     total_samples = phase_samples * 4
 
-    # Ensure we have all stem types, fill with zeros if missing
-    stem_names = ['drums', 'bass', 'vocals', 'other']
-
-    def get_stem(stems: Dict, name: str) -> np.ndarray:
-        if name in stems:
-            return stems[name]
-        # Return zeros with same shape as any existing stem
-        for s in stems.values():
-            return np.zeros_like(s)
-        return np.zeros((total_samples, 2))
-
-    # Get stems (default to stereo)
-    drums_a = get_stem(stems_a, 'drums')
-    bass_a = get_stem(stems_a, 'bass')
-    vocals_a = get_stem(stems_a, 'vocals')
-    other_a = get_stem(stems_a, 'other')
-
-    drums_b = get_stem(stems_b, 'drums')
-    bass_b = get_stem(stems_b, 'bass')
-    vocals_b = get_stem(stems_b, 'vocals')
-    other_b = get_stem(stems_b, 'other')
-
-    # Initialize output
-    output = np.zeros((total_samples, 2))
-
-    for phase in range(4):
-        start = phase * phase_samples
-        end = start + phase_samples
-
-        # Create fade curves for this phase
-        fade_in = np.linspace(0, 1, phase_samples).reshape(-1, 1)
-        fade_out = np.linspace(1, 0, phase_samples).reshape(-1, 1)
-
-        # Slice stems for this phase
-        da, ba, va, oa = drums_a[start:end], bass_a[start:end], vocals_a[start:end], other_a[start:end]
-        db, bb, vb, ob = drums_b[start:end], bass_b[start:end], vocals_b[start:end], other_b[start:end]
-
-        if phase == 0:
-            # Phase 1: A full, B drums 0→70%, B other 0→30%
-            output[start:end] += da + ba + va + oa  # A at 100%
-            output[start:end] += db * fade_in * 0.7  # B drums fade to 70%
-            output[start:end] += ob * fade_in * 0.3  # B other fade to 30%
-
-        elif phase == 1:
-            # Phase 2: A bass 100→20%, A others full, B drums 70→100%, B bass 0→100%
-            output[start:end] += da + va + oa  # A drums, vocals, other at 100%
-            output[start:end] += ba * (1 - fade_in * 0.8)  # A bass fade to 20%
-            output[start:end] += db * (0.7 + fade_in * 0.3)  # B drums 70→100%
-            output[start:end] += bb * fade_in  # B bass fade to 100%
-            output[start:end] += ob * 0.3  # B other stay at 30%
-
-        elif phase == 2:
-            # Phase 3: A vocals 100→0%, A bass 20%, B vocals 0→100%, B other 30→100%
-            output[start:end] += da * 0.5  # A drums drop to 50%
-            output[start:end] += ba * 0.2  # A bass stay at 20%
-            output[start:end] += va * fade_out  # A vocals fade out
-            output[start:end] += oa * 0.5  # A other drop to 50%
-            output[start:end] += db  # B drums at 100%
-            output[start:end] += bb  # B bass at 100%
-            output[start:end] += vb * fade_in  # B vocals fade in
-            output[start:end] += ob * (0.3 + fade_in * 0.7)  # B other 30→100%
-
-        else:  # phase == 3
-            # Phase 4: A all fade out, B at 100%
-            output[start:end] += da * fade_out * 0.5  # A drums fade from 50%
-            output[start:end] += ba * fade_out * 0.2  # A bass fade from 20%
-            output[start:end] += oa * fade_out * 0.5  # A other fade from 50%
-            output[start:end] += db + bb + vb + ob  # B all at 100%
-
-    return output.T  # Return as (channels, samples)
+    stems_a = _align_stems_length(stems_a, total_samples)
+    stems_b = _align_stems_length(stems_b, total_samples)
+
+    if CUPY_AVAILABLE and total_samples >= GPU_MIX_MIN_SAMPLES and _cupy_ready():
+        try:
+            return _mix_phases_cupy(
+                [stems.get(name) for stems in (stems_a, stems_b) for name in STEM_ORDER],
+                GAIN_RAMPS, phase_samples
+            )
+        except Exception as e:
+            logger.warning("GPU mix failed, mixing on CPU", error=str(e))
+
+    output = np.empty((total_samples, 2), dtype=np.float32)
+    if NUMBA_AVAILABLE:
+        # Feed the aligned stems straight to the kernel; no stacked copy
+        silence = _silent_stem(total_samples)
+        _mix_stems_4_phase_kernel(
+            *(stems.get(name, silence) for stems in (stems_a, stems_b) for name in STEM_ORDER),
+            GAIN_RAMPS, phase_samples, output
+        )
+    else:
+        _mix_phases_numpy(
+            [stems.get(name) for stems in (stems_a, stems_b) for name in STEM_ORDER],
+            GAIN_RAMPS, phase_samples, output
+        )
+
+    # (samples, channels), C-contiguous: ready for sf.write without a transpose copy
+    return output
 
 
 def apply_limiter(audio: np.ndarray, threshold_db: float = -1.0) -> np.ndarray:
-    """Apply brick-wall limiter to prevent clipping."""
+    """
+    Apply brick-wall limiter to prevent clipping.
+
+    Float input is scaled in place and returned.
+    """
     threshold = 10 ** (threshold_db / 20)
 
     # Find peaks
-    peak = np.max(np.abs(audio))
+    peak = _abs_max(audio)
 
     if peak > threshold:
         # Apply gain reduction
         gain = threshold / peak
-        audio = audio * gain
+        if np.issubdtype(audio.dtype, np.floating):
+            audio *= gain
+        else:
+            audio = audio * gain
         logger.debug("Limiter applied", peak=peak, gain=gain)
 
     return audio
@@ -418,6 +593,150 @@ def apply_limiter(audio: np.ndarray, threshold_db: float = -1.0) -> np.ndarray:
 
 
 
+def _available_cpus() -> int:
+    """CPUs this process may run on (respects container/affinity limits)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+_THREAD_ENV_VARS = ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS')
+
+
+@contextmanager
+def _worker_thread_env(threads: int) -> Iterator[None]:
+    """
+    Export the per-worker thread limits while the pool spawns its workers.
+
+    BLAS (loaded with numpy) and torch read these once, on import, and a
+    spawned child has imported numpy before its initializer runs, so they
+    must already be in the environment it inherits. The parent's own values
+    are restored afterwards.
+    """
+    saved = {var: os.environ.get(var) for var in _THREAD_ENV_VARS}
+    os.environ.update({var: str(threads) for var in _THREAD_ENV_VARS})
+    try:
+        yield
+    finally:
+        for var, value in saved.items():
+            if value is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = value
+
+
+def _available_memory_mb() -> Optional[int]:
+    """Free physical memory in MB, or None where sysconf can't report it."""
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def _transition_worker_count(total: int, devices: List[str]) -> int:
+    """
+    Number of transition processes for a job of `total` transitions.
+
+    Each worker loads its own Demucs model (and compiles it on CUDA), so the
+    automatic setting uses one worker per configured GPU, or, on CPU, one per
+    core as long as every worker fits in transition_worker_memory_mb of free RAM.
+    """
+    if settings.transition_workers > 0:
+        workers = settings.transition_workers
+    elif devices:
+        workers = len(devices)
+    else:
+        workers = _available_cpus()
+        free_mb = _available_memory_mb()
+        if free_mb is not None:
+            workers = min(workers, free_mb // max(1, settings.transition_worker_memory_mb))
+    return max(1, min(total, workers))
+
+
+def _init_transition_worker(counter, devices: List[str], threads: int) -> None:
+    """
+    Set up one pool worker: split the CPUs between workers and, when GPU ids
+    are configured, pin it to one of them round-robin.
+    """
+    # BLAS and torch threads are capped by _worker_thread_env; numba's pool
+    # size is set at runtime, so it is limited here
+    if NUMBA_AVAILABLE:
+        set_num_threads(min(threads, numba_config.NUMBA_NUM_THREADS))
+
+    if devices:
+        with counter.get_lock():
+            index = counter.value
+            counter.value += 1
+        os.environ['CUDA_VISIBLE_DEVICES'] = devices[index % len(devices)]
+
+
+def _build_transition(task: Tuple[TrackData, TrackData, str, str]) -> TransitionResult:
+    """Generate one transition in a worker process."""
+    track_a, track_b, output_file, project_id = task
+    logger.info("Building transition", project_id=project_id, track_a=track_a.id, track_b=track_b.id)
+    return generate_transition_audio(track_a, track_b, output_file)
+
+
+def _run_transitions(
+    tasks: List[Tuple[TrackData, TrackData, str, str]],
+    progress_callback: Optional[callable] = None
+) -> List[Any]:
+    """
+    Generate all transitions, in parallel when more than one worker is allowed.
+
+    Returns one entry per task: the TransitionResult, or the exception it raised.
+    """
+    total = len(tasks)
+    outcomes: List[Any] = [None] * total
+    devices = [d.strip() for d in settings.transition_gpu_devices.split(',') if d.strip()]
+    max_workers = _transition_worker_count(total, devices)
+
+    if max_workers <= 1:
+        for n, task in enumerate(tasks):
+            def trans_progress(msg, pct, n=n):
+                if progress_callback:
+                    # Transitions use 0-70% of progress
+                    overall_pct = int((n / total + pct / 100 / total) * 70)
+                    progress_callback(f"Transition {n + 1}/{total}: {msg}", overall_pct)
+
+            try:
+                outcomes[n] = generate_transition_audio(task[0], task[1], task[2], trans_progress)
+            except Exception as e:
+                outcomes[n] = e
+        return outcomes
+
+    # Spawn rather than fork: the worker runs this from a thread next to the asyncio
+    # loop and Redis connections, which must not be duplicated into children
+    mp_context = multiprocessing.get_context('spawn')
+    threads = max(1, _available_cpus() // max_workers)
+
+    logger.info(
+        "Generating transitions in parallel",
+        transitions=total, workers=max_workers, threads_per_worker=threads,
+    )
+
+    # Workers are spawned on submit, so the thread limits stay exported
+    # for the life of the pool
+    with _worker_thread_env(threads), ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=mp_context,
+        initializer=_init_transition_worker,
+        initargs=(mp_context.Value('i', 0), devices, threads),
+    ) as pool:
+        futures = {pool.submit(_build_transition, task): n for n, task in enumerate(tasks)}
+        for completed, future in enumerate(as_completed(futures), start=1):
+            n = futures[future]
+            try:
+                outcomes[n] = future.result()
+            except Exception as e:
+                outcomes[n] = e
+            if progress_callback:
+                progress_callback(f"Transition {completed}/{total} done", int(completed / total * 70))
+
+    return outcomes
+
+
 def generate_mix_for_project(
     project_id: str,
     tracks_data: List[Dict[str, Any]],
@@ -471,9 +790,23 @@ def generate_mix_for_project(
         'totalDurationMs': 0
     }
 
-    transition_segments = [s for s in segments if s.type == 'TRANSITION']
-    total_transitions = len(transition_segments)
-
+    # Resolve the track pair for every transition up front so they can run in parallel.
+    # calculate_segments records both track indices on each transition segment.
+    tasks = []
+    task_index = {}
+    for segment in segments:
+        if segment.type != 'TRANSITION':
+            continue
+        track_a = tracks[segment.track_a_idx]
+        track_b = tracks[segment.track_b_idx]
+        output_file = output_dir / f"transition_{track_a.id}_{track_b.id}.wav"
+        task_index[segment.position] = len(tasks)
+        tasks.append((track_a, track_b, str(output_file), project_id))
+
+    outcomes = _run_transitions(tasks, progress_callback)
+
+    # Solo boundary adjustments, logged once after the loop
+    adjustments = []
     for i, segment in enumerate(segments):
         segment_data = {
             'position': segment.position,
@@ -486,79 +819,44 @@ def generate_mix_for_project(
             'audioFilePath': None
         }
 
-        if segment.type == 'TRANSITION':
-            # Find the two tracks for this transition
-            trans_idx = [s for s in segments[:segment.position] if s.type == 'SOLO']
-            if len(trans_idx) >= 1:
-                track_a_idx = len(trans_idx) - 1
-                track_b_idx = track_a_idx + 1
-
-                if track_b_idx < len(tracks):
-                    track_a = tracks[track_a_idx]
-                    track_b = tracks[track_b_idx]
-
-                    # Generate transition audio
-                    output_file = output_dir / f"transition_{track_a.id}_{track_b.id}.wav"
-
-                    current_transition = transition_segments.index(segment) + 1
-
-                    def trans_progress(msg, pct):
-                        if progress_callback:
-                            # Transitions use 0-70% of progress
-                            overall_pct = int(((current_transition - 1) / total_transitions + pct / 100 / total_transitions) * 70)
-                            progress_callback(f"Transition {current_transition}/{total_transitions}: {msg}", overall_pct)
-
-                    try:
-                        result = generate_transition_audio(
-                            track_a, track_b,
-                            str(output_file),
-                            trans_progress
-                        )
-
-                        relative_path = f"mix_segments/{project_id}/{output_file.name}"
-                        segment_data['audioFilePath'] = relative_path
-                        segment_data['durationMs'] = result.duration_ms
-                        results['transition_files'][segment.transition_id] = relative_path
-                        
-                        # CRITICAL FIX: Update adjacent Solo segments to prevent duplicate audio
-                        # 1. Update previous segment (Solo A) end point
-                        if results['segments']:
-                            prev_segment = results['segments'][-1]
-                            if prev_segment['type'] == 'SOLO' and prev_segment['trackId'] == track_a.id:
-                                # Cut A where the transition actually started using A
-                                # Note: track_a_cut_ms from draft engine is where A *stops* playing in the transition context
-                                # But we want where Solo A stops. 
-                                # If transition uses A from X to Y, Solo A should stop at X.
-                                # Wait, track_a_cut_ms usually means "Play A until X".
-                                # Draft result: track_a_play_until_ms = where the *transition file* handles A.
-                                # Actually, track_a_play_until_ms = Outro Start usually? 
-                                # No, the transition file contains A from [OutroStart] to [OutroEnd].
-                                # So Solo A must end at [OutroStart].
-                                # Let's check what track_a_cut_ms represents in draft engine.
-                                # In draft_transition_generator: track_a_cut_ms = int(a_cue_time * 1000) + duration_ms ? 
-                                # No, track_a_cut_ms = track_a_play_until_ms = where we STOP playing the solo track.
-                                # The transition starts exactly there.
-                                
-                                # Use the value returned by the engine as the cut point.
-                                prev_segment['endMs'] = result.track_a_cut_ms
-                                prev_segment['durationMs'] = max(0, prev_segment['endMs'] - prev_segment['startMs'])
-                                logger.info("Adjusted Solo A end", track=track_a.id, end_ms=result.track_a_cut_ms)
-                        
-                        # 2. Update next segment (Solo B) start point
-                        if i + 1 < len(segments):
-                            next_segment = segments[i+1]
-                            if next_segment.type == 'SOLO' and next_segment.track_id == track_b.id:
-                                # Start B where the transition actually ends/releases B
-                                next_segment.start_ms = result.track_b_start_ms
-                                next_segment.duration_ms = max(0, next_segment.end_ms - next_segment.start_ms)
-                                logger.info("Adjusted Solo B start", track=track_b.id, start_ms=result.track_b_start_ms)
-
-                    except Exception as e:
-                        logger.error("Transition generation failed", error=str(e), track_a=track_a.id, track_b=track_b.id)
-                        segment_data['audioError'] = str(e)
+        if segment.position in task_index:
+            n = task_index[segment.position]
+            track_a, track_b, output_file, _ = tasks[n]
+            result = outcomes[n]
+
+            if isinstance(result, Exception):
+                logger.error("Transition generation failed", error=str(result), track_a=track_a.id, track_b=track_b.id)
+                segment_data['audioError'] = str(result)
+            else:
+                relative_path = f"mix_segments/{project_id}/{Path(output_file).name}"
+                segment_data['audioFilePath'] = relative_path
+                segment_data['durationMs'] = result.duration_ms
+                results['transition_files'][segment.transition_id] = relative_path
+
+                # CRITICAL FIX: Update adjacent Solo segments to prevent duplicate audio
+                # 1. Update previous segment (Solo A) end point
+                if results['segments']:
+                    prev_segment = results['segments'][-1]
+                    if prev_segment['type'] == 'SOLO' and prev_segment['trackId'] == track_a.id:
+                        # track_a_cut_ms = track_a_play_until_ms = where we STOP playing the solo track.
+                        # The transition starts exactly there.
+                        prev_segment['endMs'] = result.track_a_cut_ms
+                        prev_segment['durationMs'] = max(0, prev_segment['endMs'] - prev_segment['startMs'])
+                        adjustments.append({'track': track_a.id, 'end_ms': result.track_a_cut_ms})
+
+                # 2. Update next segment (Solo B) start point
+                if i + 1 < len(segments):
+                    next_segment = segments[i+1]
+                    if next_segment.type == 'SOLO' and next_segment.track_id == track_b.id:
+                        # Start B where the transition actually ends/releases B
+                        next_segment.start_ms = result.track_b_start_ms
+                        next_segment.duration_ms = max(0, next_segment.end_ms - next_segment.start_ms)
+                        adjustments.append({'track': track_b.id, 'start_ms': result.track_b_start_ms})
 
         results['segments'].append(segment_data)
 
+    logger.info("Adjusted solo segments", project_id=project_id, adjustments=adjustments)
+
     # Skip concatenation as requested by user
     # The frontend will play segments individually using the adjusted start/end times
     logger.info("Mix generation complete (segments only)", project_id=project_id, segments=len(results['segments']))
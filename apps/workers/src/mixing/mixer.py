@@ -69,8 +69,9 @@ def generate_mix(
     #     else:
     #         mixed_segments.append(audio)
 
-    # 4. Concatenate all segments
-    # final_audio = concatenate_audio(mixed_segments)
+    # 4. Concatenate all segments (stream the rendered segment files to disk
+    #    with concatenate_audio_files rather than holding the whole mix in RAM)
+    # total_frames = concatenate_audio_files(segment_paths, output_path, sample_rate)
 
     # 5. Apply final mastering (normalize, limit)
     # final_audio = master_audio(final_audio)
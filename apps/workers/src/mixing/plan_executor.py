@@ -10,9 +10,12 @@ The plan format (v2.0) includes:
 - transition: type, duration_bars, stems configuration, effects, volume automation
 """
 
+from functools import lru_cache
+from types import MappingProxyType
+
 import numpy as np
 import soundfile as sf
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Hashable, List, Mapping, Optional, Tuple
 import structlog
 
 from .transitions.bass_swap import apply_bass_swap_to_stems
@@ -20,10 +23,87 @@ from .transitions.blend import create_stem_blend, create_blend_transition
 from .transitions.cut import create_cut_transition, create_cut_with_effect
 from .transitions.filter_transition import create_filter_transition
 from .transitions.echo_out import create_echo_out_transition
-from .stems import StemSeparator
+from .stems import get_separator, passthrough_stems, separate_stems_batch
+from .beatmatch import source_window_key, stretch_to_bpm
+from ..utils.audio import resample_audio
 
 logger = structlog.get_logger()
 
+# Try to import numba for the compiled phase-mixing kernel
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    logger.warning("numba not available - using NumPy phase mixing")
+
+# Stem order of the phase level table
+PHASE_STEMS = ("drums", "bass", "other", "vocals")
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True, fastmath=True, boundscheck=False)
+    def _mix_phase_levels_kernel(a0, a1, a2, a3, b0, b1, b2, b3, a_offset, starts, ends, levels, out):
+        """
+        Phase mix in one fused pass per phase.
+
+        Each output sample sums the eight gained stems in registers; A's stems
+        are read from ``a_offset``. Every source must cover the whole mix.
+        """
+        for p in range(starts.shape[0]):
+            start = starts[p]
+            n = ends[p] - start
+            g0, g1, g2, g3 = levels[p, 0], levels[p, 1], levels[p, 2], levels[p, 3]
+            g4, g5, g6, g7 = levels[p, 4], levels[p, 5], levels[p, 6], levels[p, 7]
+            # Phase-local views keep the inner loop free of offsets so it vectorizes
+            da = a0[a_offset + start:a_offset + start + n]
+            ba = a1[a_offset + start:a_offset + start + n]
+            oa = a2[a_offset + start:a_offset + start + n]
+            va = a3[a_offset + start:a_offset + start + n]
+            db = b0[start:start + n]
+            bb = b1[start:start + n]
+            ob = b2[start:start + n]
+            vb = b3[start:start + n]
+            target = out[start:start + n]
+            for i in prange(n):
+                target[i] += (
+                    da[i] * g0 + ba[i] * g1 + oa[i] * g2 + va[i] * g3
+                    + db[i] * g4 + bb[i] * g5 + ob[i] * g6 + vb[i] * g7
+                )
+
+
+def _frozen_phase(bars: Tuple[int, int], a: Dict[str, float], b: Dict[str, float]) -> Mapping[str, Any]:
+    """Read-only phase entry, safe to share between callers."""
+    return MappingProxyType({"bars": bars, "a": MappingProxyType(a), "b": MappingProxyType(b)})
+
+
+@lru_cache(maxsize=32)
+def _default_phases(duration_bars: int) -> Tuple[Mapping[str, Any], ...]:
+    """Default 4-phase configuration for a transition length, built once per length (read-only)."""
+    phase_len = duration_bars // 4
+    return (
+        _frozen_phase(
+            (1, phase_len),
+            {"drums": 1.0, "bass": 1.0, "other": 1.0, "vocals": 1.0},
+            {"drums": 0.3, "bass": 0.0, "other": 0.0, "vocals": 0.0},
+        ),
+        _frozen_phase(
+            (phase_len + 1, phase_len * 2),
+            {"drums": 1.0, "bass": 1.0, "other": 0.7, "vocals": 0.7},
+            {"drums": 0.5, "bass": 0.0, "other": 0.3, "vocals": 0.0},
+        ),
+        _frozen_phase(
+            (phase_len * 2 + 1, phase_len * 3),
+            {"drums": 0.6, "bass": 0.0, "other": 0.4, "vocals": 0.3},
+            {"drums": 0.7, "bass": 1.0, "other": 0.6, "vocals": 0.3},
+        ),
+        _frozen_phase(
+            (phase_len * 3 + 1, duration_bars),
+            {"drums": 0.2, "bass": 0.0, "other": 0.0, "vocals": 0.0},
+            {"drums": 1.0, "bass": 1.0, "other": 1.0, "vocals": 1.0},
+        ),
+    )
+
 
 class TransitionPlanExecutor:
     """
@@ -41,7 +121,8 @@ class TransitionPlanExecutor:
             sr: Sample rate for audio processing
         """
         self.sr = sr
-        self.stem_separator = StemSeparator()
+        # Shared process-wide so the Demucs model is loaded once, not per executor
+        self.stem_separator = get_separator()
 
     def execute(
         self,
@@ -74,17 +155,12 @@ class TransitionPlanExecutor:
         )
 
         # 1. Load audio segments according to cut points
-        audio_a = self._load_segment(
-            track_a_path,
-            start=plan.get("track_a", {}).get("play_from_seconds", 0),
-            end=plan.get("track_a", {}).get("play_until_seconds")
-        )
+        start_a = plan.get("track_a", {}).get("play_from_seconds", 0)
+        end_a = plan.get("track_a", {}).get("play_until_seconds")
+        start_b = plan.get("track_b", {}).get("start_from_seconds", 0)
 
-        audio_b = self._load_segment(
-            track_b_path,
-            start=plan.get("track_b", {}).get("start_from_seconds", 0),
-            end=None
-        )
+        audio_a = self._load_segment(track_a_path, start=start_a, end=end_a)
+        audio_b = self._load_segment(track_b_path, start=start_b, end=None)
 
         # 2. Time-stretch B if needed to match BPM
         bpm_b = analysis_b.get("bpm", bpm)
@@ -92,6 +168,12 @@ class TransitionPlanExecutor:
             audio_b = self._time_stretch(audio_b, bpm_b, bpm)
             logger.debug(f"Time-stretched track B from {bpm_b} to {bpm} BPM")
 
+        # Stem cache keys: the source window (and stretch, for B) of each side
+        stem_cache_keys = [
+            source_window_key(track_a_path, start_a, end_a, self.sr),
+            source_window_key(track_b_path, start_b, None, self.sr, bpm_b, bpm),
+        ]
+
         # 3. Execute transition based on type
         transition_config = plan.get("transition", {})
         transition_type = transition_config.get("type", "CROSSFADE")
@@ -100,7 +182,8 @@ class TransitionPlanExecutor:
             if transition_type == "STEM_BLEND":
                 result = self._execute_stem_blend(
                     audio_a, audio_b,
-                    plan, bpm
+                    plan, bpm,
+                    stem_cache_keys=stem_cache_keys
                 )
             elif transition_type == "CROSSFADE":
                 result = self._execute_crossfade(audio_a, audio_b, plan, bpm)
@@ -125,7 +208,8 @@ class TransitionPlanExecutor:
         audio_a: np.ndarray,
         audio_b: np.ndarray,
         plan: Dict,
-        bpm: float
+        bpm: float,
+        stem_cache_keys: Optional[List[Hashable]] = None
     ) -> np.ndarray:
         """
         Execute a stem-based blend transition.
@@ -134,6 +218,10 @@ class TransitionPlanExecutor:
         - Per-stem volume control
         - Proper bass swap
         - Phase-based automation
+
+        stem_cache_keys identify the source windows of audio_a and audio_b, so a
+        track separated in an earlier transition is served from the stem cache.
+        Without them the cache is keyed by the audio content instead.
         """
         bar_duration = self._get_bar_duration(bpm)
         transition_config = plan.get("transition", {})
@@ -147,12 +235,9 @@ class TransitionPlanExecutor:
         trans_start_a = transition_config.get("start_time_in_a", len(audio_a) / self.sr - duration_seconds)
         trans_start_sample = int(trans_start_a * self.sr)
 
-        # Separate stems
-        logger.debug("Separating stems for track A")
-        stems_a = self._separate_stems(audio_a)
-
-        logger.debug("Separating stems for track B")
-        stems_b = self._separate_stems(audio_b)
+        # Separate stems for both tracks in one batched pass
+        logger.debug("Separating stems for tracks A and B")
+        stems_a, stems_b = self._separate_stem_pair(audio_a, audio_b, stem_cache_keys)
 
         # Get bass swap configuration
         bass_swap_bar = stems_config.get("bass_swap_bar", duration_bars // 2)
@@ -172,30 +257,24 @@ class TransitionPlanExecutor:
         result_before = audio_a[:trans_start_sample]
 
         # Process transition zone with phase automation
-        phases = stems_config.get("phases", self._get_default_phases(duration_bars))
+        phases = stems_config.get("phases")
+        if phases is None:
+            phases = self._get_default_phases(duration_bars)
         transition_audio = self._apply_phase_mixing(
             stems_a_swapped, stems_b_swapped,
             phases, trans_start_sample, bar_duration
         )
 
         # Part after transition (from B)
-        trans_end_sample = trans_start_sample + duration_samples
-        if duration_samples < len(audio_b):
-            result_after = audio_b[duration_samples:]
-        else:
-            result_after = np.array([])
+        result_after = audio_b[duration_samples:]
 
         # Assemble result
-        result = np.concatenate([
-            result_before,
-            transition_audio,
-            result_after
-        ])
-
-        # Normalize
-        max_val = np.max(np.abs(result))
+        result = self._assemble(result_before, transition_audio, result_after)
+
+        # Normalize (in place)
+        max_val = max(result.max(), -result.min()) if result.size else 0.0
         if max_val > 1.0:
-            result = result / max_val * 0.95
+            result *= 0.95 / max_val
 
         return result
 
@@ -217,41 +296,97 @@ class TransitionPlanExecutor:
         total_bars = last_phase["bars"][1]
         total_samples = total_bars * bar_samples
 
+        starts, ends, levels = self._phase_levels(
+            stems_a, stems_b, phases, trans_start_sample, bar_samples, total_samples
+        )
+
+        # Sources in level-table column order, with their offset into the stem
+        sources = [stems_a.get(name) for name in PHASE_STEMS] + [stems_b.get(name) for name in PHASE_STEMS]
+        offsets = [trans_start_sample] * len(PHASE_STEMS) + [0] * len(PHASE_STEMS)
+
         transition_audio = np.zeros(total_samples, dtype=np.float32)
 
+        if NUMBA_AVAILABLE:
+            # The kernel reads every source across the whole mix; missing or
+            # short stems have level 0 there, so zero-padding them is exact
+            needed = [trans_start_sample + total_samples] * len(PHASE_STEMS) + [total_samples] * len(PHASE_STEMS)
+            _mix_phase_levels_kernel(
+                *(self._pad_source(source, length) for source, length in zip(sources, needed)),
+                trans_start_sample, starts, ends, levels, transition_audio
+            )
+            return transition_audio
+
+        scratch = np.empty(int((ends - starts).max(initial=0)), dtype=np.float32)
+
+        for start, end, row in zip(starts, ends, levels):
+            target = transition_audio[start:end]
+            gained = scratch[:end - start]
+            for source, offset, level in zip(sources, offsets, row):
+                if level:
+                    np.multiply(source[offset + start:offset + end], level, out=gained)
+                    target += gained
+
+        return transition_audio
+
+    def _pad_source(self, source: Optional[np.ndarray], length: int) -> np.ndarray:
+        """Return ``source`` if it holds ``length`` samples, else a zero-padded copy."""
+        if source is not None and len(source) >= length:
+            return source
+        padded = np.zeros(length, dtype=np.float32)
+        if source is not None:
+            padded[:len(source)] = source
+        return padded
+
+    def _phase_levels(
+        self,
+        stems_a: Dict[str, np.ndarray],
+        stems_b: Dict[str, np.ndarray],
+        phases: list,
+        trans_start_sample: int,
+        bar_samples: int,
+        total_samples: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Compile phases into sample bounds and a table of stem levels.
+
+        Returns:
+            (starts, ends, levels) where levels has one row per non-empty
+            phase and one column per stem of A then B. Stems that are missing
+            or too short for the phase, and levels that are not positive,
+            become 0.
+        """
+        starts, ends, levels = [], [], []
+
         for phase in phases:
             bar_start = phase["bars"][0] - 1  # Convert to 0-indexed
             bar_end = phase["bars"][1]
 
             phase_start = bar_start * bar_samples
             phase_end = min(bar_end * bar_samples, total_samples)
-            phase_length = phase_end - phase_start
 
-            if phase_length <= 0:
+            if phase_end - phase_start <= 0:
                 continue
 
-            # Mix stems for this phase
-            for stem_name in ["drums", "bass", "other", "vocals"]:
-                level_a = phase.get("a", {}).get(stem_name, 0)
-                level_b = phase.get("b", {}).get(stem_name, 0)
-
-                # Get stem segments
-                stem_a = stems_a.get(stem_name)
-                stem_b = stems_b.get(stem_name)
-
-                # Position in original stems
-                a_pos_start = trans_start_sample + phase_start
-                a_pos_end = trans_start_sample + phase_end
-
-                if stem_a is not None and a_pos_end <= len(stem_a) and level_a > 0:
-                    segment_a = stem_a[a_pos_start:a_pos_end] * level_a
-                    transition_audio[phase_start:phase_end] += segment_a
-
-                if stem_b is not None and phase_end <= len(stem_b) and level_b > 0:
-                    segment_b = stem_b[phase_start:phase_end] * level_b
-                    transition_audio[phase_start:phase_end] += segment_b
-
-        return transition_audio
+            row = []
+            for stems, key, needed in (
+                (stems_a, "a", trans_start_sample + phase_end),
+                (stems_b, "b", phase_end),
+            ):
+                for stem_name in PHASE_STEMS:
+                    stem = stems.get(stem_name)
+                    level = phase.get(key, {}).get(stem_name, 0)
+                    usable = stem is not None and needed <= len(stem) and level > 0
+                    row.append(level if usable else 0)
+
+            starts.append(phase_start)
+            ends.append(phase_end)
+            levels.append(row)
+
+        return (
+            np.asarray(starts, dtype=np.int64),
+            np.asarray(ends, dtype=np.int64),
+            np.asarray(levels, dtype=np.float32).reshape(-1, 2 * len(PHASE_STEMS)),
+        )
 
     def _execute_crossfade(
         self,
@@ -287,9 +422,9 @@ class TransitionPlanExecutor:
         )
 
         # After transition
-        result_after = audio_b[duration_samples:] if duration_samples < len(audio_b) else np.array([])
+        result_after = audio_b[duration_samples:]
 
-        return np.concatenate([result_before, transition_segment, result_after])
+        return self._assemble(result_before, transition_segment, result_after)
 
     def _execute_hard_cut(
         self,
@@ -376,9 +511,9 @@ class TransitionPlanExecutor:
         )
 
         # After transition
-        result_after = audio_b[duration_samples:] if duration_samples < len(audio_b) else np.array([])
+        result_after = audio_b[duration_samples:]
 
-        return np.concatenate([result_before, transition_segment, result_after])
+        return self._assemble(result_before, transition_segment, result_after)
 
     def _execute_echo_out(
         self,
@@ -438,11 +573,26 @@ class TransitionPlanExecutor:
             sr=self.sr
         )
 
-        return np.concatenate([
-            audio_a[:-duration_samples],
+        return self._assemble(
+            audio_a[:len(audio_a) - duration_samples],
             transition,
             audio_b[duration_samples:]
-        ])
+        )
+
+    def _assemble(self, *parts: np.ndarray) -> np.ndarray:
+        """
+        Join consecutive parts into one preallocated float32 buffer.
+
+        Unlike np.concatenate, the output stays float32 even when a part is
+        float64 (e.g. an effect's output), so the whole mix is never upcast.
+        """
+        total = sum(len(part) for part in parts)
+        result = np.empty((total,) + parts[0].shape[1:], dtype=np.float32)
+        pos = 0
+        for part in parts:
+            result[pos:pos + len(part)] = part
+            pos += len(part)
+        return result
 
     def _load_segment(
         self,
@@ -450,23 +600,26 @@ class TransitionPlanExecutor:
         start: float,
         end: Optional[float] = None
     ) -> np.ndarray:
-        """Load an audio segment from file."""
-        audio, sr = sf.read(path)
-
-        # Convert to mono if stereo
-        if len(audio.shape) > 1:
-            audio = np.mean(audio, axis=1)
+        """Load an audio segment from file, decoding only the requested window."""
+        with sf.SoundFile(path) as f:
+            sr = f.samplerate
+            start_frame = min(int(start * sr), f.frames)
+            frames = max(int(end * sr) - start_frame, 0) if end else -1
+            f.seek(start_frame)
+            audio = f.read(frames, dtype='float32', always_2d=False)
+
+        # Convert to mono if stereo, staying in float32
+        if audio.ndim > 1:
+            if audio.shape[1] == 2:
+                audio = (audio[:, 0] + audio[:, 1]) * np.float32(0.5)
+            else:
+                audio = audio.mean(axis=1, dtype=np.float32)
 
         # Resample if needed
         if sr != self.sr:
-            import librosa
-            audio = librosa.resample(audio, orig_sr=sr, target_sr=self.sr)
+            audio = resample_audio(audio, orig_sr=sr, target_sr=self.sr)
 
-        # Extract segment
-        start_sample = int(start * self.sr)
-        end_sample = int(end * self.sr) if end else len(audio)
-
-        return audio[start_sample:end_sample].astype(np.float32)
+        return audio.astype(np.float32, copy=False)
 
     def _time_stretch(
         self,
@@ -475,13 +628,8 @@ class TransitionPlanExecutor:
         target_bpm: float
     ) -> np.ndarray:
         """Time-stretch audio to match target BPM."""
-        try:
-            import pyrubberband as pyrb
-            ratio = source_bpm / target_bpm
-            return pyrb.time_stretch(audio, self.sr, ratio)
-        except ImportError:
-            logger.warning("pyrubberband not available, skipping time-stretch")
-            return audio
+        stretched, _ = stretch_to_bpm(audio, self.sr, source_bpm, target_bpm)
+        return stretched
 
     def _separate_stems(self, audio: np.ndarray) -> Dict[str, np.ndarray]:
         """Separate audio into stems using Demucs."""
@@ -489,40 +637,29 @@ class TransitionPlanExecutor:
             return self.stem_separator.separate(audio, self.sr)
         except Exception as e:
             logger.warning(f"Stem separation failed: {e}")
-            # Return full audio as all stems (fallback)
-            return {
-                "drums": audio.copy(),
-                "bass": audio.copy(),
-                "vocals": audio.copy(),
-                "other": audio.copy()
-            }
+            # Full audio as all stems (fallback), one shared read-only buffer
+            return passthrough_stems(audio)
+
+    def _separate_stem_pair(
+        self,
+        audio_a: np.ndarray,
+        audio_b: np.ndarray,
+        cache_keys: Optional[List[Hashable]] = None
+    ) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+        """Separate both tracks with one batched Demucs call, falling back per track."""
+        try:
+            stems_a, stems_b = separate_stems_batch(
+                [audio_a, audio_b], self.sr, cache_keys=cache_keys
+            )
+            return stems_a, stems_b
+        except Exception as e:
+            logger.warning(f"Batched stem separation failed, separating tracks one by one: {e}")
+            return self._separate_stems(audio_a), self._separate_stems(audio_b)
 
     def _get_bar_duration(self, bpm: float) -> float:
         """Calculate bar duration in seconds."""
         return (60.0 / bpm) * 4
 
-    def _get_default_phases(self, duration_bars: int) -> list:
-        """Get default 4-phase configuration."""
-        phase_len = duration_bars // 4
-        return [
-            {
-                "bars": [1, phase_len],
-                "a": {"drums": 1.0, "bass": 1.0, "other": 1.0, "vocals": 1.0},
-                "b": {"drums": 0.3, "bass": 0.0, "other": 0.0, "vocals": 0.0}
-            },
-            {
-                "bars": [phase_len + 1, phase_len * 2],
-                "a": {"drums": 1.0, "bass": 1.0, "other": 0.7, "vocals": 0.7},
-                "b": {"drums": 0.5, "bass": 0.0, "other": 0.3, "vocals": 0.0}
-            },
-            {
-                "bars": [phase_len * 2 + 1, phase_len * 3],
-                "a": {"drums": 0.6, "bass": 0.0, "other": 0.4, "vocals": 0.3},
-                "b": {"drums": 0.7, "bass": 1.0, "other": 0.6, "vocals": 0.3}
-            },
-            {
-                "bars": [phase_len * 3 + 1, duration_bars],
-                "a": {"drums": 0.2, "bass": 0.0, "other": 0.0, "vocals": 0.0},
-                "b": {"drums": 1.0, "bass": 1.0, "other": 1.0, "vocals": 1.0}
-            }
-        ]
+    def _get_default_phases(self, duration_bars: int) -> Tuple[Mapping[str, Any], ...]:
+        """Get default 4-phase configuration (shared, cached and read-only)."""
+        return _default_phases(duration_bars)
@@ -0,0 +1,93 @@
+"""
+Ahead-of-time warm-up for the numba mixing kernels.
+
+The kernels are compiled with ``cache=True``, so numba writes the machine
+code next to the source the first time each signature is compiled. Running
+this module once per deployment (``python -m src.mixing.precompile``) fills
+that cache so no transition job pays the JIT cost. Later processes load the
+cached code instead of compiling.
+
+Run it as its own process: the parallel kernels start numba's threading
+layer, and a process that has done so cannot safely fork workers.
+"""
+
+import time
+
+import numpy as np
+import structlog
+
+from src.mixing import plan_executor, transition_generator
+from src.mixing.effects import filters
+from src.mixing.plan_executor import PHASE_STEMS, TransitionPlanExecutor
+
+logger = structlog.get_logger()
+
+# Tiny inputs: only the argument types matter for compilation
+_SR = 8000
+_BPM = 120.0
+_BARS = 4
+
+
+def _warm_transition_generator() -> None:
+    """Compile the crossfade kernels run by the crossfade and echo-out transitions."""
+    n = _SR // 10
+    a = np.zeros(n, dtype=np.float32)
+    b = np.zeros(n, dtype=np.float32)
+    transition_generator._linear_crossfade(a, b)
+    transition_generator._equal_power_crossfade(a, b)
+
+    # Echo out crossfades straight into a slice of the output buffer
+    output = np.zeros(2 * n, dtype=np.float32)
+    transition_generator._equal_power_crossfade(a, b, out=output[n // 2:n // 2 + n])
+
+
+def _warm_filters() -> None:
+    """Compile the fused filter-sweep kernel."""
+    n = _SR // 2
+    a = np.zeros(n, dtype=np.float32)
+    b = np.zeros(n, dtype=np.float32)
+    filters.filter_sweep_crossfade(a, b, lpf_end=_SR / 2 - 200, sr=_SR)
+
+
+def _warm_plan_executor() -> None:
+    """Compile the phase-level kernel for writable and cached read-only stems."""
+    executor = TransitionPlanExecutor(sr=_SR)
+    bar_duration = 4 * 60.0 / _BPM
+    n = _BARS * int(bar_duration * _SR)
+    phases = [{
+        "bars": [1, _BARS],
+        "a": {name: 1.0 for name in PHASE_STEMS},
+        "b": {name: 1.0 for name in PHASE_STEMS},
+    }]
+
+    stems = {name: np.zeros(n, dtype=np.float32) for name in PHASE_STEMS}
+    executor._apply_phase_mixing(stems, stems, phases, 0, bar_duration)
+
+    # Full-track stems come back read-only from the stem cache
+    for stem in stems.values():
+        stem.setflags(write=False)
+    executor._apply_phase_mixing(stems, stems, phases, 0, bar_duration)
+
+
+def precompile_kernels() -> None:
+    """Compile (or load from the numba cache) every mixing kernel."""
+    warmups = [
+        warm for module, warm in (
+            (transition_generator, _warm_transition_generator),
+            (filters, _warm_filters),
+            (plan_executor, _warm_plan_executor),
+        )
+        if module.NUMBA_AVAILABLE
+    ]
+    if not warmups:
+        logger.info("numba not available, skipping kernel precompilation")
+        return
+
+    start = time.perf_counter()
+    for warm in warmups:
+        warm()
+    logger.info("Mixing kernels ready", elapsed_s=round(time.perf_counter() - start, 2))
+
+
+if __name__ == "__main__":
+    precompile_kernels()
@@ -8,7 +8,9 @@ Separates audio into:
 - Other (melody, synths, etc.)
 """
 
-from typing import Dict, Optional, Tuple
+from collections import OrderedDict
+import hashlib
+from typing import Dict, Hashable, List, Optional, Tuple
 from pathlib import Path
 import tempfile
 import os
@@ -18,6 +20,8 @@ import soundfile as sf
 import structlog
 
 from src.config import settings
+from src.mixing.beatmatch import stretch_backend
+from src.utils.audio import load_audio, resample_audio
 
 logger = structlog.get_logger()
 
@@ -41,6 +45,19 @@ def _check_demucs() -> bool:
     return _demucs_available
 
 
+def _select_device(preferred: Optional[str] = None):
+    """Pick the torch device for Demucs: explicit choice, else CUDA > MPS > CPU."""
+    import torch
+
+    if preferred:
+        return torch.device(preferred)
+    if torch.cuda.is_available():
+        return torch.device('cuda')
+    if torch.backends.mps.is_available():
+        return torch.device('mps')
+    return torch.device('cpu')
+
+
 class StemSeparator:
     """
     Wrapper for Demucs stem separation.
@@ -49,24 +66,31 @@ class StemSeparator:
 
     STEM_NAMES = ['drums', 'bass', 'other', 'vocals']
 
-    def __init__(self, model_name: Optional[str] = None):
+    # Largest fraction of a batch row that may be padding before a segment
+    # gets its own forward pass
+    BATCH_PAD_RATIO = 0.25
+
+    def __init__(self, model_name: Optional[str] = None, device: Optional[str] = None):
         """
         Initialize the stem separator.
 
         Args:
             model_name: Demucs model to use (default: htdemucs_ft)
+            device: Torch device to run on (default: settings.demucs_device, else auto)
         """
         self.model_name = model_name or settings.demucs_model
+        self.requested_device = device or settings.demucs_device or None
         self.model = None
         self.device = None
+        # Resolved once; separate() consults the attribute, not the module check
+        self.available = _check_demucs()
 
     def load_model(self):
         """Load the Demucs model."""
-        if not _check_demucs():
+        if not self.available:
             logger.warning("Demucs not available, using passthrough mode")
             return
 
-        import torch
         from demucs import pretrained
 
         logger.info("Loading Demucs model", model=self.model_name)
@@ -74,101 +98,223 @@ class StemSeparator:
         self.model = pretrained.get_model(self.model_name)
 
         # Select best available device: CUDA > MPS (Apple Silicon) > CPU
-        if torch.cuda.is_available():
-            self.device = torch.device('cuda')
-            self.model = self.model.cuda()
-            logger.info("Using CUDA for Demucs")
-        elif torch.backends.mps.is_available():
-            self.device = torch.device('mps')
-            self.model = self.model.to(self.device)
-            logger.info("Using MPS (Apple Silicon) for Demucs")
-        else:
-            self.device = torch.device('cpu')
-            logger.info("Using CPU for Demucs")
+        self.device = _select_device(self.requested_device)
+        self.model = self.model.to(self.device)
+        logger.info("Using device for Demucs", device=self.device.type)
+
+        if self.device.type == 'cuda':
+            import torch
+            # apply_model feeds fixed-size chunks, so autotuned conv kernels are
+            # reused for every later segment and transition
+            torch.backends.cudnn.benchmark = True
 
         self.model.eval()
+
+        if self.device.type == 'cuda' and settings.demucs_compile:
+            self._compile_model()
+
         logger.info("Demucs model loaded successfully")
 
+    def _compile_model(self):
+        """
+        torch.compile each Demucs network and warm it up.
+
+        Only forward is compiled, so apply_model still sees the original
+        HTDemucs / BagOfModels classes. Falls back to eager mode on failure.
+        """
+        import torch
+
+        networks = getattr(self.model, 'models', [self.model])
+        eager_forwards = [net.forward for net in networks]
+        try:
+            for net in networks:
+                net.forward = torch.compile(net.forward, mode='reduce-overhead')
+            # Pay the compilation here, at model load, not on the first transition
+            self._apply(torch.zeros(1, 2, 10 * 44100), self.device)
+            logger.info("Demucs model compiled", networks=len(networks))
+        except Exception as e:
+            for net, forward in zip(networks, eager_forwards):
+                net.forward = forward
+            logger.warning("torch.compile failed, running Demucs eagerly", error=str(e))
+
+    def _apply(self, audio_tensor, device):
+        """Run the model on a (batch, 2, samples) tensor on the given device."""
+        import torch
+        from demucs.apply import apply_model
+
+        # Half-precision convolutions on accelerators; CPU stays in float32
+        use_autocast = settings.demucs_autocast and device.type in ('cuda', 'mps')
+        autocast_dtype = torch.bfloat16
+        if device.type == 'cuda':
+            want_bf16 = settings.demucs_cuda_dtype == 'bfloat16' and torch.cuda.is_bf16_supported()
+            autocast_dtype = torch.bfloat16 if want_bf16 else torch.float16
+
+        with torch.inference_mode(), torch.autocast(
+            device_type=device.type, dtype=autocast_dtype, enabled=use_autocast
+        ):
+            sources = apply_model(
+                self.model,
+                audio_tensor,
+                device=device,
+                shifts=0,
+                split=True,
+                overlap=settings.demucs_overlap,
+                segment=self._segment_seconds(),
+                progress=False,
+                num_workers=0,
+            )
+        return sources.float()
+
+    def _segment_seconds(self) -> Optional[float]:
+        """Configured split length, capped at what the model was trained on (None = model default)."""
+        if settings.demucs_segment <= 0:
+            return None
+        trained = getattr(self.model, 'segment', None)
+        return min(settings.demucs_segment, float(trained)) if trained else settings.demucs_segment
+
     def separate(
         self,
         audio: np.ndarray,
-        sample_rate: int
+        sample_rate: int,
+        device: Optional[str] = None
     ) -> Dict[str, np.ndarray]:
         """
         Separate audio into stems.
 
+        Falls back to CPU if the accelerator runs out of memory.
+
         Args:
             audio: Input audio as numpy array (mono or stereo)
             sample_rate: Sample rate of the audio
+            device: Override the device for this call (e.g. 'cpu')
 
         Returns:
             Dictionary mapping stem names to audio arrays
         """
-        if not _check_demucs():
+        return self.separate_batch([audio], sample_rate, device=device)[0]
+
+    def separate_batch(
+        self,
+        segments: List[np.ndarray],
+        sample_rate: int,
+        device: Optional[str] = None
+    ) -> List[Dict[str, np.ndarray]]:
+        """
+        Separate several segments in a single model pass.
+
+        Segments of similar length are right-padded to the longest one,
+        stacked on the batch dimension and sliced back to their own lengths
+        afterwards; segments much shorter than the rest run in their own pass.
+
+        Args:
+            segments: Input audio arrays (mono or stereo)
+            sample_rate: Sample rate shared by all segments
+            device: Override the device for this call (e.g. 'cpu')
+
+        Returns:
+            One stem dictionary per input segment, in order
+        """
+        if not self.available:
             # Return original audio as all stems (passthrough)
             logger.warning("Using passthrough mode - no actual separation")
-            return {name: audio.copy() for name in self.STEM_NAMES}
+            return [passthrough_stems(audio) for audio in segments]
 
         if self.model is None:
             self.load_model()
 
+        prepared = [self._prepare_input(audio, sample_rate) for audio in segments]
+
+        # Padding a short segment up to a long one costs a full model pass over
+        # silence, so only lengths within BATCH_PAD_RATIO share a forward pass
+        results: List[Optional[Dict[str, np.ndarray]]] = [None] * len(prepared)
+        order = sorted(range(len(prepared)), key=lambda i: prepared[i].shape[1], reverse=True)
+        group: List[int] = []
+        for idx in order:
+            if group and prepared[idx].shape[1] < prepared[group[0]].shape[1] * (1 - self.BATCH_PAD_RATIO):
+                self._separate_group(prepared, group, results, device)
+                group = []
+            group.append(idx)
+        self._separate_group(prepared, group, results, device)
+
+        logger.info("Stem separation complete", stems=list(self.STEM_NAMES), batch=len(segments))
+        return results
+
+    def _separate_group(
+        self,
+        prepared: List[np.ndarray],
+        group: List[int],
+        results: List[Optional[Dict[str, np.ndarray]]],
+        device: Optional[str]
+    ) -> None:
+        """Run one padded forward pass over ``prepared[group]`` into ``results``."""
         import torch
-        from demucs.apply import apply_model
 
+        lengths = [prepared[i].shape[1] for i in group]
+        max_len = max(lengths)
+
+        single = prepared[group[0]]
+        if len(group) == 1 and single.flags.c_contiguous and single.flags.writeable:
+            # A lone segment (e.g. the only cache miss of a pair) needs no padding
+            batch = single[np.newaxis]
+        else:
+            # Right-pad to a common length: (batch, 2, samples)
+            batch = np.zeros((len(group), 2, max_len), dtype=np.float32)
+            for b, i in enumerate(group):
+                batch[b, :, :lengths[b]] = prepared[i]
+        audio_tensor = torch.from_numpy(batch)
+
+        # The tensor stays on the host; apply_model moves each chunk to the device
+        target_device = torch.device(device) if device else self.device
+
+        logger.info("Separating stems", audio_shape=audio_tensor.shape, device=target_device.type)
+
+        try:
+            sources = self._apply(audio_tensor, target_device)
+        except RuntimeError as e:
+            if target_device.type == 'cpu' or 'out of memory' not in str(e).lower():
+                raise
+            logger.warning("Demucs ran out of device memory, retrying on CPU", device=target_device.type)
+            if target_device.type == 'cuda':
+                torch.cuda.empty_cache()
+            sources = self._apply(audio_tensor, torch.device('cpu'))
+
+        # sources is (batch, num_sources, 2, samples): average the channels
+        # wherever the tensor lives, so only mono stems cross to the host
+        mono = sources.sum(dim=2).mul_(0.5).cpu().numpy()
+        for b, (i, length) in enumerate(zip(group, lengths)):
+            results[i] = {
+                name: mono[b, s, :length]
+                for s, name in enumerate(self.STEM_NAMES)
+            }
+
+    def _prepare_input(self, audio: np.ndarray, sample_rate: int) -> np.ndarray:
+        """
+        Convert audio to a float32 (2, samples) array at 44.1kHz for Demucs.
+
+        Mono input comes back as a read-only broadcast view; it is only
+        materialized when copied into the batch tensor.
+        """
         # Ensure audio is float32
         if audio.dtype != np.float32:
             audio = audio.astype(np.float32)
 
-        # Convert mono to stereo if needed
         if audio.ndim == 1:
-            audio = np.stack([audio, audio], axis=0)
-        elif audio.ndim == 2 and audio.shape[0] > audio.shape[1]:
+            audio = audio[np.newaxis]
+        elif audio.shape[0] > audio.shape[1]:
             # Shape is (samples, channels), transpose to (channels, samples)
             audio = audio.T
 
-        # Ensure stereo
-        if audio.shape[0] == 1:
-            audio = np.concatenate([audio, audio], axis=0)
-
-        # Resample to model's sample rate if needed (Demucs expects 44100)
+        # Resample to model's sample rate if needed (Demucs expects 44100);
+        # before the stereo promotion, so mono is only resampled once
         if sample_rate != 44100:
-            import librosa
-            audio = np.stack([
-                librosa.resample(audio[0], orig_sr=sample_rate, target_sr=44100),
-                librosa.resample(audio[1], orig_sr=sample_rate, target_sr=44100),
-            ])
-            sample_rate = 44100
+            # All channels in one resampler call
+            audio = resample_audio(audio, orig_sr=sample_rate, target_sr=44100)
 
-        # Convert to tensor
-        audio_tensor = torch.from_numpy(audio).float()
-        audio_tensor = audio_tensor.unsqueeze(0)  # Add batch dim: (1, 2, samples)
-
-        # Move tensor to same device as model
-        if self.device.type != 'cpu':
-            audio_tensor = audio_tensor.to(self.device)
-
-        logger.info("Separating stems", audio_shape=audio_tensor.shape)
-
-        # Apply model
-        with torch.no_grad():
-            sources = apply_model(
-                self.model,
-                audio_tensor,
-                device=self.device,
-                progress=False,
-                num_workers=0,
-            )
-
-        # Extract stems: sources shape is (1, num_sources, 2, samples)
-        stems = {}
-        for i, name in enumerate(self.STEM_NAMES):
-            stem_audio = sources[0, i].cpu().numpy()  # (2, samples)
-            # Convert to mono by averaging channels
-            stem_mono = np.mean(stem_audio, axis=0)
-            stems[name] = stem_mono
+        # Ensure stereo without copying the mono channel
+        if audio.shape[0] == 1:
+            audio = np.broadcast_to(audio, (2, audio.shape[1]))
 
-        logger.info("Stem separation complete", stems=list(stems.keys()))
-        return stems
+        return audio
 
     def separate_segment(
         self,
@@ -200,12 +346,31 @@ class StemSeparator:
         return self.separate(segment, sample_rate)
 
 
+def passthrough_stems(audio: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Map every stem name to one read-only view of the unseparated audio.
+
+    Used when separation is unavailable or fails. All stems alias the same
+    buffer, so it is marked read-only: callers copy before modifying (as
+    execute_bass_swap does), and an in-place write raises instead of
+    leaking into the other stems.
+    """
+    view = audio.view()
+    view.flags.writeable = False
+    return {name: view for name in StemSeparator.STEM_NAMES}
+
+
 # Global separator instance (lazy loaded)
 _global_separator: Optional[StemSeparator] = None
 
 
 def get_separator() -> StemSeparator:
-    """Get or create the global stem separator instance."""
+    """
+    Get or create the global stem separator instance.
+
+    The model is loaded once per process and stays on its device, so every
+    transition in a mix reuses the same session.
+    """
     global _global_separator
     if _global_separator is None:
         _global_separator = StemSeparator()
@@ -214,7 +379,8 @@ def get_separator() -> StemSeparator:
 
 def separate_stems(
     audio: np.ndarray,
-    sample_rate: int
+    sample_rate: int,
+    device: Optional[str] = None
 ) -> Dict[str, np.ndarray]:
     """
     Convenience function to separate audio into stems.
@@ -222,12 +388,190 @@ def separate_stems(
     Args:
         audio: Input audio
         sample_rate: Sample rate
+        device: Optional torch device override ('cuda', 'mps', 'cpu')
 
     Returns:
         Dictionary of stems: {'drums', 'bass', 'other', 'vocals'}
     """
     separator = get_separator()
-    return separator.separate(audio, sample_rate)
+    return separator.separate(audio, sample_rate, device=device)
+
+
+# Recently separated segments, keyed by source window or content hash (LRU order)
+_stem_cache: "OrderedDict[Hashable, Dict[str, np.ndarray]]" = OrderedDict()
+
+
+def _copy_stems(stems: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Copy stems so callers can modify them without touching the cache."""
+    return {name: stem.copy() for name, stem in stems.items()}
+
+
+def _content_key(audio: np.ndarray, sample_rate: int) -> Hashable:
+    """Cache key derived from the segment's samples, for callers without a source key."""
+    audio = np.ascontiguousarray(audio)
+    digest = hashlib.blake2b(audio.data, digest_size=16).hexdigest()
+    return ('content', sample_rate, audio.dtype.str, audio.shape, digest)
+
+
+def _disk_cache_path(key: Hashable) -> Path:
+    """
+    .npy path of a cache key's stem matrix under <output_path>/stems_cache.
+
+    The disk cache outlives config and image changes, so the hash also covers
+    every setting the stems depend on: the Demucs model and inference options,
+    and the time-stretch backend that produced stretched windows.
+    """
+    settings_key = (
+        settings.demucs_model,
+        settings.demucs_segment,
+        settings.demucs_overlap,
+        settings.demucs_autocast,
+        settings.demucs_cuda_dtype,
+        stretch_backend(),
+    )
+    digest = hashlib.blake2b(
+        repr((settings_key, key)).encode(), digest_size=16
+    ).hexdigest()
+    return Path(settings.output_path) / 'stems_cache' / f"{digest}.npy"
+
+
+def _load_disk_stems(key: Hashable) -> Optional[Dict[str, np.ndarray]]:
+    """Memory-map a cached (stems, samples) matrix from disk, or None if absent."""
+    try:
+        matrix = np.load(_disk_cache_path(key), mmap_mode='r')
+    except (OSError, ValueError):
+        return None
+    if matrix.ndim != 2 or matrix.shape[0] != len(StemSeparator.STEM_NAMES):
+        return None
+    return {name: matrix[s] for s, name in enumerate(StemSeparator.STEM_NAMES)}
+
+
+def _save_disk_stems(key: Hashable, stems: Dict[str, np.ndarray]) -> None:
+    """Write stems as one (stems, samples) matrix, atomically, and prune the oldest entries."""
+    path = _disk_cache_path(key)
+    cache_dir = path.parent
+    try:
+        matrix = np.stack([stems[name] for name in StemSeparator.STEM_NAMES]).astype(np.float32, copy=False)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Unique temp file: other worker processes may be writing the same key
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.npy.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, matrix)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+        files = sorted(cache_dir.glob('*.npy'), key=lambda f: f.stat().st_mtime)
+        excess = len(files) - settings.stem_disk_cache_entries
+        for stale in files[:max(0, excess)]:
+            stale.unlink(missing_ok=True)
+    except (OSError, ValueError) as e:
+        logger.warning("Failed to write stem cache", error=str(e))
+
+
+def separate_stems_batch(
+    segments: List[np.ndarray],
+    sample_rate: int,
+    device: Optional[str] = None,
+    cache_keys: Optional[List[Hashable]] = None
+) -> List[Dict[str, np.ndarray]]:
+    """
+    Separate several segments with one Demucs forward pass.
+
+    Segments already separated under the same key are served from memory,
+    then from the on-disk cache (memory-mapped .npy, shared with other worker
+    processes), and only the rest go through the model. Without cache_keys,
+    each segment is keyed by a hash of its samples, so identical audio is
+    still only separated once.
+
+    Args:
+        segments: Input audio arrays
+        sample_rate: Sample rate
+        device: Optional torch device override ('cuda', 'mps', 'cpu')
+        cache_keys: Optional key per segment identifying its source window,
+            from beatmatch.source_window_key so that a changed file misses
+            the disk cache (default: a content hash of the segment)
+
+    Returns:
+        List of stem dictionaries, one per segment
+    """
+    separator = get_separator()
+    if not separator.available or settings.stem_cache_size <= 0:
+        return separator.separate_batch(segments, sample_rate, device=device)
+    if cache_keys is None:
+        cache_keys = [_content_key(segment, sample_rate) for segment in segments]
+
+    use_disk = settings.stem_disk_cache_entries > 0
+    results: List[Optional[Dict[str, np.ndarray]]] = [None] * len(segments)
+    missing = []
+    for i, key in enumerate(cache_keys):
+        if key in _stem_cache:
+            _stem_cache.move_to_end(key)
+        elif use_disk and (disk_stems := _load_disk_stems(key)) is not None:
+            _stem_cache[key] = disk_stems
+        else:
+            missing.append(i)
+            continue
+        results[i] = _copy_stems(_stem_cache[key])
+
+    logger.info("Stem cache lookup", hits=len(segments) - len(missing), misses=len(missing))
+
+    if missing:
+        separated = separator.separate_batch(
+            [segments[i] for i in missing], sample_rate, device=device
+        )
+        for i, stems in zip(missing, separated):
+            _stem_cache[cache_keys[i]] = stems
+            results[i] = _copy_stems(stems)
+            if use_disk:
+                _save_disk_stems(cache_keys[i], stems)
+
+    while len(_stem_cache) > settings.stem_cache_size:
+        _stem_cache.popitem(last=False)
+
+    return results
+
+
+def get_track_stems(path: str, sample_rate: int) -> Dict[str, np.ndarray]:
+    """
+    Stems of a whole track, separated once and reused by every transition.
+
+    The result is cached under the file's identity (path, size, mtime), in
+    memory and, when the disk cache is on, as a memory-mapped .npy, so
+    transitions slice their windows out of it instead of running Demucs.
+    The returned arrays are shared and read-only.
+
+    Args:
+        path: Path to the audio file
+        sample_rate: Sample rate the stems are returned at
+
+    Returns:
+        Dictionary of mono stems covering the whole track
+    """
+    stat = os.stat(path)
+    key = ('track', os.path.abspath(path), stat.st_size, stat.st_mtime_ns, sample_rate)
+
+    if key in _stem_cache:
+        _stem_cache.move_to_end(key)
+        return _stem_cache[key]
+
+    use_disk = settings.stem_disk_cache_entries > 0
+    stems = _load_disk_stems(key) if use_disk else None
+    if stems is None:
+        audio, _ = load_audio(path, target_sr=sample_rate)
+        stems = get_separator().separate(audio, sample_rate)
+        if use_disk:
+            _save_disk_stems(key, stems)
+            stems = _load_disk_stems(key) or stems
+        for stem in stems.values():
+            stem.setflags(write=False)
+
+    _stem_cache[key] = stems
+    while len(_stem_cache) > max(1, settings.stem_cache_size):
+        _stem_cache.popitem(last=False)
+    return stems
 
 
 def separate_stems_segment(
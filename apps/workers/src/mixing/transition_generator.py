@@ -10,18 +10,27 @@ Generates high-quality audio transitions between two tracks using:
 """
 
 from dataclasses import dataclass
-from typing import Dict, List, Tuple, Optional
+from functools import lru_cache
+from typing import Dict, List, Tuple, Optional, Union
 from pathlib import Path
 import os
+import threading
 
 import numpy as np
 import soundfile as sf
 import structlog
 
-from src.utils.audio import load_audio, get_audio_duration
-from src.mixing.stems import separate_stems
+from src.utils.audio import (
+    get_audio_duration,
+    get_audio_num_samples,
+    ensure_wav_format,
+    load_audio_window,
+    moving_average,
+)
+from src.mixing.stems import get_separator, get_track_stems, separate_stems_batch
 from src.mixing.beatmatch import (
-    stretch_to_bpm,
+    source_window_key,
+    stretch_to_bpm_cached,
     find_nearest_beat,
     find_downbeat,
     calculate_stretch_ratio,
@@ -35,6 +44,14 @@ from src.llm.planner import determine_set_position
 
 logger = structlog.get_logger()
 
+# Try to import numba for the compiled crossfade kernels
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    logger.warning("numba not available - using NumPy crossfades")
+
 # Global plan executor instance (lazy initialized)
 _plan_executor: Optional[TransitionPlanExecutor] = None
 
@@ -57,6 +74,9 @@ PHASE_2_BARS = 4   # Build-up: A keeps drums, B adds bass
 PHASE_3_BARS = 4   # Crossover: Swap melodies and vocals
 PHASE_4_BARS = 4   # Resolution: B full, A drums out
 
+# Extra source audio decoded past a window so the stretcher has context at the edge
+WINDOW_PAD_SECONDS = 0.5
+
 
 @dataclass
 class TransitionResult:
@@ -101,22 +121,10 @@ def generate_transition(params: TransitionParams) -> TransitionResult:
         to_bpm=params.to_track_bpm,
     )
 
-    # Step 1: Load audio files
-    audio_a, sr_a = load_audio(params.from_track_path)
-    audio_b, sr_b = load_audio(params.to_track_path)
-
-    # Ensure consistent sample rate
-    if sr_a != SAMPLE_RATE:
-        import librosa
-        audio_a = librosa.resample(audio_a, orig_sr=sr_a, target_sr=SAMPLE_RATE)
-    if sr_b != SAMPLE_RATE:
-        import librosa
-        audio_b = librosa.resample(audio_b, orig_sr=sr_b, target_sr=SAMPLE_RATE)
-
-    # Step 2: Determine target BPM (use track A's BPM as reference)
+    # Step 1: Determine target BPM (use track A's BPM as reference)
     target_bpm = params.from_track_bpm
 
-    # Step 3: Time-stretch track B to match target BPM
+    # Step 2: Resolve the BPM track B is stretched to
     stretch_ratio, within_limits = calculate_stretch_ratio(
         params.to_track_bpm, target_bpm
     )
@@ -129,8 +137,8 @@ def generate_transition(params: TransitionParams) -> TransitionResult:
             ratio=stretch_ratio,
         )
 
-    audio_b_stretched, actual_bpm = stretch_to_bpm(
-        audio_b, SAMPLE_RATE, params.to_track_bpm, target_bpm
+    actual_bpm = params.to_track_bpm * _clamped_stretch_ratio(
+        params.to_track_bpm, target_bpm
     )
 
     # Adjust track B beats for stretched audio
@@ -138,9 +146,9 @@ def generate_transition(params: TransitionParams) -> TransitionResult:
         params.to_track_beats, params.to_track_bpm, actual_bpm
     )
 
-    # Step 4: Calculate transition timing
+    # Step 3: Calculate transition timing
     transition_duration_seconds = _calculate_transition_duration(target_bpm)
-    transition_samples = int(transition_duration_seconds * SAMPLE_RATE)
+    transition_samples = _seconds_to_samples(transition_duration_seconds)
 
     logger.info(
         "Transition timing",
@@ -149,7 +157,7 @@ def generate_transition(params: TransitionParams) -> TransitionResult:
         target_bpm=target_bpm,
     )
 
-    # Step 5: Find cue points on downbeats
+    # Step 4: Find cue points on downbeats
     # Track A: Find downbeat near outro start
     a_cue_time, a_cue_beat_idx = _find_cue_point(
         params.from_track_outro_start,
@@ -166,22 +174,14 @@ def generate_transition(params: TransitionParams) -> TransitionResult:
         'after'
     )
 
-    # Step 6: Extract transition segments
-    # Track A: from cue point to end of transition region
-    a_segment_start = int(a_cue_time * SAMPLE_RATE)
-    a_segment_end = min(
-        a_segment_start + transition_samples,
-        len(audio_a)
+    # Step 5: Decode only the transition windows (A from its cue, B stretched)
+    segment_a = _load_segment(
+        params.from_track_path, a_cue_time, transition_duration_seconds
     )
-    segment_a = audio_a[a_segment_start:a_segment_end]
-
-    # Track B: from start to transition length
-    b_segment_start = int(b_cue_time * SAMPLE_RATE)
-    b_segment_end = min(
-        b_segment_start + transition_samples,
-        len(audio_b_stretched)
+    segment_b = _load_stretched_segment(
+        params.to_track_path, params.to_track_bpm, target_bpm,
+        b_cue_time, transition_duration_seconds
     )
-    segment_b = audio_b_stretched[b_segment_start:b_segment_end]
 
     # Ensure segments are same length
     min_len = min(len(segment_a), len(segment_b))
@@ -195,19 +195,18 @@ def generate_transition(params: TransitionParams) -> TransitionResult:
         min_len=min_len,
     )
 
-    # Step 7: Separate stems
-    logger.info("Separating stems for track A")
-    stems_a = separate_stems(segment_a, SAMPLE_RATE)
-
-    logger.info("Separating stems for track B")
-    stems_b = separate_stems(segment_b, SAMPLE_RATE)
+    # Step 6: Separate stems for both tracks in one batched pass
+    logger.info("Separating stems for tracks A and B")
+    stems_a, stems_b = _separate_transition_stems(
+        params, segment_a, segment_b, a_cue_time, b_cue_time, target_bpm
+    )
 
-    # Step 8: Apply 4-phase transition mixing
+    # Step 7: Apply 4-phase transition mixing
     transition_audio = _apply_four_phase_mixing(
         stems_a, stems_b, min_len, target_bpm
     )
 
-    # Step 9: Normalize output
+    # Step 8: Normalize output
     transition_audio = _normalize_audio(transition_audio)
 
     # Calculate timing info
@@ -238,6 +237,53 @@ def generate_transition(params: TransitionParams) -> TransitionResult:
     return result
 
 
+def _clamped_stretch_ratio(source_bpm: float, target_bpm: float) -> float:
+    """Stretch ratio stretch_to_bpm will actually apply."""
+    ratio, _ = calculate_stretch_ratio(source_bpm, target_bpm)
+    return max(MIN_STRETCH_RATIO, min(MAX_STRETCH_RATIO, ratio))
+
+
+def _seconds_to_samples(seconds: float) -> int:
+    """Sample count (truncated) of a duration or position at SAMPLE_RATE."""
+    return int(seconds * SAMPLE_RATE)
+
+
+def _load_segment(path: str, start_seconds: float, duration_seconds: float) -> np.ndarray:
+    """Decode only [start, start + duration) of a track, mono at SAMPLE_RATE."""
+    audio, _ = load_audio_window(
+        ensure_wav_format(path),
+        max(0.0, start_seconds) * 1000,
+        duration_seconds * 1000,
+        target_sr=SAMPLE_RATE,
+    )
+    return audio[:_seconds_to_samples(duration_seconds)]
+
+
+def _load_stretched_segment(
+    path: str,
+    source_bpm: float,
+    target_bpm: float,
+    start_seconds: float,
+    duration_seconds: float
+) -> np.ndarray:
+    """
+    Decode and stretch a window of track B.
+
+    start_seconds and duration_seconds are in stretched time; only the matching
+    source window (plus a short pad) is decoded and stretched.
+    """
+    ratio = _clamped_stretch_ratio(source_bpm, target_bpm)
+    path = ensure_wav_format(path)
+    source_start = start_seconds * ratio
+    source_duration = (duration_seconds + WINDOW_PAD_SECONDS) * ratio
+    source = _load_segment(path, source_start, source_duration)
+    stretched, _ = stretch_to_bpm_cached(
+        source, SAMPLE_RATE, source_bpm, target_bpm,
+        source_window_key(path, source_start, source_duration)
+    )
+    return stretched[:_seconds_to_samples(duration_seconds)]
+
+
 def _calculate_transition_duration(bpm: float) -> float:
     """Calculate transition duration in seconds based on BPM."""
     beats = TRANSITION_BARS * BEATS_PER_BAR
@@ -245,32 +291,64 @@ def _calculate_transition_duration(bpm: float) -> float:
     return beats * seconds_per_beat
 
 
+def _separate_transition_stems(
+    params: TransitionParams,
+    segment_a: np.ndarray,
+    segment_b: np.ndarray,
+    a_cue_time: float,
+    b_cue_time: float,
+    target_bpm: float
+) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+    """
+    Stems for the (equal-length) transition windows of tracks A and B.
+
+    Windows are cached by track file, cue and length (B also by its stretch).
+    With settings.stem_full_track, track A is not stretched, so its window
+    is sliced from the whole-track stems instead of separated on its own.
+    """
+    length = len(segment_a)
+    key_b = source_window_key(params.to_track_path, b_cue_time, length, params.to_track_bpm, target_bpm)
+
+    if settings.stem_full_track and get_separator().available:
+        track_stems = get_track_stems(ensure_wav_format(params.from_track_path), SAMPLE_RATE)
+        start = int(round(max(0.0, a_cue_time) * SAMPLE_RATE))
+        stems_a = {name: stem[start:start + length] for name, stem in track_stems.items()}
+        stems_b, = separate_stems_batch([segment_b], SAMPLE_RATE, cache_keys=[key_b])
+        return stems_a, stems_b
+
+    stems_a, stems_b = separate_stems_batch(
+        [segment_a, segment_b], SAMPLE_RATE,
+        cache_keys=[source_window_key(params.from_track_path, a_cue_time, length), key_b]
+    )
+    return stems_a, stems_b
+
+
 def _adjust_beats_for_stretch(
     beats: List[float],
     original_bpm: float,
     new_bpm: float
-) -> List[float]:
+) -> np.ndarray:
     """Adjust beat timestamps after time-stretching."""
     ratio = original_bpm / new_bpm
-    return [beat * ratio for beat in beats]
+    return np.asarray(beats, dtype=np.float64) * ratio
 
 
 def _find_cue_point(
     reference_time: float,
-    beats: List[float],
+    beats: Union[List[float], np.ndarray],
     direction: str = 'nearest'
 ) -> Tuple[float, int]:
     """Find a suitable cue point (downbeat) near the reference time."""
-    if not beats:
+    if len(beats) == 0:
         return reference_time, -1
 
-    # Find nearest beat to reference
+    # Find nearest beat to reference (binary search on the sorted grid)
     beat_time, beat_idx = find_nearest_beat(reference_time, beats, direction)
 
     # Find the nearest downbeat
     downbeat_time, downbeat_idx = find_downbeat(beat_idx, beats, BEATS_PER_BAR)
 
-    return downbeat_time, downbeat_idx
+    return float(downbeat_time), downbeat_idx
 
 
 def _apply_four_phase_mixing(
@@ -300,7 +378,7 @@ def _apply_four_phase_mixing(
     """
     # Calculate samples per phase
     seconds_per_beat = 60.0 / bpm
-    samples_per_beat = int(seconds_per_beat * SAMPLE_RATE)
+    samples_per_beat = _seconds_to_samples(seconds_per_beat)
     samples_per_bar = samples_per_beat * BEATS_PER_BAR
 
     phase_samples = [
@@ -318,35 +396,155 @@ def _apply_four_phase_mixing(
 
     # Generate volume curves for each stem in each track
     # Format: curves[track][stem] = array of volumes (0-1)
-    curves_a = _generate_curves_track_a(phase_samples, total_samples)
-    curves_b = _generate_curves_track_b(phase_samples, total_samples)
+    curves_a = _generate_curves_track_a(tuple(phase_samples), total_samples)
+    curves_b = _generate_curves_track_b(tuple(phase_samples), total_samples)
 
-    # Mix stems
-    output = np.zeros(total_samples, dtype=np.float32)
+    return _mix_with_curves(stems_a, stems_b, curves_a, curves_b, total_samples)
+
+
+# Per-thread float32 work buffer, reused across transitions (never returned to callers)
+_scratch = threading.local()
 
-    for stem_name in ['drums', 'bass', 'other', 'vocals']:
-        stem_a = stems_a.get(stem_name, np.zeros(total_samples))
-        stem_b = stems_b.get(stem_name, np.zeros(total_samples))
 
-        # Ensure stems are the right length
-        stem_a = _ensure_length(stem_a, total_samples)
-        stem_b = _ensure_length(stem_b, total_samples)
+def _scratch_buffer(n: int) -> np.ndarray:
+    """Uninitialized float32 work buffer of n samples, reused by the calling thread."""
+    buf = getattr(_scratch, 'buf', None)
+    if buf is None or len(buf) < n:
+        # Round up to a power of two so slightly longer transitions still fit
+        buf = np.empty(1 << max(0, n - 1).bit_length(), dtype=np.float32)
+        _scratch.buf = buf
+    return buf[:n]
 
-        # Apply volume curves
-        curve_a = curves_a[stem_name]
-        curve_b = curves_b[stem_name]
 
-        mixed_stem = stem_a * curve_a + stem_b * curve_b
-        output += mixed_stem
+def _mix_with_curves(
+    stems_a: Dict[str, np.ndarray],
+    stems_b: Dict[str, np.ndarray],
+    curves_a: Dict[str, np.ndarray],
+    curves_b: Dict[str, np.ndarray],
+    total_samples: int
+) -> np.ndarray:
+    """
+    Sum every stem of both tracks weighted by its volume curve.
+
+    Each product is written into the thread's scratch buffer and accumulated
+    in place, so no per-stem temporaries are allocated. Missing stems are
+    skipped rather than multiplied as zeros, and short ones are not padded.
+    """
+    output = np.zeros(total_samples, dtype=np.float32)
+    scratch = _scratch_buffer(total_samples)
+
+    # Whole-stem passes on purpose: output and scratch (~5 MB for a 30 s
+    # transition) stay cache-resident while each stem/curve pair streams
+    # through once. Tiling the eight stems into L2-sized blocks only added
+    # per-tile Python overhead, and a fused 16-stream kernel was slower still.
+    for stems, curves in ((stems_a, curves_a), (stems_b, curves_b)):
+        for stem_name in ['drums', 'bass', 'other', 'vocals']:
+            stem = stems.get(stem_name)
+            if stem is None:
+                continue
+
+            # A short stem only contributes over its own length (the rest
+            # would be zero padding), a long one is cut to the transition
+            n = min(len(stem), total_samples)
+            np.multiply(stem[:n], curves[stem_name][:n], out=scratch[:n])
+            output[:n] += scratch[:n]
 
     return output
 
 
+@lru_cache(maxsize=8)
+def _unit_ramp(n: int) -> np.ndarray:
+    """Read-only float32 ramp from 0 to 1 over n samples, shared by equal-length phases."""
+    ramp = np.arange(n, dtype=np.float32)
+    if n > 1:
+        ramp /= np.float32(n - 1)
+    ramp.setflags(write=False)
+    return ramp
+
+
+@lru_cache(maxsize=8)
+def _equal_power_fades(n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Read-only float32 (cos, sin) fades over n samples, shared by equal-length crossfades."""
+    angle = _unit_ramp(n) * np.float32(np.pi / 2)
+    fade_out = np.cos(angle)
+    fade_in = np.sin(angle, out=angle)
+    fade_out.setflags(write=False)
+    fade_in.setflags(write=False)
+    return fade_out, fade_in
+
+
+def _ramp(curve: np.ndarray, start: float, stop: float) -> None:
+    """Fill a curve region with a linear ramp from start to stop, in place."""
+    if len(curve):
+        np.multiply(_unit_ramp(len(curve)), np.float32(stop - start), out=curve)
+        curve += np.float32(start)
+
+
+# The crossfade kernels stay in float32: numba has no CPU float16 arithmetic,
+# and converting the segments to float16 alone costs ~17x the fused pass.
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True, fastmath=True, boundscheck=False)
+    def _linear_crossfade_kernel(a, b, out):
+        """Linear crossfade from a to b in one pass: each sample read and written once."""
+        n = out.shape[0]
+        step = np.float32(1.0) / np.float32(max(n - 1, 1))
+        for i in prange(n):
+            t = np.float32(i) * step
+            out[i] = a[i] + (b[i] - a[i]) * t
+
+    @njit(parallel=True, cache=True, fastmath=True, boundscheck=False)
+    def _equal_power_crossfade_kernel(a, b, fade_out, fade_in, out):
+        """Equal-power crossfade from a to b in one pass over precomputed fades."""
+        for i in prange(out.shape[0]):
+            out[i] = a[i] * fade_out[i] + b[i] * fade_in[i]
+
+
+def _linear_crossfade(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Crossfade two equal-length mono segments linearly, into one new buffer."""
+    out = np.empty(len(a), dtype=np.float32)
+    if NUMBA_AVAILABLE:
+        _linear_crossfade_kernel(a, b, out)
+    else:
+        # a + (b - a) * t, computed in place in the output
+        np.subtract(b, a, out=out)
+        out *= _unit_ramp(len(out))
+        out += a
+    return out
+
+
+def _equal_power_crossfade(a: np.ndarray, b: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Crossfade two equal-length mono segments with cos/sin fades, into out (or a new buffer)."""
+    if out is None:
+        out = np.empty(len(a), dtype=np.float32)
+    fade_out, fade_in = _equal_power_fades(len(out))
+    if NUMBA_AVAILABLE:
+        _equal_power_crossfade_kernel(a, b, fade_out, fade_in, out)
+    else:
+        scratch = _scratch_buffer(len(out))
+        np.multiply(a, fade_out, out=out)
+        np.multiply(b, fade_in, out=scratch)
+        out += scratch
+    return out
+
+
+def _freeze_curves(curves: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Mark cached curves read-only so no caller can modify the shared arrays."""
+    for curve in curves.values():
+        curve.setflags(write=False)
+    return curves
+
+
+@lru_cache(maxsize=32)
 def _generate_curves_track_a(
-    phase_samples: List[int],
+    phase_samples: Tuple[int, int, int, int],
     total_samples: int
 ) -> Dict[str, np.ndarray]:
-    """Generate volume curves for track A (outgoing)."""
+    """
+    Generate volume curves for track A (outgoing).
+
+    The curves only depend on the phase layout, so they are cached and
+    shared as read-only float32 arrays.
+    """
     curves = {}
 
     p1, p2, p3, p4 = phase_samples
@@ -355,38 +553,43 @@ def _generate_curves_track_a(
     p3_end = p2_end + p3
 
     # Drums: 100% → 100% → 100→50% → 50→0%
-    drums = np.ones(total_samples)
-    drums[p2_end:p3_end] = np.linspace(1.0, 0.5, p3)
-    drums[p3_end:] = np.linspace(0.5, 0.0, total_samples - p3_end)
+    drums = np.empty(total_samples, dtype=np.float32)
+    drums[:p2_end] = 1.0
+    _ramp(drums[p2_end:p3_end], 1.0, 0.5)
+    _ramp(drums[p3_end:], 0.5, 0.0)
     curves['drums'] = drums
 
     # Bass: 100% → 100→50% → 50→0% → 0%
-    bass = np.ones(total_samples)
-    bass[p1_end:p2_end] = np.linspace(1.0, 0.5, p2)
-    bass[p2_end:p3_end] = np.linspace(0.5, 0.0, p3)
+    bass = np.empty(total_samples, dtype=np.float32)
+    bass[:p1_end] = 1.0
+    _ramp(bass[p1_end:p2_end], 1.0, 0.5)
+    _ramp(bass[p2_end:p3_end], 0.5, 0.0)
     bass[p3_end:] = 0.0
     curves['bass'] = bass
 
     # Other: 100% → 100→0% → 0% → 0%
-    other = np.ones(total_samples)
-    other[p1_end:p2_end] = np.linspace(1.0, 0.0, p2)
+    other = np.empty(total_samples, dtype=np.float32)
+    other[:p1_end] = 1.0
+    _ramp(other[p1_end:p2_end], 1.0, 0.0)
     other[p2_end:] = 0.0
     curves['other'] = other
 
-    # Vocals: 100% → 100→0% → 0% → 0%
-    vocals = np.ones(total_samples)
-    vocals[p1_end:p2_end] = np.linspace(1.0, 0.0, p2)
-    vocals[p2_end:] = 0.0
-    curves['vocals'] = vocals
+    # Vocals: 100% → 100→0% → 0% → 0% (same curve as other, shared)
+    curves['vocals'] = other
 
-    return curves
+    return _freeze_curves(curves)
 
 
+@lru_cache(maxsize=32)
 def _generate_curves_track_b(
-    phase_samples: List[int],
+    phase_samples: Tuple[int, int, int, int],
     total_samples: int
 ) -> Dict[str, np.ndarray]:
-    """Generate volume curves for track B (incoming)."""
+    """
+    Generate volume curves for track B (incoming).
+
+    Cached and shared as read-only float32 arrays, like track A's.
+    """
     curves = {}
 
     p1, p2, p3, p4 = phase_samples
@@ -395,48 +598,40 @@ def _generate_curves_track_b(
     p3_end = p2_end + p3
 
     # Drums: 0→50% → 50→100% → 100% → 100%
-    drums = np.zeros(total_samples)
-    drums[:p1_end] = np.linspace(0.0, 0.5, p1)
-    drums[p1_end:p2_end] = np.linspace(0.5, 1.0, p2)
+    drums = np.empty(total_samples, dtype=np.float32)
+    _ramp(drums[:p1_end], 0.0, 0.5)
+    _ramp(drums[p1_end:p2_end], 0.5, 1.0)
     drums[p2_end:] = 1.0
     curves['drums'] = drums
 
     # Bass: 0% → 0→50% → 50→100% → 100%
-    bass = np.zeros(total_samples)
-    bass[p1_end:p2_end] = np.linspace(0.0, 0.5, p2)
-    bass[p2_end:p3_end] = np.linspace(0.5, 1.0, p3)
+    bass = np.empty(total_samples, dtype=np.float32)
+    bass[:p1_end] = 0.0
+    _ramp(bass[p1_end:p2_end], 0.0, 0.5)
+    _ramp(bass[p2_end:p3_end], 0.5, 1.0)
     bass[p3_end:] = 1.0
     curves['bass'] = bass
 
     # Other: 0% → 0% → 0→100% → 100%
-    other = np.zeros(total_samples)
-    other[p2_end:p3_end] = np.linspace(0.0, 1.0, p3)
+    other = np.empty(total_samples, dtype=np.float32)
+    other[:p2_end] = 0.0
+    _ramp(other[p2_end:p3_end], 0.0, 1.0)
     other[p3_end:] = 1.0
     curves['other'] = other
 
-    # Vocals: 0% → 0% → 0→100% → 100%
-    vocals = np.zeros(total_samples)
-    vocals[p2_end:p3_end] = np.linspace(0.0, 1.0, p3)
-    vocals[p3_end:] = 1.0
-    curves['vocals'] = vocals
-
-    return curves
+    # Vocals: 0% → 0% → 0→100% → 100% (same curve as other, shared)
+    curves['vocals'] = other
 
-
-def _ensure_length(audio: np.ndarray, target_length: int) -> np.ndarray:
-    """Ensure audio array is exactly the target length."""
-    if len(audio) >= target_length:
-        return audio[:target_length]
-    else:
-        # Pad with zeros
-        padding = np.zeros(target_length - len(audio), dtype=audio.dtype)
-        return np.concatenate([audio, padding])
+    return _freeze_curves(curves)
 
 
 def _normalize_audio(audio: np.ndarray, target_db: float = -3.0) -> np.ndarray:
-    """Normalize audio to target dB level."""
-    # Calculate current RMS
-    rms = np.sqrt(np.mean(audio ** 2))
+    """Normalize audio to target dB level (float audio is scaled in place)."""
+    if audio.size == 0:
+        return audio
+
+    # Calculate current RMS and peak, without squared or absolute temporaries
+    rms = np.sqrt(np.vdot(audio, audio) / audio.size)
 
     if rms == 0:
         return audio
@@ -444,16 +639,14 @@ def _normalize_audio(audio: np.ndarray, target_db: float = -3.0) -> np.ndarray:
     # Calculate target RMS from dB
     target_rms = 10 ** (target_db / 20)
 
-    # Scale audio
-    scale = target_rms / rms
-    normalized = audio * scale
+    # Scale to the target RMS, but never past a 0.99 peak (prevents clipping)
+    peak = max(audio.max(), -audio.min())
+    scale = min(target_rms / rms, 0.99 / peak)
 
-    # Prevent clipping
-    max_val = np.max(np.abs(normalized))
-    if max_val > 0.99:
-        normalized = normalized * (0.99 / max_val)
-
-    return normalized
+    if audio.dtype.kind == 'f' and audio.flags.writeable:
+        np.multiply(audio, audio.dtype.type(scale), out=audio)
+        return audio
+    return audio * scale
 
 
 def _save_audio(audio: np.ndarray, sample_rate: int, path: str) -> None:
@@ -624,24 +817,12 @@ def generate_transition_with_plan(params: TransitionParams, plan: dict) -> Trans
         duration_bars=plan.get("transition", {}).get("duration_bars"),
     )
 
-    # Step 1: Load audio files
-    audio_a, sr_a = load_audio(params.from_track_path)
-    audio_b, sr_b = load_audio(params.to_track_path)
-
-    # Ensure consistent sample rate
-    if sr_a != SAMPLE_RATE:
-        import librosa
-        audio_a = librosa.resample(audio_a, orig_sr=sr_a, target_sr=SAMPLE_RATE)
-    if sr_b != SAMPLE_RATE:
-        import librosa
-        audio_b = librosa.resample(audio_b, orig_sr=sr_b, target_sr=SAMPLE_RATE)
-
-    # Step 2: Determine target BPM
+    # Step 1: Determine target BPM
     target_bpm = params.from_track_bpm
 
-    # Step 3: Time-stretch track B to match target BPM
-    audio_b_stretched, actual_bpm = stretch_to_bpm(
-        audio_b, SAMPLE_RATE, params.to_track_bpm, target_bpm
+    # Step 2: Resolve the BPM track B is stretched to
+    actual_bpm = params.to_track_bpm * _clamped_stretch_ratio(
+        params.to_track_bpm, target_bpm
     )
 
     # Adjust track B beats for stretched audio
@@ -649,11 +830,10 @@ def generate_transition_with_plan(params: TransitionParams, plan: dict) -> Trans
         params.to_track_beats, params.to_track_bpm, actual_bpm
     )
 
-    # Step 4: Get transition timing from plan
+    # Step 3: Get transition timing from plan
     transition_config = plan.get("transition", {})
     duration_bars = transition_config.get("duration_bars", TRANSITION_BARS)
     transition_duration_seconds = duration_bars * BEATS_PER_BAR * (60.0 / target_bpm)
-    transition_samples = int(transition_duration_seconds * SAMPLE_RATE)
 
     # Use plan's start time if available, otherwise use outro_start
     start_time_in_a = transition_config.get("start_time_in_a", params.from_track_outro_start)
@@ -665,7 +845,7 @@ def generate_transition_with_plan(params: TransitionParams, plan: dict) -> Trans
         start_time=start_time_in_a,
     )
 
-    # Step 5: Find cue points on downbeats
+    # Step 4: Find cue points on downbeats
     a_cue_time, a_cue_beat_idx = _find_cue_point(
         start_time_in_a,
         params.from_track_beats,
@@ -678,28 +858,27 @@ def generate_transition_with_plan(params: TransitionParams, plan: dict) -> Trans
         'after'
     )
 
-    # Step 6: Extract transition segments
-    a_segment_start = int(a_cue_time * SAMPLE_RATE)
-    a_segment_end = min(a_segment_start + transition_samples, len(audio_a))
-    segment_a = audio_a[a_segment_start:a_segment_end]
-
-    b_segment_start = int(b_cue_time * SAMPLE_RATE)
-    b_segment_end = min(b_segment_start + transition_samples, len(audio_b_stretched))
-    segment_b = audio_b_stretched[b_segment_start:b_segment_end]
+    # Step 5: Decode only the transition windows (A from its cue, B stretched)
+    segment_a = _load_segment(
+        params.from_track_path, a_cue_time, transition_duration_seconds
+    )
+    segment_b = _load_stretched_segment(
+        params.to_track_path, params.to_track_bpm, target_bpm,
+        b_cue_time, transition_duration_seconds
+    )
 
     # Ensure segments are same length
     min_len = min(len(segment_a), len(segment_b))
     segment_a = segment_a[:min_len]
     segment_b = segment_b[:min_len]
 
-    # Step 7: Separate stems
-    logger.info("Separating stems for track A (LLM plan)")
-    stems_a = separate_stems(segment_a, SAMPLE_RATE)
-
-    logger.info("Separating stems for track B (LLM plan)")
-    stems_b = separate_stems(segment_b, SAMPLE_RATE)
+    # Step 6: Separate stems for both tracks in one batched pass
+    logger.info("Separating stems for tracks A and B (LLM plan)")
+    stems_a, stems_b = _separate_transition_stems(
+        params, segment_a, segment_b, a_cue_time, b_cue_time, target_bpm
+    )
 
-    # Step 8: Apply LLM-planned phase mixing
+    # Step 7: Apply LLM-planned phase mixing
     stems_config = transition_config.get("stems", {})
     if stems_config and stems_config.get("phases"):
         transition_audio = _apply_llm_phase_mixing(
@@ -711,7 +890,7 @@ def generate_transition_with_plan(params: TransitionParams, plan: dict) -> Trans
             stems_a, stems_b, min_len, target_bpm
         )
 
-    # Step 9: Normalize output
+    # Step 8: Normalize output
     transition_audio = _normalize_audio(transition_audio)
 
     # Calculate timing info
@@ -768,14 +947,17 @@ def _apply_llm_phase_mixing(
 
     # Calculate samples per bar
     seconds_per_beat = 60.0 / bpm
-    samples_per_bar = int(seconds_per_beat * BEATS_PER_BAR * SAMPLE_RATE)
+    samples_per_bar = _seconds_to_samples(seconds_per_beat * BEATS_PER_BAR)
 
     # Get total bars from phases
     total_bars = max(phase.get("bars", [1, 1])[1] for phase in phases)
 
-    # Generate volume curves for each stem based on phases
-    curves_a = {stem: np.zeros(total_samples) for stem in ['drums', 'bass', 'other', 'vocals']}
-    curves_b = {stem: np.zeros(total_samples) for stem in ['drums', 'bass', 'other', 'vocals']}
+    # Generate volume curves for each stem based on phases, as rows of one
+    # matrix so all eight are smoothed together
+    stem_names = ['drums', 'bass', 'other', 'vocals']
+    curve_matrix = np.zeros((2 * len(stem_names), total_samples), dtype=np.float32)
+    curves_a = dict(zip(stem_names, curve_matrix[:len(stem_names)]))
+    curves_b = dict(zip(stem_names, curve_matrix[len(stem_names):]))
 
     for phase in phases:
         bars = phase.get("bars", [1, 1])
@@ -801,37 +983,19 @@ def _apply_llm_phase_mixing(
             curves_b[stem][start_sample:end_sample] = b_level
 
     # Apply smoothing to avoid clicks
-    for stem in ['drums', 'bass', 'other', 'vocals']:
-        curves_a[stem] = _smooth_curve(curves_a[stem], samples_per_bar // 4)
-        curves_b[stem] = _smooth_curve(curves_b[stem], samples_per_bar // 4)
-
-    # Mix stems
-    output = np.zeros(total_samples, dtype=np.float32)
-
-    for stem_name in ['drums', 'bass', 'other', 'vocals']:
-        stem_a = stems_a.get(stem_name, np.zeros(total_samples))
-        stem_b = stems_b.get(stem_name, np.zeros(total_samples))
-
-        # Ensure stems are the right length
-        stem_a = _ensure_length(stem_a, total_samples)
-        stem_b = _ensure_length(stem_b, total_samples)
+    curve_matrix = _smooth_curve(curve_matrix, samples_per_bar // 4)
+    curves_a = dict(zip(stem_names, curve_matrix[:len(stem_names)]))
+    curves_b = dict(zip(stem_names, curve_matrix[len(stem_names):]))
 
-        # Apply volume curves
-        mixed_stem = stem_a * curves_a[stem_name] + stem_b * curves_b[stem_name]
-        output += mixed_stem
-
-    return output
+    return _mix_with_curves(stems_a, stems_b, curves_a, curves_b, total_samples)
 
 
 def _smooth_curve(curve: np.ndarray, window_size: int) -> np.ndarray:
-    """Apply smoothing to a volume curve to avoid clicks."""
+    """Apply smoothing to volume curves (along the last axis) to avoid clicks."""
     if window_size <= 1:
         return curve
 
-    # Simple moving average smoothing
-    kernel = np.ones(window_size) / window_size
-    smoothed = np.convolve(curve, kernel, mode='same')
-    return smoothed.astype(np.float32)
+    return moving_average(curve, window_size)
 
 
 def generate_hard_cut_transition(params: TransitionParams, plan: dict) -> TransitionResult:
@@ -847,17 +1011,6 @@ def generate_hard_cut_transition(params: TransitionParams, plan: dict) -> Transi
     """
     logger.info("Generating hard cut transition")
 
-    # Load audio files
-    audio_a, sr_a = load_audio(params.from_track_path)
-    audio_b, sr_b = load_audio(params.to_track_path)
-
-    if sr_a != SAMPLE_RATE:
-        import librosa
-        audio_a = librosa.resample(audio_a, orig_sr=sr_a, target_sr=SAMPLE_RATE)
-    if sr_b != SAMPLE_RATE:
-        import librosa
-        audio_b = librosa.resample(audio_b, orig_sr=sr_b, target_sr=SAMPLE_RATE)
-
     # Get cut point from plan
     track_a_config = plan.get("track_a", {})
     cut_time = track_a_config.get("play_until_seconds", params.from_track_outro_start)
@@ -870,25 +1023,25 @@ def generate_hard_cut_transition(params: TransitionParams, plan: dict) -> Transi
     effects = plan.get("transition", {}).get("effects", {})
     a_exit_effect = effects.get("track_a_exit", {})
 
-    cut_sample = int(cut_time * SAMPLE_RATE)
-
     # Create short crossfade (about 50ms) to avoid click
-    crossfade_samples = int(0.05 * SAMPLE_RATE)
+    crossfade_samples = _seconds_to_samples(0.05)
 
-    # Extract end of track A
-    segment_a_end = audio_a[max(0, cut_sample - crossfade_samples):cut_sample]
+    # Extract end of track A (decode only the crossfade window)
+    a_start_time = max(0.0, cut_time - crossfade_samples / SAMPLE_RATE)
+    segment_a_end = _load_segment(
+        params.from_track_path, a_start_time, cut_time - a_start_time
+    )
 
-    # Apply fade out to track A
-    fade_out = np.linspace(1.0, 0.0, len(segment_a_end))
-    segment_a_end = segment_a_end * fade_out
+    # Apply an equal-power fade out to track A (no level dip mid-crossfade)
+    segment_a_end *= _equal_power_fades(len(segment_a_end))[0]
 
     # Extract start of track B
-    entry_sample = int(entry_time * SAMPLE_RATE)
-    segment_b_start = audio_b[entry_sample:entry_sample + crossfade_samples]
+    segment_b_start = _load_segment(
+        params.to_track_path, entry_time, crossfade_samples / SAMPLE_RATE
+    )
 
-    # Apply fade in to track B
-    fade_in = np.linspace(0.0, 1.0, len(segment_b_start))
-    segment_b_start = segment_b_start * fade_in
+    # Apply the matching equal-power fade in to track B
+    segment_b_start *= _equal_power_fades(len(segment_b_start))[1]
 
     # Combine with crossfade
     min_len = min(len(segment_a_end), len(segment_b_start))
@@ -925,54 +1078,36 @@ def generate_crossfade_transition(params: TransitionParams, plan: dict) -> Trans
     """
     logger.info("Generating crossfade transition")
 
-    # Load audio files
-    audio_a, sr_a = load_audio(params.from_track_path)
-    audio_b, sr_b = load_audio(params.to_track_path)
-
-    if sr_a != SAMPLE_RATE:
-        import librosa
-        audio_a = librosa.resample(audio_a, orig_sr=sr_a, target_sr=SAMPLE_RATE)
-    if sr_b != SAMPLE_RATE:
-        import librosa
-        audio_b = librosa.resample(audio_b, orig_sr=sr_b, target_sr=SAMPLE_RATE)
-
     # Get transition parameters from plan
     transition_config = plan.get("transition", {})
     duration_bars = transition_config.get("duration_bars", 8)
     target_bpm = params.from_track_bpm
 
-    # Time-stretch track B if needed
-    audio_b_stretched, actual_bpm = stretch_to_bpm(
-        audio_b, SAMPLE_RATE, params.to_track_bpm, target_bpm
-    )
-
     # Calculate transition duration
     transition_duration_seconds = duration_bars * BEATS_PER_BAR * (60.0 / target_bpm)
-    transition_samples = int(transition_duration_seconds * SAMPLE_RATE)
 
     # Get start time from plan
     start_time = transition_config.get("start_time_in_a", params.from_track_outro_start)
-    start_sample = int(start_time * SAMPLE_RATE)
 
     # Get track B entry time
     b_entry = plan.get("track_b", {}).get("start_from_seconds", 0)
-    b_entry_sample = int(b_entry * SAMPLE_RATE)
 
-    # Extract segments
-    segment_a = audio_a[start_sample:start_sample + transition_samples]
-    segment_b = audio_b_stretched[b_entry_sample:b_entry_sample + transition_samples]
+    # Decode only the transition windows (track B time-stretched if needed)
+    segment_a = _load_segment(
+        params.from_track_path, start_time, transition_duration_seconds
+    )
+    segment_b = _load_stretched_segment(
+        params.to_track_path, params.to_track_bpm, target_bpm,
+        b_entry, transition_duration_seconds
+    )
 
     # Ensure same length
     min_len = min(len(segment_a), len(segment_b))
     segment_a = segment_a[:min_len]
     segment_b = segment_b[:min_len]
 
-    # Create crossfade curves
-    fade_out = np.linspace(1.0, 0.0, min_len).astype(np.float32)
-    fade_in = np.linspace(0.0, 1.0, min_len).astype(np.float32)
-
-    # Apply crossfade
-    transition_audio = segment_a * fade_out + segment_b * fade_in
+    # Apply crossfade (linear, fused into one pass)
+    transition_audio = _linear_crossfade(segment_a, segment_b)
 
     # Normalize
     transition_audio = _normalize_audio(transition_audio)
@@ -1003,46 +1138,32 @@ def generate_filter_sweep_transition(params: TransitionParams, plan: dict) -> Tr
     Returns:
         TransitionResult
     """
-    from src.mixing.effects.filters import create_filter_sweep
+    from src.mixing.effects.filters import filter_sweep_crossfade
 
     logger.info("Generating filter sweep transition")
 
-    # Load audio files
-    audio_a, sr_a = load_audio(params.from_track_path)
-    audio_b, sr_b = load_audio(params.to_track_path)
-
-    if sr_a != SAMPLE_RATE:
-        import librosa
-        audio_a = librosa.resample(audio_a, orig_sr=sr_a, target_sr=SAMPLE_RATE)
-    if sr_b != SAMPLE_RATE:
-        import librosa
-        audio_b = librosa.resample(audio_b, orig_sr=sr_b, target_sr=SAMPLE_RATE)
-
     # Get transition parameters from plan
     transition_config = plan.get("transition", {})
     duration_bars = transition_config.get("duration_bars", 8)
     target_bpm = params.from_track_bpm
 
-    # Time-stretch track B if needed
-    audio_b_stretched, actual_bpm = stretch_to_bpm(
-        audio_b, SAMPLE_RATE, params.to_track_bpm, target_bpm
-    )
-
     # Calculate transition duration
     transition_duration_seconds = duration_bars * BEATS_PER_BAR * (60.0 / target_bpm)
-    transition_samples = int(transition_duration_seconds * SAMPLE_RATE)
 
     # Get start time from plan
     start_time = transition_config.get("start_time_in_a", params.from_track_outro_start)
-    start_sample = int(start_time * SAMPLE_RATE)
 
     # Get track B entry time
     b_entry = plan.get("track_b", {}).get("start_from_seconds", 0)
-    b_entry_sample = int(b_entry * SAMPLE_RATE)
 
-    # Extract segments
-    segment_a = audio_a[start_sample:start_sample + transition_samples]
-    segment_b = audio_b_stretched[b_entry_sample:b_entry_sample + transition_samples]
+    # Decode only the transition windows (track B time-stretched if needed)
+    segment_a = _load_segment(
+        params.from_track_path, start_time, transition_duration_seconds
+    )
+    segment_b = _load_stretched_segment(
+        params.to_track_path, params.to_track_bpm, target_bpm,
+        b_entry, transition_duration_seconds
+    )
 
     # Ensure same length
     min_len = min(len(segment_a), len(segment_b))
@@ -1054,38 +1175,19 @@ def generate_filter_sweep_transition(params: TransitionParams, plan: dict) -> Tr
     effect_a = effects_config.get("track_a", {})
     effect_b = effects_config.get("track_b", {})
 
-    # Apply HPF sweep to track A (removes low frequencies)
-    hpf_start = effect_a.get("params", {}).get("start_freq", 20)
-    hpf_end = effect_a.get("params", {}).get("end_freq", 2000)
-    segment_a_filtered = create_filter_sweep(
-        audio=segment_a,
-        filter_type="hpf",
-        start_freq=hpf_start,
-        end_freq=hpf_end,
-        duration=transition_duration_seconds,
-        sr=SAMPLE_RATE
-    )
-
-    # Apply LPF sweep to track B (opens up frequencies)
-    lpf_start = effect_b.get("params", {}).get("start_freq", 500)
-    lpf_end = effect_b.get("params", {}).get("end_freq", 20000)
-    segment_b_filtered = create_filter_sweep(
-        audio=segment_b,
-        filter_type="lpf",
-        start_freq=lpf_start,
-        end_freq=lpf_end,
+    # HPF sweep on track A (removes low frequencies), LPF sweep on track B
+    # (opens up frequencies) and the equal-power crossfade, in one pass
+    transition_audio = filter_sweep_crossfade(
+        segment_a,
+        segment_b,
+        hpf_start=effect_a.get("params", {}).get("start_freq", 20),
+        hpf_end=effect_a.get("params", {}).get("end_freq", 2000),
+        lpf_start=effect_b.get("params", {}).get("start_freq", 500),
+        lpf_end=effect_b.get("params", {}).get("end_freq", 20000),
         duration=transition_duration_seconds,
         sr=SAMPLE_RATE
     )
 
-    # Create crossfade curves (equal power)
-    t = np.linspace(0, np.pi / 2, min_len)
-    fade_out = np.cos(t).astype(np.float32)
-    fade_in = np.sin(t).astype(np.float32)
-
-    # Apply crossfade
-    transition_audio = segment_a_filtered * fade_out + segment_b_filtered * fade_in
-
     # Normalize
     transition_audio = _normalize_audio(transition_audio)
 
@@ -1120,46 +1222,31 @@ def generate_echo_out_transition(params: TransitionParams, plan: dict) -> Transi
 
     logger.info("Generating echo out transition")
 
-    # Load audio files
-    audio_a, sr_a = load_audio(params.from_track_path)
-    audio_b, sr_b = load_audio(params.to_track_path)
-
-    if sr_a != SAMPLE_RATE:
-        import librosa
-        audio_a = librosa.resample(audio_a, orig_sr=sr_a, target_sr=SAMPLE_RATE)
-    if sr_b != SAMPLE_RATE:
-        import librosa
-        audio_b = librosa.resample(audio_b, orig_sr=sr_b, target_sr=SAMPLE_RATE)
-
     # Get transition parameters from plan
     transition_config = plan.get("transition", {})
     duration_bars = transition_config.get("duration_bars", 4)
     target_bpm = params.from_track_bpm
 
-    # Time-stretch track B if needed
-    audio_b_stretched, actual_bpm = stretch_to_bpm(
-        audio_b, SAMPLE_RATE, params.to_track_bpm, target_bpm
-    )
-
     # Calculate echo duration
     echo_duration_seconds = duration_bars * BEATS_PER_BAR * (60.0 / target_bpm)
-    echo_samples = int(echo_duration_seconds * SAMPLE_RATE)
+    echo_samples = _seconds_to_samples(echo_duration_seconds)
 
     # Get echo start time from plan
     echo_start_time = transition_config.get("start_time_in_a", params.from_track_outro_start)
-    echo_start_sample = int(echo_start_time * SAMPLE_RATE)
+    echo_start_sample = _seconds_to_samples(echo_start_time)
 
     # Get track B entry time
     b_entry = plan.get("track_b", {}).get("start_from_seconds", 0)
-    b_entry_sample = int(b_entry * SAMPLE_RATE)
 
     # Get effect type from plan
     effects_config = transition_config.get("effects", {})
     effect_a = effects_config.get("track_a", {})
     effect_type = effect_a.get("type", "delay")
 
-    # Create segment A with echo tail
-    segment_a_with_tail = audio_a[:echo_start_sample + echo_samples].copy()
+    # Create segment A with echo tail: decode A only up to the end of the echo
+    segment_a_with_tail = _load_segment(
+        params.from_track_path, 0.0, (echo_start_sample + echo_samples) / SAMPLE_RATE
+    )
 
     if effect_type == "reverb":
         # Apply reverb tail
@@ -1188,43 +1275,44 @@ def generate_echo_out_transition(params: TransitionParams, plan: dict) -> Transi
         )
 
     # Determine overlap point (B enters during the tail)
-    b_entry_in_transition = int(echo_duration_seconds * 0.5 * SAMPLE_RATE)  # Enter halfway through tail
-
-    # Extract B segment
-    segment_b = audio_b_stretched[b_entry_sample:]
+    b_entry_in_transition = _seconds_to_samples(echo_duration_seconds * 0.5)  # Enter halfway through tail
+
+    # Extract B segment: the rest of B from its entry, in stretched time.
+    # Only that part of the source is decoded and stretched.
+    to_track_path = ensure_wav_format(params.to_track_path)
+    b_source_seconds = get_audio_num_samples(to_track_path, SAMPLE_RATE) / SAMPLE_RATE
+    b_ratio = _clamped_stretch_ratio(params.to_track_bpm, target_bpm)
+    segment_b = _load_stretched_segment(
+        to_track_path, params.to_track_bpm, target_bpm,
+        b_entry, max(0.0, b_source_seconds / b_ratio - b_entry)
+    )
 
     # Build the output
-    tail_length = len(segment_a_with_tail) - echo_start_sample
     overlap_start = echo_start_sample + b_entry_in_transition
 
-    # Create output buffer
+    # Every sample of the output is written exactly once: A (with tail) up
+    # to B's entry, an equal-power crossfade over the overlap, then B
     output_length = overlap_start + len(segment_b)
-    output = np.zeros(output_length, dtype=np.float32)
+    output = np.empty(output_length, dtype=np.float32)
 
-    # Place A with tail
-    output[:len(segment_a_with_tail)] = segment_a_with_tail
+    head = min(len(segment_a_with_tail), overlap_start)
+    output[:head] = segment_a_with_tail[:head]
 
-    # Add B with crossfade in the overlap region
+    # Short crossfade where B enters during the tail
     overlap_length = len(segment_a_with_tail) - overlap_start
-    if overlap_length > 0:
-        # Create short crossfade for overlap
-        crossfade_samples = min(overlap_length, int(1.0 * SAMPLE_RATE))
-        fade_out = np.linspace(1.0, 0.0, crossfade_samples)
-        fade_in = np.linspace(0.0, 1.0, crossfade_samples)
-
-        # Apply crossfade to tail
-        output[overlap_start:overlap_start + crossfade_samples] *= fade_out
-
-        # Add B
-        b_to_add = segment_b[:crossfade_samples]
-        output[overlap_start:overlap_start + len(b_to_add)] += b_to_add * fade_in
-
-        # Add rest of B
-        if len(segment_b) > crossfade_samples:
-            output[overlap_start + crossfade_samples:overlap_start + len(segment_b)] = segment_b[crossfade_samples:]
+    crossfade_samples = max(0, min(overlap_length, _seconds_to_samples(1.0), len(segment_b)))
+    if crossfade_samples > 0:
+        _equal_power_crossfade(
+            segment_a_with_tail[overlap_start:overlap_start + crossfade_samples],
+            segment_b[:crossfade_samples],
+            out=output[overlap_start:overlap_start + crossfade_samples],
+        )
     else:
-        # No overlap, just concatenate
-        output[overlap_start:overlap_start + len(segment_b)] = segment_b
+        # No overlap: silence until B enters
+        output[head:overlap_start] = 0.0
+
+    # Rest of B
+    output[overlap_start + crossfade_samples:] = segment_b[crossfade_samples:]
 
     # Normalize
     output = _normalize_audio(output)
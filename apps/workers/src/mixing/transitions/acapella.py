@@ -16,10 +16,14 @@ TECHNIQUE:
 5. Mix levels so vocal is audible but integrated
 """
 
+import librosa
 import numpy as np
 from typing import Dict, Optional, Tuple
 import structlog
 
+from ...theory.camelot import CAMELOT_WHEEL, get_camelot_from_key
+from ...utils.audio import resample_audio
+
 logger = structlog.get_logger()
 
 # Try to import pyrubberband for high-quality time-stretching
@@ -165,15 +169,12 @@ def time_stretch_vocal(
         except Exception as e:
             logger.warning(f"pyrubberband stretch failed: {e}")
 
-    # Fallback: simple resampling (lower quality)
-    import librosa
+    # Fallback: simple resampling (lower quality). Only the ratio of the two
+    # "rates" matters, so the lengths give exactly target_length samples
     target_length = int(len(audio) / ratio)
-    stretched = librosa.resample(
-        audio,
-        orig_sr=len(audio),
-        target_sr=target_length
-    )
-    return stretched
+    if target_length == 0:
+        return audio[:0]
+    return resample_audio(audio, orig_sr=len(audio), target_sr=target_length)
 
 
 def pitch_shift_vocal(
@@ -203,11 +204,42 @@ def pitch_shift_vocal(
             logger.warning(f"pyrubberband pitch shift failed: {e}")
 
     # Fallback: FFT-based pitch shift (lower quality)
-    import librosa
     shifted = librosa.effects.pitch_shift(audio, sr=sr, n_steps=semitones)
     return shifted
 
 
+def _camelot_pitch_shift(source_camelot: str, target_camelot: str) -> int:
+    """Semitone shift between two Camelot codes, taking the shorter path."""
+    source_num = int(source_camelot[:-1])
+    source_mode = source_camelot[-1]
+    target_num = int(target_camelot[:-1])
+    target_mode = target_camelot[-1]
+
+    # Relative major/minor is 3 semitones apart
+    if source_mode == target_mode:
+        mode_shift = 0
+    elif source_mode == "A":
+        mode_shift = 3
+    else:
+        mode_shift = -3
+
+    # Moving 1 position on Camelot = 7 semitones (perfect fifth),
+    # folded to the shorter direction (e.g. -5 instead of +7)
+    semitones = ((target_num - source_num) * 7 + mode_shift) % 12
+    if semitones > 6:
+        semitones -= 12
+
+    return semitones
+
+
+# Every Camelot pair, computed once at import
+_PITCH_SHIFT_TABLE = {
+    (source, target): _camelot_pitch_shift(source, target)
+    for source in CAMELOT_WHEEL
+    for target in CAMELOT_WHEEL
+}
+
+
 def calculate_pitch_shift(source_key: str, target_key: str) -> float:
     """
     Calculate pitch shift needed to go from source key to target key.
@@ -219,60 +251,11 @@ def calculate_pitch_shift(source_key: str, target_key: str) -> float:
     Returns:
         Number of semitones to shift
     """
-    from ...theory.camelot import get_camelot_from_key, get_key_from_camelot
-
     # Convert to Camelot if needed
     source_camelot = get_camelot_from_key(source_key)
     target_camelot = get_camelot_from_key(target_key)
 
-    if not source_camelot or not target_camelot:
-        return 0
-
-    # Parse Camelot
-    source_num = int(source_camelot[:-1])
-    source_mode = source_camelot[-1]
-    target_num = int(target_camelot[:-1])
-    target_mode = target_camelot[-1]
-
-    # If same mode, calculate semitone difference
-    # Moving 1 position on Camelot = 5 semitones (circle of fifths)
-    if source_mode == target_mode:
-        position_diff = target_num - source_num
-        # Handle wrap-around
-        if position_diff > 6:
-            position_diff -= 12
-        elif position_diff < -6:
-            position_diff += 12
-
-        # Each position = 7 semitones (perfect fifth)
-        # But we want the shorter path, so could also be -5 semitones
-        semitones = position_diff * 7 % 12
-        if semitones > 6:
-            semitones -= 12
-
-        return semitones
-
-    else:
-        # Different modes - relative major/minor is 3 semitones apart
-        # First align to relative, then shift
-        if source_mode == "A":
-            # Minor to major: +3 semitones
-            mode_shift = 3
-        else:
-            # Major to minor: -3 semitones
-            mode_shift = -3
-
-        position_diff = target_num - source_num
-        if position_diff > 6:
-            position_diff -= 12
-        elif position_diff < -6:
-            position_diff += 12
-
-        semitones = (position_diff * 7 + mode_shift) % 12
-        if semitones > 6:
-            semitones -= 12
-
-        return semitones
+    return _PITCH_SHIFT_TABLE.get((source_camelot, target_camelot), 0)
 
 
 def create_acapella_transition(
@@ -354,7 +337,7 @@ def create_acapella_transition(
     if remainder_start < len(instrumental_b):
         remainder = instrumental_b[remainder_start:]
     else:
-        remainder = np.array([])
+        remainder = instrumental_b[:0]
 
     # Crossfade from acapella to B remainder
     if len(acapella_mix) >= fade_samples and len(remainder) >= fade_samples:
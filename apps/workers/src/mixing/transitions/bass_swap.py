@@ -239,7 +239,8 @@ def apply_bass_swap_to_stems(
     """
     Apply bass swap to full stem dictionaries.
 
-    Modifies only the bass stems, leaving others unchanged.
+    Modifies only the bass stems. The other stems are passed through by
+    reference rather than copied, so callers must not modify them in place.
 
     Args:
         stems_a: Stems from track A {drums, bass, vocals, other}
@@ -252,9 +253,10 @@ def apply_bass_swap_to_stems(
     Returns:
         Tuple of (modified_stems_a, modified_stems_b)
     """
-    # Copy stems to avoid modifying originals
-    stems_a_modified = {k: v.copy() if v is not None else None for k, v in stems_a.items()}
-    stems_b_modified = {k: v.copy() if v is not None else None for k, v in stems_b.items()}
+    # New dicts, shared arrays: execute_bass_swap copies the two bass stems it
+    # rewrites, and the untouched stems need no copy
+    stems_a_modified = dict(stems_a)
+    stems_b_modified = dict(stems_b)
 
     # Execute bass swap
     if stems_a_modified.get("bass") is not None and stems_b_modified.get("bass") is not None:
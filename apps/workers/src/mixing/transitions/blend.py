@@ -64,9 +64,9 @@ def create_blend_transition(
     blended = segment_a + segment_b
 
     # Prevent clipping
-    max_val = np.max(np.abs(blended))
+    max_val = max(blended.max(), -blended.min()) if blended.size else 0.0
     if max_val > 1.0:
-        blended = blended / max_val * 0.95
+        blended *= 0.95 / max_val
 
     return blended
 
@@ -120,8 +120,9 @@ def create_stem_blend(
         sr=sr
     )
 
-    # Initialize output
+    # Initialize output, plus one scratch buffer reused by every phase
     output = np.zeros(trans_samples, dtype=np.float32)
+    scratch = np.empty(trans_samples, dtype=np.float32)
 
     # Process each phase
     for phase in phases:
@@ -145,19 +146,19 @@ def create_stem_blend(
             stem_a = stems_a_swapped.get(stem_name)
             stem_b = stems_b_swapped.get(stem_name)
 
-            # Get segments from stems
+            # Gain each stem into the scratch buffer, then accumulate in place
             if stem_a is not None and len(stem_a) >= phase_end_sample:
-                segment_a = stem_a[phase_start_sample:phase_end_sample] * level_a
-                output[phase_start_sample:phase_end_sample] += segment_a
+                np.multiply(stem_a[phase_start_sample:phase_end_sample], level_a, out=scratch[:phase_length])
+                output[phase_start_sample:phase_end_sample] += scratch[:phase_length]
 
             if stem_b is not None and len(stem_b) >= phase_end_sample:
-                segment_b = stem_b[phase_start_sample:phase_end_sample] * level_b
-                output[phase_start_sample:phase_end_sample] += segment_b
+                np.multiply(stem_b[phase_start_sample:phase_end_sample], level_b, out=scratch[:phase_length])
+                output[phase_start_sample:phase_end_sample] += scratch[:phase_length]
 
     # Normalize to prevent clipping
-    max_val = np.max(np.abs(output))
+    max_val = max(output.max(), -output.min()) if output.size else 0.0
     if max_val > 1.0:
-        output = output / max_val * 0.95
+        output *= 0.95 / max_val
 
     return output
 
@@ -313,7 +314,7 @@ def mix_stems_with_levels(
     # Find minimum length
     lengths = [len(s) for s in stems.values() if s is not None]
     if not lengths:
-        return np.array([])
+        return np.zeros(0, dtype=np.float32)
 
     max_len = max(lengths)
     if end_sample is None:
@@ -266,9 +266,9 @@ def create_dramatic_cut(
     result = np.concatenate([segment_a, silence, segment_b])
 
     # Normalize to prevent clipping
-    max_val = np.max(np.abs(result))
+    max_val = max(result.max(), -result.min()) if result.size else 0.0
     if max_val > 1.0:
-        result = result / max_val * 0.95
+        result *= 0.95 / max_val
 
     return result
 
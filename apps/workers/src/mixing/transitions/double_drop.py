@@ -226,7 +226,7 @@ def create_double_drop_with_exit(
         if exit_start_sample < len(audio_b):
             continuation = audio_b[exit_start_sample:]
         else:
-            continuation = np.array([])
+            continuation = audio_b[:0]
 
         # Crossfade from double drop to B continuation
         if len(double_drop) >= exit_samples and len(continuation) >= exit_samples:
@@ -252,7 +252,7 @@ def create_double_drop_with_exit(
         if exit_start_sample < len(audio_a):
             continuation = audio_a[exit_start_sample:]
         else:
-            continuation = np.array([])
+            continuation = audio_a[:0]
 
         if len(double_drop) >= exit_samples and len(continuation) >= exit_samples:
             t = np.linspace(0, np.pi / 2, exit_samples)
@@ -124,9 +124,9 @@ def create_echo_out_transition(
         output = np.concatenate([segment_a, audio_b])
 
     # Normalize
-    max_val = np.max(np.abs(output))
+    max_val = max(output.max(), -output.min()) if output.size else 0.0
     if max_val > 1.0:
-        output = output / max_val * 0.95
+        output *= 0.95 / max_val
 
     return output
 
@@ -96,9 +96,9 @@ def create_filter_transition(
     output = segment_a + segment_b
 
     # Prevent clipping
-    max_val = np.max(np.abs(output))
+    max_val = max(output.max(), -output.min()) if output.size else 0.0
     if max_val > 1.0:
-        output = output / max_val * 0.95
+        output *= 0.95 / max_val
 
     return output
 
@@ -274,9 +274,9 @@ def create_filter_swap_transition(
     output = segment_a + segment_b
 
     # Normalize
-    max_val = np.max(np.abs(output))
+    max_val = max(output.max(), -output.min()) if output.size else 0.0
     if max_val > 1.0:
-        output = output / max_val * 0.95
+        output *= 0.95 / max_val
 
     return output
 
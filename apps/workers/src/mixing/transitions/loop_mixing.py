@@ -90,7 +90,7 @@ def create_loop(
         loop_transition = loop_end * cf_fade_out + loop_start_region * cf_fade_in
     else:
         crossfade_region = 0
-        loop_transition = np.array([])
+        loop_transition = loop_audio[:0]
 
     # Build repeated loop
     # Each repetition is: full loop minus crossfade region
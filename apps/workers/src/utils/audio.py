@@ -2,7 +2,7 @@
 Audio file utilities for loading, saving, and manipulating audio
 """
 
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from pathlib import Path
 import subprocess
 
@@ -13,6 +13,14 @@ import structlog
 
 logger = structlog.get_logger()
 
+# Try to import soxr for multichannel polyphase resampling
+try:
+    import soxr
+    SOXR_AVAILABLE = True
+except ImportError:
+    SOXR_AVAILABLE = False
+    logger.warning("soxr not available - resampling through librosa")
+
 
 def ensure_wav_format(audio_path: str) -> str:
     """
@@ -82,7 +90,7 @@ def ensure_wav_format(audio_path: str) -> str:
 
 def load_audio(
     file_path: str,
-    target_sr: int = 22050,
+    target_sr: Optional[int] = 22050,
     mono: bool = True
 ) -> Tuple[np.ndarray, int]:
     """
@@ -90,11 +98,12 @@ def load_audio(
 
     Args:
         file_path: Path to the audio file
-        target_sr: Target sample rate (default 22050 for analysis)
+        target_sr: Target sample rate (default 22050 for analysis,
+            None keeps the file's native rate)
         mono: Convert to mono if True
 
     Returns:
-        Tuple of (audio_data, sample_rate)
+        Tuple of (audio_data, sample_rate); stereo audio is (channels, samples)
     """
     logger.info("Loading audio", file_path=file_path, target_sr=target_sr)
 
@@ -102,14 +111,29 @@ def load_audio(
     wav_path = ensure_wav_format(file_path)
 
     try:
-        # Use librosa for loading
-        audio, sr = librosa.load(wav_path, sr=target_sr, mono=mono)
+        try:
+            with sf.SoundFile(wav_path) as f:
+                sr = f.samplerate
+                audio = f.read(dtype='float32', always_2d=True).T
+        except RuntimeError:
+            # Format not supported by libsndfile, let librosa decode it
+            audio, sr = librosa.load(wav_path, sr=None, mono=False)
+            audio = np.atleast_2d(audio)
+
+        # Same layout as librosa.load: 1D when mono, (channels, samples) otherwise
+        if mono or audio.shape[0] == 1:
+            audio = np.mean(audio, axis=0)
+
+        # Resample every channel in one soxr call
+        if target_sr is not None and target_sr != sr:
+            audio = resample_audio(audio, orig_sr=sr, target_sr=target_sr)
+            sr = target_sr
 
         logger.info(
             "Audio loaded successfully",
-            duration=len(audio) / sr,
+            duration=audio.shape[-1] / sr,
             sample_rate=sr,
-            samples=len(audio)
+            samples=audio.shape[-1]
         )
 
         return audio, sr
@@ -119,6 +143,79 @@ def load_audio(
         raise
 
 
+def get_audio_num_samples(file_path: str, target_sr: int) -> int:
+    """
+    Get the length of an audio file in samples at target_sr without decoding it.
+
+    Args:
+        file_path: Path to the audio file
+        target_sr: Sample rate the length is expressed in
+
+    Returns:
+        Number of samples
+    """
+    try:
+        info = sf.info(file_path)
+        return int(info.frames * target_sr / info.samplerate)
+    except RuntimeError:
+        # Format not supported by libsndfile (e.g. M4A without ffmpeg)
+        return int(librosa.get_duration(path=file_path) * target_sr)
+
+
+def load_audio_window(
+    file_path: str,
+    start_ms: float,
+    duration_ms: float,
+    target_sr: Optional[int] = None,
+    mono: bool = True
+) -> Tuple[np.ndarray, int]:
+    """
+    Load only a window of an audio file.
+
+    Seeks to the start position and decodes just the requested frames,
+    instead of decoding the whole track and slicing it.
+
+    Args:
+        file_path: Path to the audio file
+        start_ms: Window start in milliseconds
+        duration_ms: Window length in milliseconds
+        target_sr: Resample to this rate if given (default: file's native rate)
+        mono: Convert to mono if True
+
+    Returns:
+        Tuple of (audio_data, sample_rate); stereo audio is (channels, samples)
+    """
+    try:
+        with sf.SoundFile(file_path) as f:
+            sr = f.samplerate
+            start = min(int(round(start_ms / 1000 * sr)), f.frames)
+            f.seek(start)
+            audio = f.read(
+                frames=int(round(duration_ms / 1000 * sr)),
+                dtype='float32',
+                always_2d=True,
+            ).T
+    except RuntimeError:
+        # Format not supported by libsndfile, let librosa decode the window
+        audio, sr = librosa.load(
+            file_path,
+            sr=None,
+            mono=False,
+            offset=start_ms / 1000,
+            duration=duration_ms / 1000,
+        )
+        audio = np.atleast_2d(audio)
+
+    if mono:
+        audio = np.mean(audio, axis=0)
+
+    if target_sr is not None and target_sr != sr:
+        audio = resample_audio(audio, orig_sr=sr, target_sr=target_sr)
+        sr = target_sr
+
+    return audio, sr
+
+
 def save_audio(
     audio: np.ndarray,
     file_path: str,
@@ -175,6 +272,53 @@ def concatenate_audio(segments: List[np.ndarray]) -> np.ndarray:
     return np.concatenate(segments)
 
 
+def concatenate_audio_files(
+    file_paths: List[str],
+    output_path: str,
+    sample_rate: int = 44100,
+    channels: int = 2,
+    block_frames: int = 65536
+) -> int:
+    """
+    Concatenate audio files on disk without loading them all into memory.
+
+    Each input is streamed block by block into a single output file, so peak
+    memory is one block regardless of how long the mix is.
+
+    Args:
+        file_paths: Input files, in playback order
+        output_path: Output file path (format inferred from the extension)
+        sample_rate: Sample rate every input must share
+        channels: Output channel count (mono inputs are duplicated)
+        block_frames: Frames read and written per block
+
+    Returns:
+        Total number of frames written
+    """
+    logger.info("Concatenating audio files", count=len(file_paths), output_path=output_path)
+
+    total_frames = 0
+    with sf.SoundFile(output_path, 'w', samplerate=sample_rate, channels=channels) as out:
+        for path in file_paths:
+            with sf.SoundFile(path) as f:
+                if f.samplerate != sample_rate:
+                    raise ValueError(
+                        f"{path} is {f.samplerate} Hz, expected {sample_rate} Hz"
+                    )
+                if f.channels not in (1, channels):
+                    raise ValueError(
+                        f"{path} has {f.channels} channels, expected 1 or {channels}"
+                    )
+                for block in f.blocks(blocksize=block_frames, dtype='float32', always_2d=True):
+                    if block.shape[1] != channels:
+                        block = np.broadcast_to(block, (len(block), channels))
+                    out.write(block)
+                    total_frames += len(block)
+
+    logger.info("Audio files concatenated", output_path=output_path, frames=total_frames)
+    return total_frames
+
+
 def normalize_audio(audio: np.ndarray, target_db: float = -3.0) -> np.ndarray:
     """
     Normalize audio to a target peak level.
@@ -222,12 +366,47 @@ def apply_fade(
     return audio
 
 
+def moving_average(signal: np.ndarray, window_size: int) -> np.ndarray:
+    """
+    Centred moving average along the last axis.
+
+    Same result as np.convolve(signal, np.ones(w) / w, mode='same') on
+    every row, but computed from a running sum in O(n) instead of O(n * w),
+    which matters for the bar-length windows used to smooth transition
+    volume curves. Stacked curves of shape (curves, samples) are smoothed
+    in a single pass.
+
+    Args:
+        signal: Input signal of shape (..., samples)
+        window_size: Number of samples averaged per output sample
+
+    Returns:
+        Smoothed float32 signal of the same shape
+    """
+    n = signal.shape[-1]
+    csum = np.zeros(signal.shape[:-1] + (n + 1,), dtype=np.float64)
+    np.cumsum(signal, axis=-1, out=csum[..., 1:])
+
+    # 'same' mode centres the window, with zero padding at both ends
+    end = np.arange(n) + (window_size - 1) // 2 + 1
+    hi = np.minimum(end, n)
+    lo = np.clip(end - window_size, 0, n)
+    smoothed = csum[..., hi]
+    smoothed -= csum[..., lo]
+    smoothed /= window_size
+    return smoothed.astype(np.float32)
+
+
 def resample_audio(audio: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
     """
     Resample audio to a different sample rate.
 
+    Time is the last axis, as with librosa. With soxr every channel goes
+    through one polyphase resampler call in the input dtype (float32 stays
+    float32), at the same quality as librosa's default 'soxr_hq'.
+
     Args:
-        audio: Input audio
+        audio: Input audio of shape (..., samples)
         orig_sr: Original sample rate
         target_sr: Target sample rate
 
@@ -236,4 +415,14 @@ def resample_audio(audio: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarra
     """
     if orig_sr == target_sr:
         return audio
-    return librosa.resample(audio, orig_sr=orig_sr, target_sr=target_sr)
+    if not SOXR_AVAILABLE:
+        return librosa.resample(audio, orig_sr=orig_sr, target_sr=target_sr)
+
+    if audio.ndim == 1:
+        return soxr.resample(audio, orig_sr, target_sr, quality='HQ')
+
+    # soxr wants (samples, channels)
+    lead_shape = audio.shape[:-1]
+    flat = audio.reshape(-1, audio.shape[-1])
+    resampled = soxr.resample(flat.T, orig_sr, target_sr, quality='HQ').T
+    return resampled.reshape(*lead_shape, resampled.shape[-1])
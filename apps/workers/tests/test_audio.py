@@ -0,0 +1,42 @@
+"""
+Tests for audio file utilities.
+"""
+
+import pytest
+import numpy as np
+import soundfile as sf
+from src.utils.audio import concatenate_audio_files
+
+
+class TestConcatenateAudioFiles:
+    """Test streaming concatenation of audio files."""
+
+    SR = 8000
+
+    def _write(self, path, audio, sr=SR):
+        sf.write(str(path), audio, sr, subtype='FLOAT')
+        return str(path)
+
+    def test_mono_inputs_broadcast_to_stereo(self, tmp_path):
+        """Mono files are duplicated across channels and appended in order."""
+        mono = np.linspace(-0.5, 0.5, 300, dtype=np.float32)
+        stereo = np.full((200, 2), 0.25, dtype=np.float32)
+        paths = [self._write(tmp_path / "a.wav", mono), self._write(tmp_path / "b.wav", stereo)]
+        output = str(tmp_path / "out.wav")
+
+        frames = concatenate_audio_files(paths, output, sample_rate=self.SR, block_frames=128)
+
+        assert frames == 500
+        result, sr = sf.read(output, dtype='float32', always_2d=True)
+        assert sr == self.SR
+        assert result.shape == (500, 2)
+        np.testing.assert_allclose(result[:300, 0], mono, atol=1e-4)
+        np.testing.assert_allclose(result[:300, 1], mono, atol=1e-4)
+        np.testing.assert_allclose(result[300:], stereo, atol=1e-4)
+
+    def test_sample_rate_mismatch_raises(self, tmp_path):
+        """Inputs at another sample rate are rejected, not silently resampled."""
+        path = self._write(tmp_path / "a.wav", np.zeros(100, dtype=np.float32), sr=16000)
+
+        with pytest.raises(ValueError):
+            concatenate_audio_files([path], str(tmp_path / "out.wav"), sample_rate=self.SR)
@@ -66,6 +66,19 @@ class TestBassSwapSacredRule:
         assert np.allclose(result_a["bass"][swap_sample:], 0), "A bass should be 0 after swap"
         assert np.any(result_b["bass"][swap_sample:] != 0), "B bass should exist after swap"
 
+    def test_swap_leaves_inputs_and_shares_other_stems(self, sample_stems):
+        """Only the bass stems are rewritten; the rest are passed through."""
+        stems_a = sample_stems.copy()
+        stems_b = {k: v.copy() for k, v in sample_stems.items()}
+        bass_a = stems_a["bass"].copy()
+
+        result_a, result_b = apply_bass_swap_to_stems(stems_a, stems_b, swap_time=5.0)
+
+        np.testing.assert_array_equal(stems_a["bass"], bass_a)
+        assert result_a["bass"] is not stems_a["bass"]
+        assert result_a["drums"] is stems_a["drums"]
+        assert result_b["vocals"] is stems_b["vocals"]
+
     def test_one_bar_swap_max_overlap(self, sample_stems):
         """1-bar bass swap should have maximum 1 bar overlap."""
         stems_a = sample_stems.copy()
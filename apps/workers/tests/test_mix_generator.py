@@ -0,0 +1,254 @@
+"""
+Tests for mix generator - 4-phase stem mixing and limiter.
+"""
+
+import pytest
+import numpy as np
+from src.mixing.mix_generator import (
+    mix_stems_4_phase,
+    apply_limiter,
+    bars_to_ms,
+    bars_to_samples,
+    find_nearest_downbeat,
+    calculate_segments,
+    TrackData,
+)
+from src.mixing import mix_generator
+from src.mixing import beatmatch
+from src.mixing.beatmatch import find_nearest_beat, find_downbeat
+
+
+def _reference_mix(stems_a, stems_b, phase_samples):
+    """Straightforward per-phase loop the vectorized mix must match."""
+    da, ba, va, oa = (stems_a[n] for n in ['drums', 'bass', 'vocals', 'other'])
+    db, bb, vb, ob = (stems_b[n] for n in ['drums', 'bass', 'vocals', 'other'])
+    output = np.zeros((phase_samples * 4, 2))
+
+    for phase in range(4):
+        s = slice(phase * phase_samples, (phase + 1) * phase_samples)
+        fade_in = np.linspace(0, 1, phase_samples).reshape(-1, 1)
+        fade_out = np.linspace(1, 0, phase_samples).reshape(-1, 1)
+
+        if phase == 0:
+            output[s] += da[s] + ba[s] + va[s] + oa[s]
+            output[s] += db[s] * fade_in * 0.7 + ob[s] * fade_in * 0.3
+        elif phase == 1:
+            output[s] += da[s] + va[s] + oa[s] + ba[s] * (1 - fade_in * 0.8)
+            output[s] += db[s] * (0.7 + fade_in * 0.3) + bb[s] * fade_in + ob[s] * 0.3
+        elif phase == 2:
+            output[s] += da[s] * 0.5 + ba[s] * 0.2 + va[s] * fade_out + oa[s] * 0.5
+            output[s] += db[s] + bb[s] + vb[s] * fade_in + ob[s] * (0.3 + fade_in * 0.7)
+        else:
+            output[s] += (da[s] * 0.5 + ba[s] * 0.2 + oa[s] * 0.5) * fade_out
+            output[s] += db[s] + bb[s] + vb[s] + ob[s]
+
+    return output
+
+
+class TestMixStems4Phase:
+    """Test the 4-phase stem mix."""
+
+    BPM = 128.0
+    BARS = 16
+    SR = 8000
+
+    @pytest.fixture
+    def phase_samples(self):
+        return bars_to_samples(self.BARS, self.BPM, self.SR) // 4
+
+    def _stems(self, total_samples, seed):
+        rng = np.random.default_rng(seed)
+        return {
+            name: rng.standard_normal((total_samples, 2)).astype(np.float32) * 0.25
+            for name in ['drums', 'bass', 'vocals', 'other']
+        }
+
+    def test_matches_reference_schedule(self, phase_samples):
+        """Vectorized mix should match the per-phase reference loop."""
+        stems_a = self._stems(phase_samples * 4, 1)
+        stems_b = self._stems(phase_samples * 4, 2)
+
+        result = mix_stems_4_phase(stems_a, stems_b, self.BARS, self.BPM, self.SR)
+        expected = _reference_mix(stems_a, stems_b, phase_samples)
+
+        assert result.shape == expected.shape
+        assert result.dtype == np.float32
+        assert result.flags['C_CONTIGUOUS']
+        np.testing.assert_allclose(result, expected, atol=1e-4)
+
+    def test_numpy_fallback_matches_reference(self, phase_samples, monkeypatch):
+        """Without numba, the block-wise NumPy path gives the same mix."""
+        monkeypatch.setattr(mix_generator, 'NUMBA_AVAILABLE', False)
+        stems_a = self._stems(phase_samples * 4, 1)
+        stems_b = self._stems(phase_samples * 4, 2)
+
+        result = mix_stems_4_phase(stems_a, stems_b, self.BARS, self.BPM, self.SR)
+        expected = _reference_mix(stems_a, stems_b, phase_samples)
+
+        np.testing.assert_allclose(result, expected, atol=1e-4)
+
+    def test_mono_stems_are_promoted_to_stereo(self, phase_samples):
+        """Mono stems should produce identical left and right channels."""
+        rng = np.random.default_rng(3)
+        stems_a = {n: rng.standard_normal(phase_samples * 4) for n in ['drums', 'bass']}
+        stems_b = {n: rng.standard_normal(phase_samples * 4) for n in ['vocals', 'other']}
+
+        result = mix_stems_4_phase(stems_a, stems_b, self.BARS, self.BPM, self.SR)
+
+        assert result.shape == (phase_samples * 4, 2)
+        np.testing.assert_array_equal(result[:, 0], result[:, 1])
+
+    def test_numpy_fallback_handles_mono_and_missing_stems(self, phase_samples, monkeypatch):
+        """The NumPy path reads mono stems in place and skips missing ones."""
+        rng = np.random.default_rng(6)
+        stems_a = {n: rng.standard_normal(phase_samples * 4) for n in ['drums', 'bass']}
+        stems_b = {n: rng.standard_normal(phase_samples * 4) for n in ['vocals', 'other']}
+        expected = mix_stems_4_phase(stems_a, stems_b, self.BARS, self.BPM, self.SR)
+
+        monkeypatch.setattr(mix_generator, 'NUMBA_AVAILABLE', False)
+        result = mix_stems_4_phase(stems_a, stems_b, self.BARS, self.BPM, self.SR)
+
+        np.testing.assert_allclose(result, expected, atol=1e-4)
+
+    def test_short_stems_are_padded(self, phase_samples):
+        """Stems shorter than the transition should be zero-padded."""
+        stems_a = self._stems(phase_samples * 3, 4)
+        stems_b = self._stems(phase_samples * 3, 5)
+
+        result = mix_stems_4_phase(stems_a, stems_b, self.BARS, self.BPM, self.SR)
+
+        assert result.shape == (phase_samples * 4, 2)
+        assert np.all(result[phase_samples * 3:] == 0)
+
+
+class TestBarsToSamples:
+    """Test bar to sample conversion."""
+
+    def test_exact_for_fractional_bpm(self):
+        """Converting directly avoids truncating to whole milliseconds first."""
+        assert bars_to_samples(16, 123.7, 44100) == round(16 * 4 * 60 * 44100 / 123.7)
+        assert bars_to_samples(16, 123.7, 44100) != int(bars_to_ms(16, 123.7) * 44100 / 1000)
+
+
+class TestLimiter:
+    """Test the brick-wall limiter."""
+
+    def test_limiter_caps_peak(self):
+        """Peaks above threshold should be scaled down to threshold."""
+        audio = np.array([[0.5, -2.0], [1.0, 0.25]], dtype=np.float32)
+        result = apply_limiter(audio, threshold_db=-1.0)
+        assert np.max(np.abs(result)) == pytest.approx(10 ** (-1.0 / 20), rel=1e-5)
+
+    def test_limiter_leaves_quiet_audio(self):
+        """Audio below threshold should be unchanged."""
+        audio = np.array([0.1, -0.2, 0.3], dtype=np.float32)
+        result = apply_limiter(audio.copy(), threshold_db=-1.0)
+        np.testing.assert_array_equal(result, audio)
+
+
+    def test_limiter_scales_in_place(self):
+        """Float buffers are limited in place, without a new allocation."""
+        audio = np.array([0.5, -2.0, 1.0], dtype=np.float32)
+        result = apply_limiter(audio, threshold_db=0.0)
+        assert result is audio
+        np.testing.assert_allclose(audio, [0.25, -1.0, 0.5])
+
+
+class TestFindNearestDownbeat:
+    """Test downbeat lookup on the beat grid."""
+
+    def test_picks_nearest_fourth_beat(self):
+        """Only every 4th beat counts as a downbeat."""
+        beats = [i * 0.5 for i in range(32)]
+        assert find_nearest_downbeat(beats, 4.9) == 4.0
+        assert find_nearest_downbeat(np.asarray(beats), 5.1) == 6.0
+
+    def test_empty_beats_returns_target(self):
+        """Without beats, the target time is returned unchanged."""
+        assert find_nearest_downbeat([], 12.5) == 12.5
+
+
+class TestFindNearestBeat:
+    """Test beat lookup used for cue points."""
+
+    BEATS = [0.0, 0.5, 1.0, 1.5, 2.0]
+
+    def test_before_and_after(self):
+        """'before' takes the last beat at or before, 'after' the first at or after."""
+        assert find_nearest_beat(1.2, self.BEATS, 'before') == (1.0, 2)
+        assert find_nearest_beat(1.2, self.BEATS, 'after') == (1.5, 3)
+        assert find_nearest_beat(1.0, self.BEATS, 'before') == (1.0, 2)
+        assert find_nearest_beat(1.0, np.asarray(self.BEATS), 'after') == (1.0, 2)
+
+    def test_out_of_range_clamps_to_grid(self):
+        """Positions outside the grid return the first or last beat."""
+        assert find_nearest_beat(-1.0, self.BEATS, 'before') == (0.0, 0)
+        assert find_nearest_beat(9.0, self.BEATS, 'after') == (2.0, 4)
+        assert find_nearest_beat(1.3, self.BEATS) == (1.5, 3)
+
+    def test_find_downbeat_rounds_up_to_bar(self):
+        """The next bar boundary is used, or the last beat past the grid."""
+        beats = np.arange(10) * 0.5
+        assert find_downbeat(4, beats) == (2.0, 4)
+        assert find_downbeat(5, beats) == (4.0, 8)
+        assert find_downbeat(9, beats) == (4.5, 9)
+
+
+class TestStretchCache:
+    """Test the stretched-window cache."""
+
+    def test_hit_skips_stretch_and_returns_copy(self, monkeypatch):
+        """A repeated window is served from the cache as a writable copy."""
+        calls = []
+
+        def fake_stretch(audio, sr, source_bpm, target_bpm):
+            calls.append(source_bpm)
+            return audio[::2].copy(), target_bpm
+
+        monkeypatch.setattr(beatmatch, 'stretch_to_bpm', fake_stretch)
+        monkeypatch.setattr(beatmatch, '_stretch_cache', type(beatmatch._stretch_cache)())
+        monkeypatch.setattr(beatmatch, '_stretch_cache_bytes', 0)
+        audio = np.arange(8, dtype=np.float32)
+
+        first, _ = beatmatch.stretch_to_bpm_cached(audio, 8000, 120.0, 126.0, ('t', 0))
+        second, bpm = beatmatch.stretch_to_bpm_cached(audio, 8000, 120.0, 126.0, ('t', 0))
+
+        assert calls == [120.0]
+        assert bpm == 126.0
+        np.testing.assert_array_equal(first, second)
+        second[0] = -1.0
+        np.testing.assert_array_equal(beatmatch.stretch_to_bpm_cached(audio, 8000, 120.0, 126.0, ('t', 0))[0], first)
+
+
+class TestSourceWindowKey:
+    """Test cache keys for windows of audio files."""
+
+    def test_key_changes_when_file_is_rewritten(self, tmp_path):
+        """A re-uploaded file at the same path must not reuse old entries."""
+        path = tmp_path / "track.wav"
+        path.write_bytes(b"a" * 16)
+        key = beatmatch.source_window_key(str(path), 1.0, 2.0, 120.0, 126.0)
+
+        assert key == beatmatch.source_window_key(str(path), 1.0, 2.0, 120.0, 126.0)
+        assert key != beatmatch.source_window_key(str(path), 1.0, 2.0)
+
+        path.write_bytes(b"b" * 32)
+        assert key != beatmatch.source_window_key(str(path), 1.0, 2.0, 120.0, 126.0)
+
+
+class TestCalculateSegments:
+    """Test mix segment layout."""
+
+    def _track(self, track_id):
+        return TrackData(
+            id=track_id, file_path=f"{track_id}.wav", duration_ms=240000.0,
+            bpm=128.0, energy=0.5, beats=[], intro_end_ms=0, outro_start_ms=0
+        )
+
+    def test_transitions_record_track_indices(self):
+        """Each transition knows which pair of tracks it joins."""
+        tracks = [self._track(t) for t in ('a', 'b', 'c')]
+        transitions = [s for s in calculate_segments(tracks) if s.type == 'TRANSITION']
+
+        assert [(s.track_a_idx, s.track_b_idx) for s in transitions] == [(0, 1), (1, 2)]
+        assert [s.transition_id for s in transitions] == ['a_b', 'b_c']
@@ -18,6 +18,7 @@ from src.mixing.transitions.filter_transition import (
     create_hpf_exit,
     create_lpf_entry,
 )
+from src.mixing.effects import filters
 
 
 class TestStemBlend:
@@ -338,6 +339,50 @@ class TestFilterTransition:
         # Start should be muffled, end should be full
 
 
+class TestFilterSweepCrossfade:
+    """Test the fused HPF/LPF sweep crossfade."""
+
+    def test_butterworth_sos_matches_scipy(self):
+        """Closed-form sections should have scipy's Butterworth response."""
+        from scipy.signal import butter, sosfreqz
+
+        sos = filters.butterworth_sos("hpf", [20.0, 1000.0, 30000.0])
+        for row, cutoff in zip(sos, [20.0, 1000.0, 21950.0]):
+            expected = butter(4, cutoff / 22050, btype='high', output='sos')
+            _, response = sosfreqz(row, 1024, fs=44100)
+            _, expected_response = sosfreqz(expected, 1024, fs=44100)
+            np.testing.assert_allclose(np.abs(response), np.abs(expected_response), atol=1e-9)
+
+    def test_fused_kernel_matches_chunked_sosfilt(self, monkeypatch):
+        """The numba pass should give the same mix as the NumPy/scipy path."""
+        rng = np.random.default_rng(0)
+        audio_a = (rng.standard_normal(44100) * 0.2).astype(np.float32)
+        audio_b = (rng.standard_normal(44100) * 0.2).astype(np.float32)
+
+        fused = filters.filter_sweep_crossfade(audio_a, audio_b, duration=0.8)
+        monkeypatch.setattr(filters, 'NUMBA_AVAILABLE', False)
+        chunked = filters.filter_sweep_crossfade(audio_a, audio_b, duration=0.8)
+
+        assert fused.dtype == np.float32
+        np.testing.assert_allclose(fused, chunked, atol=1e-5)
+
+    def test_sweep_matches_filtfilt_magnitude(self):
+        """Like sosfiltfilt, a tone at the cutoff comes out at -6 dB, not -3 dB."""
+        sr = 44100
+        t = np.arange(sr) / sr
+        tone = np.sin(2 * np.pi * 1000 * t).astype(np.float32)
+
+        result = filters.filter_sweep_crossfade(
+            tone, np.zeros_like(tone), hpf_start=1000, hpf_end=1000, sr=sr
+        )
+
+        # Undo track A's fade-out over a settled window early in the crossfade
+        window = slice(sr // 5, 2 * sr // 5)
+        fade_out = np.cos(np.linspace(0, np.pi / 2, sr))[window]
+        gain = np.sqrt(np.mean((result[window] / fade_out) ** 2) / np.mean(tone[window] ** 2))
+        assert gain == pytest.approx(0.5, abs=0.02)
+
+
 class TestBlendTransition:
     """Test basic blend/crossfade transitions."""
 